@@ -305,8 +305,7 @@ class AutonomousAI:
         self.logger.info(f"Processed input in {processing_time:.2f} seconds")
         
         # 必要に応じて状態を保存
-        if time.time() - self.last_state_save >= self.state_save_interval:
-            self._save_state()
+        self.save_state_if_due()
         
         return response
     
@@ -443,6 +442,19 @@ class AutonomousAI:
             "timestamp": datetime.now().isoformat()
         }
     
+    def save_state_if_due(self) -> bool:
+        """
+        前回の保存から状態保存間隔が経過していれば状態を保存
+        
+        Returns:
+            保存を行ったかどうか
+        """
+        if time.time() - self.last_state_save < self.state_save_interval:
+            return False
+        
+        self._save_state()
+        return True
+    
     def _handle_command(self, command: str) -> str:
         """特殊コマンドの処理"""
         cmd_lower = command.lower()
@@ -609,8 +621,7 @@ class AutonomousAI:
                 self._run_autonomous_activities()
                 
                 # 状態保存
-                if time.time() - self.last_state_save >= self.state_save_interval:
-                    self._save_state()
+                self.save_state_if_due()
                 
                 # 次のサイクルまで待機
                 time.sleep(self.autonomous_interval)
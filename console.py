@@ -0,0 +1,38 @@
+"""
+Console output helpers
+
+Screen-clearing routine shared by the launcher scripts.
+"""
+
+import os
+import sys
+
+# Whether virtual terminal processing has been enabled on the Windows console
+_vt_mode_checked = False
+
+def _enable_vt_mode():
+    """Let legacy Windows consoles interpret ANSI escape sequences (first call only)"""
+    global _vt_mode_checked
+    if _vt_mode_checked:
+        return
+    _vt_mode_checked = True
+    
+    if os.name != 'nt':
+        return
+    
+    try:
+        import ctypes
+        kernel32 = ctypes.windll.kernel32
+        stdout_handle = kernel32.GetStdHandle(-11)  # STD_OUTPUT_HANDLE
+        mode = ctypes.c_uint32()
+        if kernel32.GetConsoleMode(stdout_handle, ctypes.byref(mode)):
+            # ENABLE_VIRTUAL_TERMINAL_PROCESSING
+            kernel32.SetConsoleMode(stdout_handle, mode.value | 0x0004)
+    except Exception:
+        pass
+
+def clear_screen():
+    """Clear the screen"""
+    _enable_vt_mode()
+    sys.stdout.write("\x1b[H\x1b[2J")
+    sys.stdout.flush()
@@ -1,8 +1,64 @@
 import logging
 import json
-from typing import Dict, List, Any, Optional
+import os
+import heapq
+from array import array
+from collections import defaultdict, deque
+from collections.abc import Mapping
+from typing import Dict, List, Any, Optional, Sequence
 from datetime import datetime
 
+# NumPyが利用可能な場合のみ一括集計に使用
+try:
+    import numpy as np
+    NUMPY_AVAILABLE = True
+except ImportError:
+    NUMPY_AVAILABLE = False
+
+# orjsonが利用可能な場合は高速なシリアライズに使用
+try:
+    import orjson
+    ORJSON_AVAILABLE = True
+except ImportError:
+    ORJSON_AVAILABLE = False
+
+
+def _encode_json_lines(entries: List[Dict[str, Any]]) -> bytes:
+    """
+    エントリのリストをJSON Lines形式の単一バッファにエンコード
+    """
+    if ORJSON_AVAILABLE:
+        return b"".join(orjson.dumps(entry, option=orjson.OPT_APPEND_NEWLINE) for entry in entries)
+    return "".join(json.dumps(entry, ensure_ascii=False) + "\n" for entry in entries).encode("utf-8")
+
+
+# 成長ニーズがない場合に共有する空のシーケンス（呼び出しごとの空リスト生成を避ける）
+_NO_NEEDS: Sequence[Dict[str, Any]] = ()
+
+
+class _ProgressView(Mapping):
+    """
+    目標ID→進捗度の読み取り専用ビュー。
+    実データはGoalManagerのarray('B')に格納される。
+    """
+    
+    def __init__(self, goal_index: Dict[str, int], values: array):
+        self._goal_index = goal_index
+        self._values = values
+    
+    def __getitem__(self, goal_id: str) -> int:
+        return self._values[self._goal_index[goal_id]]
+    
+    def __contains__(self, goal_id: object) -> bool:
+        return goal_id in self._goal_index
+    
+    def __iter__(self):
+        return iter(self._goal_index)
+    
+    def __len__(self) -> int:
+        return len(self._goal_index)
+
+
 class GoalManager:
     """
     自己成長のための目標設定と管理を行うコンポーネント。
@@ -28,7 +84,10 @@ class GoalManager:
         # 目標管理用の構造
         self.goals = []
         self.priorities = {}
-        self.progress = {}
+        # 進捗度（0-100）は目標の登録順に1バイトずつ格納
+        self._progress = array('B')
+        self._goal_index: Dict[str, int] = {}
+        self.progress = _ProgressView(self._goal_index, self._progress)
         
         # 許可された改善領域
         self.allowed_improvement_areas = self.config.get("improvement_areas", [
@@ -37,8 +96,11 @@ class GoalManager:
             "reasoning_process"
         ])
         
-        # 目標の履歴
-        self.goal_history = []
+        # 目標の履歴（イベント種別ごとに上限付きのリングバッファで保持）
+        # 各要素は(通し番号, エントリ)で、全体ビューは通し番号順にマージする
+        history_max = self.config.get("history_max", 10000)
+        self._history_by_event = defaultdict(lambda: deque(maxlen=history_max))
+        self._history_seq = 0
         
         self.logger.info("Goal Manager initialized")
     
@@ -73,7 +135,7 @@ class GoalManager:
         growth_needs = [need for need in growth_needs 
                         if need["area"] in self.allowed_improvement_areas]
         
-        self.logger.info(f"Identified {len(growth_needs)} growth needs")
+        self.logger.info("Identified %d growth needs", len(growth_needs))
         return growth_needs
     
     def set_goal(self, area: str, description: str, priority: int = 1) -> str:
@@ -89,7 +151,7 @@ class GoalManager:
             生成された目標ID
         """
         if area not in self.allowed_improvement_areas:
-            self.logger.warning(f"Attempted to set goal in unauthorized area: {area}")
+            self.logger.warning("Attempted to set goal in unauthorized area: %s", area)
             return None
         
         # 目標IDの生成
@@ -109,16 +171,17 @@ class GoalManager:
         # 目標の追加
         self.goals.append(goal)
         self.priorities[goal_id] = goal["priority"]
-        self.progress[goal_id] = 0
+        self._goal_index[goal_id] = len(self._progress)
+        self._progress.append(0)
         
         # 履歴に追加
-        self.goal_history.append({
+        self._record_history({
             "event": "goal_created",
             "goal_id": goal_id,
             "timestamp": datetime.now().isoformat()
         })
         
-        self.logger.info(f"Set new goal: {goal_id} - {description}")
+        self.logger.info("Set new goal: %s - %s", goal_id, description)
         return goal_id
     
     def create_learning_plan(self, goal_id: str) -> Dict[str, Any]:
@@ -133,7 +196,7 @@ class GoalManager:
         """
         goal = next((g for g in self.goals if g["id"] == goal_id), None)
         if not goal:
-            self.logger.warning(f"Attempted to create plan for non-existent goal: {goal_id}")
+            self.logger.warning("Attempted to create plan for non-existent goal: %s", goal_id)
             return None
         
         # 目標の種類に基づいた計画の作成
@@ -159,7 +222,7 @@ class GoalManager:
         elif area == "reasoning_process":
             plan = self._create_reasoning_plan(plan, goal)
         
-        self.logger.info(f"Created learning plan for goal {goal_id}")
+        self.logger.info("Created learning plan for goal %s", goal_id)
         return plan
     
     def update_goal_progress(self, goal_id: str, progress: float) -> bool:
@@ -173,40 +236,126 @@ class GoalManager:
         Returns:
             更新が成功したかどうか
         """
-        if goal_id not in self.progress:
-            self.logger.warning(f"Attempted to update non-existent goal: {goal_id}")
+        index = self._goal_index.get(goal_id)
+        if index is None:
+            self.logger.warning("Attempted to update non-existent goal: %s", goal_id)
             return False
         
         # 前回の進捗を記録
-        previous_progress = self.progress[goal_id]
+        previous_progress = self._progress[index]
         
         # 進捗を更新（0-100の範囲に制限）
-        self.progress[goal_id] = max(0, min(100, progress))
+        current_progress = max(0, min(100, int(progress)))
+        self._progress[index] = current_progress
         
         # 履歴に追加
-        self.goal_history.append({
+        self._record_history({
             "event": "progress_updated",
             "goal_id": goal_id,
             "previous": previous_progress,
-            "current": self.progress[goal_id],
+            "current": current_progress,
             "timestamp": datetime.now().isoformat()
         })
         
         # 目標が完了した場合のチェック
-        if self.progress[goal_id] >= 100:
+        if current_progress >= 100:
             goal = next((g for g in self.goals if g["id"] == goal_id), None)
             if goal:
                 goal["status"] = "completed"
-                self.goal_history.append({
+                self._record_history({
                     "event": "goal_completed",
                     "goal_id": goal_id,
                     "timestamp": datetime.now().isoformat()
                 })
-                self.logger.info(f"Goal {goal_id} completed")
+                self.logger.info("Goal %s completed", goal_id)
         
-        self.logger.info(f"Updated goal {goal_id} progress: {self.progress[goal_id]}%")
+        self.logger.info("Updated goal %s progress: %s%%", goal_id, current_progress)
         return True
     
+    @property
+    def goal_history(self) -> List[Dict[str, Any]]:
+        """
+        全イベント種別の履歴を発生順に並べたリスト
+        """
+        return list(self._iter_history())
+    
+    def get_history_by_event(self, event: str) -> List[Dict[str, Any]]:
+        """
+        特定のイベント種別の履歴のみを取得
+        
+        Args:
+            event: イベント種別（"goal_created"、"progress_updated"など）
+            
+        Returns:
+            該当イベントの履歴リスト（発生順）
+        """
+        ring = self._history_by_event.get(event)
+        if not ring:
+            return []
+        return [entry for _, entry in ring]
+    
+    def _record_history(self, entry: Dict[str, Any]) -> None:
+        """
+        履歴エントリをイベント種別ごとのリングバッファに追加
+        """
+        self._history_by_event[entry["event"]].append((self._history_seq, entry))
+        self._history_seq += 1
+    
+    def _iter_history(self, since: int = 0):
+        """
+        通し番号がsince以上の履歴エントリを発生順に列挙
+        """
+        for seq, entry in heapq.merge(*self._history_by_event.values(), key=lambda item: item[0]):
+            if seq >= since:
+                yield entry
+    
+    def progress_snapshot(self):
+        """
+        全目標の進捗度を登録順に取得
+        
+        Returns:
+            NumPyが利用可能な場合はuint8配列、それ以外はarray('B')のコピー
+        """
+        # バッファを直接共有するとarrayの拡張がBufferErrorになるためコピーを渡す
+        if NUMPY_AVAILABLE:
+            return np.frombuffer(self._progress.tobytes(), dtype=np.uint8)
+        return array('B', self._progress)
+    
+    def dump_history(self, path: str) -> int:
+        """
+        目標の履歴全体をJSON Lines形式でファイルに書き出す
+        
+        Args:
+            path: 出力先ファイルのパス
+            
+        Returns:
+            次回dump_history_sinceに渡すインデックス（記録済みイベントの総数）
+        """
+        with open(path, "wb") as f:
+            f.write(_encode_json_lines(self.goal_history))
+        return self._history_seq
+    
+    def dump_history_since(self, path: str, last_index: int) -> int:
+        """
+        前回の書き出し以降に追加された履歴のみをファイルに追記する
+        
+        Args:
+            path: 出力先ファイルのパス
+            last_index: 前回の書き出し時に返されたインデックス
+            
+        Returns:
+            次回の呼び出しに渡すインデックス
+        """
+        new_entries = list(self._iter_history(since=last_index))
+        if new_entries:
+            # 新規分を一つのバッファにまとめて1回の書き込みで追記
+            fd = os.open(path, os.O_WRONLY | os.O_CREAT | os.O_APPEND, 0o644)
+            try:
+                os.write(fd, _encode_json_lines(new_entries))
+            finally:
+                os.close(fd)
+        return self._history_seq
+    
     def get_active_goals(self) -> List[Dict[str, Any]]:
         """
         アクティブな目標のリストを取得
@@ -221,10 +370,13 @@ class GoalManager:
         
         return active_goals
     
-    def _analyze_session_history(self, session_history: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
+    def _analyze_session_history(self, session_history: List[Dict[str, Any]]) -> Sequence[Dict[str, Any]]:
         """
         セッション履歴を分析して成長ニーズを抽出
         """
+        if not session_history:
+            return _NO_NEEDS
+        
         needs = []
         
         # これは簡略化された実装
@@ -271,10 +423,13 @@ class GoalManager:
         
         return needs
     
-    def _analyze_knowledge_gaps(self, learned_preferences: Dict[str, Any]) -> List[Dict[str, Any]]:
+    def _analyze_knowledge_gaps(self, learned_preferences: Dict[str, Any]) -> Sequence[Dict[str, Any]]:
         """
         学習済み情報を分析して知識ギャップを特定
         """
+        if not learned_preferences:
+            return _NO_NEEDS
+        
         needs = []
         
         # これは簡略化された実装
@@ -298,20 +453,22 @@ class GoalManager:
         
         return needs
     
-    def _analyze_reasoning_capability(self, active_plans: Dict[str, Any]) -> List[Dict[str, Any]]:
+    def _analyze_reasoning_capability(self, active_plans: Dict[str, Any]) -> Sequence[Dict[str, Any]]:
         """
         計画能力を分析して推論能力のニーズを特定
         """
-        needs = []
-        
         # これは簡略化された実装
         # 実際のシステムではより高度な計画評価を使用
         
-        if not active_plans:
-            return needs
+        # Noneや空の辞書の場合は集計自体を行わない
+        plan_count = len(active_plans) if active_plans else 0
+        if plan_count == 0:
+            return _NO_NEEDS
+        
+        needs = []
         
         # 計画の複雑さを評価
-        avg_steps = sum(len(plan.get("tasks", [])) for plan in active_plans.values()) / len(active_plans)
+        avg_steps = sum(len(plan.get("tasks", ())) for plan in active_plans.values()) / plan_count
         
         if avg_steps < 3:
             needs.append({
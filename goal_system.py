@@ -9,8 +9,96 @@ import logging
 import json
 import time
 import os
-from datetime import datetime
-from typing import Dict, List, Any, Optional
+import random
+import atexit
+import heapq
+import weakref
+from collections import Counter, deque
+from contextlib import contextmanager
+from datetime import datetime, date
+from typing import Dict, List, Any, Optional, Set
+
+# orjsonが利用可能な場合は高速なシリアライズに使用
+try:
+    import orjson
+    ORJSON_AVAILABLE = True
+except ImportError:
+    ORJSON_AVAILABLE = False
+
+# 目標データの既定値（ロード時に欠けているキーを補い、全目標を同じキー構成に揃える）
+_GOAL_DEFAULTS = (
+    ("type", "knowledge_acquisition"),
+    ("priority", 3),
+    ("status", "active"),
+    ("progress", 0),
+    ("deadline", None),
+    ("subtasks", list),
+    ("dependencies", list),
+    ("review_count", 0),
+    ("last_reviewed", None)
+)
+
+# 目標タイプ別のサブタスク説明テンプレート（{d}に目標の説明が入る）
+_SUBTASK_TEMPLATES = {
+    "knowledge_acquisition": (
+        "「{d}」に関する基本情報を調査",
+        "「{d}」の主要な概念を理解",
+        "「{d}」に関連する実例を確認",
+        "「{d}」について知識ベースを更新"
+    ),
+    "skill_development": (
+        "「{d}」に必要な基礎知識を獲得",
+        "「{d}」の基本手順を学習",
+        "「{d}」の練習と実践",
+        "「{d}」の評価と改善"
+    ),
+    "problem_solving": (
+        "「{d}」問題の詳細分析",
+        "「{d}」解決策の複数案検討",
+        "「{d}」最適解決策の選択",
+        "「{d}」解決策の実行と検証"
+    ),
+    "creation": (
+        "「{d}」の要件定義",
+        "「{d}」の設計",
+        "「{d}」の実装または作成",
+        "「{d}」のテストと改善"
+    ),
+    "optimization": (
+        "「{d}」の現状分析",
+        "「{d}」の改善点特定",
+        "「{d}」の最適化実施",
+        "「{d}」の最適化効果測定"
+    )
+}
+
+# 上記以外のタイプ向けの汎用的なサブタスク
+_DEFAULT_SUBTASK_TEMPLATES = (
+    "「{d}」の調査",
+    "「{d}」の計画立案",
+    "「{d}」の実行",
+    "「{d}」の評価"
+)
+
+def _created_date(goal: Dict[str, Any]) -> Optional[date]:
+    """目標の作成日を取得（作成日時が無い・ISO形式でない場合はNone）"""
+    created_at = goal.get("created_at")
+    if not isinstance(created_at, str):
+        return None
+    try:
+        return datetime.fromisoformat(created_at).date()
+    except ValueError:
+        return None
+
+def _remove_identical(items: List[Dict[str, Any]], target: Dict[str, Any]) -> None:
+    """
+    リストから対象の目標オブジェクトそのものを位置指定で取り除く
+    （list.removeと違い、他の目標との辞書の等価比較を行わない）
+    """
+    for i, item in enumerate(items):
+        if item is target:
+            del items[i]
+            return
 
 class GoalSystem:
     """
@@ -65,11 +153,33 @@ class GoalSystem:
         # データファイル
         self.data_file = self.config.get("data_file", "goals_data.json")
         
+        # 目標IDから目標データへのインデックス（アクティブ・完了済みの両方）
+        self._goal_index: Dict[str, Dict[str, Any]] = {}
+        
+        # 優先度別のアクティブ目標（各リストは追加順）
+        self._by_priority: Dict[int, List[Dict[str, Any]]] = {}
+        
+        # 目標IDから依存先IDの集合へのインデックス（保存データは従来通りリスト）
+        self._dependency_sets: Dict[str, Set[str]] = {}
+        
+        # 最後に最適化目標を作成した日付（suggest_new_goalsでの全件走査を避ける）
+        self._last_optimization_goal_date: Optional[date] = None
+        
+        # 保存の遅延制御（batched()の間は書き込みをまとめる）
+        self._dirty = False
+        self._suppress_save = 0
+        
         # データのロード
         self._load_data()
+        self._rebuild_index()
+        
+        # 終了時に未保存の変更を書き出す（弱参照で登録し、破棄されたインスタンスは保持・保存しない）
+        self._atexit_hook = self._make_atexit_hook()
+        atexit.register(self._atexit_hook)
         
-        # 次の目標レビュー時刻
-        self.next_review_time = time.time() + self.config.get("review_interval_hours", 1) * 3600
+        # 次の目標レビュー時刻（time.monotonic()基準。システム時刻の変更の影響を受けない）
+        self._review_interval_seconds = self.config.get("review_interval_hours", 1) * 3600
+        self.next_review_time = time.monotonic() + self._review_interval_seconds
         
         self.logger.info("Goal system initialized")
     
@@ -112,6 +222,7 @@ class GoalSystem:
             "created_at": datetime.now().isoformat(),
             "deadline": deadline,
             "subtasks": [],
+            "completed_subtask_count": 0,
             "dependencies": [],
             "review_count": 0,
             "last_reviewed": None
@@ -119,6 +230,10 @@ class GoalSystem:
         
         # 目標の追加
         self.goals.append(goal)
+        self._goal_index[goal_id] = goal
+        self._priority_bucket(priority).append(goal)
+        if goal_type == "optimization":
+            self._last_optimization_goal_date = date.today()
         
         # データの保存
         self._save_data()
@@ -136,16 +251,7 @@ class GoalSystem:
         Returns:
             目標データ（見つからない場合はNone）
         """
-        for goal in self.goals:
-            if goal["id"] == goal_id:
-                return goal
-        
-        # 完了済み目標もチェック
-        for goal in self.completed_goals:
-            if goal["id"] == goal_id:
-                return goal
-        
-        return None
+        return self._goal_index.get(goal_id)
     
     def decompose_goal(self, goal_id: str) -> List[Dict[str, Any]]:
         """
@@ -169,54 +275,15 @@ class GoalSystem:
         description = goal["description"]
         
         # 目標タイプに基づくサブタスク生成
-        subtasks = []
-        
-        if goal_type == "knowledge_acquisition":
-            subtasks = [
-                {"id": f"{goal_id}_sub1", "description": f"「{description}」に関する基本情報を調査", "status": "pending", "completed": False},
-                {"id": f"{goal_id}_sub2", "description": f"「{description}」の主要な概念を理解", "status": "pending", "completed": False},
-                {"id": f"{goal_id}_sub3", "description": f"「{description}」に関連する実例を確認", "status": "pending", "completed": False},
-                {"id": f"{goal_id}_sub4", "description": f"「{description}」について知識ベースを更新", "status": "pending", "completed": False}
-            ]
-        elif goal_type == "skill_development":
-            subtasks = [
-                {"id": f"{goal_id}_sub1", "description": f"「{description}」に必要な基礎知識を獲得", "status": "pending", "completed": False},
-                {"id": f"{goal_id}_sub2", "description": f"「{description}」の基本手順を学習", "status": "pending", "completed": False},
-                {"id": f"{goal_id}_sub3", "description": f"「{description}」の練習と実践", "status": "pending", "completed": False},
-                {"id": f"{goal_id}_sub4", "description": f"「{description}」の評価と改善", "status": "pending", "completed": False}
-            ]
-        elif goal_type == "problem_solving":
-            subtasks = [
-                {"id": f"{goal_id}_sub1", "description": f"「{description}」問題の詳細分析", "status": "pending", "completed": False},
-                {"id": f"{goal_id}_sub2", "description": f"「{description}」解決策の複数案検討", "status": "pending", "completed": False},
-                {"id": f"{goal_id}_sub3", "description": f"「{description}」最適解決策の選択", "status": "pending", "completed": False},
-                {"id": f"{goal_id}_sub4", "description": f"「{description}」解決策の実行と検証", "status": "pending", "completed": False}
-            ]
-        elif goal_type == "creation":
-            subtasks = [
-                {"id": f"{goal_id}_sub1", "description": f"「{description}」の要件定義", "status": "pending", "completed": False},
-                {"id": f"{goal_id}_sub2", "description": f"「{description}」の設計", "status": "pending", "completed": False},
-                {"id": f"{goal_id}_sub3", "description": f"「{description}」の実装または作成", "status": "pending", "completed": False},
-                {"id": f"{goal_id}_sub4", "description": f"「{description}」のテストと改善", "status": "pending", "completed": False}
-            ]
-        elif goal_type == "optimization":
-            subtasks = [
-                {"id": f"{goal_id}_sub1", "description": f"「{description}」の現状分析", "status": "pending", "completed": False},
-                {"id": f"{goal_id}_sub2", "description": f"「{description}」の改善点特定", "status": "pending", "completed": False},
-                {"id": f"{goal_id}_sub3", "description": f"「{description}」の最適化実施", "status": "pending", "completed": False},
-                {"id": f"{goal_id}_sub4", "description": f"「{description}」の最適化効果測定", "status": "pending", "completed": False}
-            ]
-        else:
-            # 汎用的なサブタスク
-            subtasks = [
-                {"id": f"{goal_id}_sub1", "description": f"「{description}」の調査", "status": "pending", "completed": False},
-                {"id": f"{goal_id}_sub2", "description": f"「{description}」の計画立案", "status": "pending", "completed": False},
-                {"id": f"{goal_id}_sub3", "description": f"「{description}」の実行", "status": "pending", "completed": False},
-                {"id": f"{goal_id}_sub4", "description": f"「{description}」の評価", "status": "pending", "completed": False}
-            ]
+        templates = _SUBTASK_TEMPLATES.get(goal_type, _DEFAULT_SUBTASK_TEMPLATES)
+        subtasks = [
+            {"id": f"{goal_id}_sub{i}", "description": template.format(d=description), "status": "pending", "completed": False}
+            for i, template in enumerate(templates, 1)
+        ]
         
         # 目標にサブタスクを追加
         goal["subtasks"] = subtasks
+        goal["completed_subtask_count"] = 0
         
         # データの保存
         self._save_data()
@@ -247,6 +314,9 @@ class GoalSystem:
             self.logger.warning(f"Cannot update progress: goal {goal_id} already completed")
             return {"status": "error", "message": "Goal already completed"}
         
+        # この呼び出しで記録するタイムスタンプは同一の時刻を使用
+        now_iso = datetime.now().isoformat()
+        
         # 前回の進捗
         old_progress = goal["progress"]
         
@@ -255,16 +325,17 @@ class GoalSystem:
         
         # 完了したサブタスクを更新
         if completed_subtasks:
-            for subtask_id in completed_subtasks:
-                for subtask in goal["subtasks"]:
-                    if subtask["id"] == subtask_id and not subtask["completed"]:
-                        subtask["status"] = "completed"
-                        subtask["completed"] = True
-                        subtask["completed_at"] = datetime.now().isoformat()
+            completed_ids = set(completed_subtasks)
+            for subtask in goal["subtasks"]:
+                if subtask["id"] in completed_ids and not subtask["completed"]:
+                    subtask["status"] = "completed"
+                    subtask["completed"] = True
+                    subtask["completed_at"] = now_iso
+                    goal["completed_subtask_count"] += 1
         
         # サブタスクの進捗に基づいて目標の進捗を計算
         if goal["subtasks"]:
-            completed_count = sum(1 for st in goal["subtasks"] if st["completed"])
+            completed_count = goal["completed_subtask_count"]
             total_count = len(goal["subtasks"])
             calculated_progress = (completed_count / total_count) * 100 if total_count > 0 else 0
             
@@ -274,16 +345,17 @@ class GoalSystem:
         # 目標の完了チェック
         if goal["progress"] >= 100:
             goal["status"] = "completed"
-            goal["completed_at"] = datetime.now().isoformat()
+            goal["completed_at"] = now_iso
             
             # 完了した目標をリストから移動
-            self.goals.remove(goal)
+            _remove_identical(self.goals, goal)
+            _remove_identical(self._priority_bucket(goal["priority"]), goal)
             self.completed_goals.append(goal)
             
             self.logger.info(f"Goal {goal_id} completed")
         
         # 最終更新時刻を更新
-        goal["updated_at"] = datetime.now().isoformat()
+        goal["updated_at"] = now_iso
         
         # データの保存
         self._save_data()
@@ -317,17 +389,21 @@ class GoalSystem:
             self.logger.warning(f"Cannot add dependency: one or both goals not found")
             return False
         
+        # 依存関係が既に存在するか確認（集合は未作成の場合のみリストから作る）
+        dependency_set = self._dependency_sets.get(goal_id)
+        if dependency_set is None:
+            dependency_set = self._dependency_sets[goal_id] = set(goal["dependencies"])
+        if dependency_goal_id in dependency_set:
+            return True  # 既に存在する場合は成功とみなす
+        
         # 循環依存をチェック
         if self._has_circular_dependency(dependency_goal_id, goal_id):
             self.logger.warning(f"Cannot add dependency: would create circular dependency")
             return False
         
-        # 依存関係が既に存在するか確認
-        if dependency_goal_id in goal["dependencies"]:
-            return True  # 既に存在する場合は成功とみなす
-        
         # 依存関係を追加
         goal["dependencies"].append(dependency_goal_id)
+        dependency_set.add(dependency_goal_id)
         
         # データの保存
         self._save_data()
@@ -345,8 +421,8 @@ class GoalSystem:
         Returns:
             アクティブな目標のリスト（優先度順）
         """
-        # 優先度でソート（高い順）
-        sorted_goals = sorted(self.goals, key=lambda g: g["priority"], reverse=True)
+        # 優先度の高いバケットから順に連結（ソート不要）
+        sorted_goals = [goal for priority in range(5, 0, -1) for goal in self._by_priority[priority]]
         
         # 必要に応じて数を制限
         if max_count is not None:
@@ -366,8 +442,10 @@ class GoalSystem:
             return None
         
         for goal in active_goals:
-            # 依存関係をチェック
-            if any(self.get_goal(dep_id)["status"] != "completed" for dep_id in goal["dependencies"]):
+            # 依存関係をチェック（削除済みの依存は満たされたものとみなす）
+            goal_index = self._goal_index
+            if any(dep_id in goal_index and goal_index[dep_id]["status"] != "completed"
+                   for dep_id in goal["dependencies"]):
                 continue  # 依存する目標が完了していないためスキップ
             
             # サブタスクがない場合は分解
@@ -418,16 +496,9 @@ class GoalSystem:
                 "reason": "情報取得能力の向上"
             })
         
-        # 最適化目標の定期的な提案
-        last_optimization_goal = next(
-            (g for g in self.goals + self.completed_goals 
-             if g["type"] == "optimization" and 
-             datetime.fromisoformat(g["created_at"]) > 
-             datetime.now().replace(hour=0, minute=0, second=0, microsecond=0)), 
-            None
-        )
-        
-        if not last_optimization_goal:
+        # 最適化目標の定期的な提案（本日まだ作成していない場合）
+        last_optimization_date = self._last_optimization_goal_date
+        if last_optimization_date is None or last_optimization_date < date.today():
             suggestions.append({
                 "type": "optimization",
                 "description": "知識処理パイプラインの最適化",
@@ -453,7 +524,7 @@ class GoalSystem:
         Returns:
             レビュー結果
         """
-        now = time.time()
+        now = time.monotonic()
         if now < self.next_review_time:
             return {"status": "skipped", "message": "Review time not reached"}
         
@@ -467,78 +538,202 @@ class GoalSystem:
             "removed_goals": 0
         }
         
-        # 各目標をレビュー
-        for goal in self.goals[:]:  # コピーで反復して元のリストを変更
-            # レビューカウントを増加
-            goal["review_count"] += 1
-            goal["last_reviewed"] = datetime.now().isoformat()
+        # 全目標に同一のレビュー時刻を記録
+        reviewed_at = datetime.now().isoformat()
+        
+        # レビュー中の保存はまとめて最後に一度だけ行う
+        with self.batched():
+            # 削除対象の目標（リストからの除去はループ後に一括で行う）
+            # 目標IDは重複し得るため、オブジェクトの同一性で識別する
+            removed = set()
+            
+            # 各目標をレビュー
+            for goal in self.goals:
+                # レビューカウントを増加
+                goal["review_count"] += 1
+                goal["last_reviewed"] = reviewed_at
+                
+                # 停滞している目標を特定（進捗が乏しい）
+                is_stalled = False
+                if goal["review_count"] > 3 and goal["progress"] < 30:
+                    review_results["stalled_goals"] += 1
+                    is_stalled = True
+                    
+                    # 優先度を下げるか、古すぎる場合は削除
+                    if goal["review_count"] > 5:
+                        removed.add(id(goal))
+                        self._goal_index.pop(goal["id"], None)
+                        self._dependency_sets.pop(goal["id"], None)
+                        review_results["removed_goals"] += 1
+                        self.logger.info(f"Removed stalled goal: {goal['id']} - {goal['description']}")
+                    else:
+                        # 優先度を1段階下げる（最低1）
+                        if goal["priority"] > 1:
+                            _remove_identical(self._priority_bucket(goal["priority"]), goal)
+                            goal["priority"] -= 1
+                            self._priority_bucket(goal["priority"]).append(goal)
+                            review_results["priority_adjustments"] += 1
+                            self.logger.info(f"Lowered priority for stalled goal: {goal['id']}")
+                
+                # 依存関係の確認と更新（完了済み・削除済みの依存を除外）
+                dependencies = goal["dependencies"]
+                if dependencies:
+                    goal_index = self._goal_index
+                    remaining = [
+                        dep_id for dep_id in dependencies
+                        if dep_id in goal_index and goal_index[dep_id]["status"] != "completed"
+                    ]
+                    if len(remaining) != len(dependencies):
+                        dependencies[:] = remaining
+                        self._dependency_sets[goal["id"]] = set(remaining)
+                
+                review_results["reviewed_goals"] += 1
             
-            # 停滞している目標を特定（進捗が乏しい）
-            is_stalled = False
-            if goal["review_count"] > 3 and goal["progress"] < 30:
-                review_results["stalled_goals"] += 1
-                is_stalled = True
+            # 停滞により削除された目標を一度の走査で除去
+            if removed:
+                self.goals = [g for g in self.goals if id(g) not in removed]
+                for priority, bucket in self._by_priority.items():
+                    self._by_priority[priority] = [g for g in bucket if id(g) not in removed]
                 
-                # 優先度を下げるか、古すぎる場合は削除
-                if goal["review_count"] > 5:
-                    self.goals.remove(goal)
-                    review_results["removed_goals"] += 1
-                    self.logger.info(f"Removed stalled goal: {goal['id']} - {goal['description']}")
-                else:
-                    # 優先度を1段階下げる（最低1）
-                    if goal["priority"] > 1:
-                        goal["priority"] -= 1
-                        review_results["priority_adjustments"] += 1
-                        self.logger.info(f"Lowered priority for stalled goal: {goal['id']}")
+                # 削除した最適化目標が本日の作成分であれば、同日に再び提案できるよう求め直す
+                self._refresh_last_optimization_goal_date()
             
-            # 依存関係の確認と更新
-            for dep_id in goal["dependencies"][:]:  # コピーで反復
-                dep_goal = self.get_goal(dep_id)
-                if not dep_goal or dep_goal["status"] == "completed":
-                    # 完了した依存を削除
-                    goal["dependencies"].remove(dep_id)
+            # 新しい目標の提案
+            suggestions = self.suggest_new_goals()
+            rand = random.random
+            for suggestion in suggestions:
+                # 1/3の確率で自動的に目標を追加
+                if rand() < 0.33:
+                    self.set_goal(
+                        description=suggestion["description"],
+                        goal_type=suggestion["type"],
+                        priority=suggestion["priority"]
+                    )
+                    review_results["goals_suggested"] += 1
             
-            review_results["reviewed_goals"] += 1
-        
-        # 新しい目標の提案
-        suggestions = self.suggest_new_goals()
-        for suggestion in suggestions:
-            # 1/3の確率で自動的に目標を追加
-            if random.random() < 0.33:
-                self.set_goal(
-                    description=suggestion["description"],
-                    goal_type=suggestion["type"],
-                    priority=suggestion["priority"]
-                )
-                review_results["goals_suggested"] += 1
+            # レビューした目標がある場合のみ保存（追加された目標はset_goal側で記録済み）
+            if review_results["reviewed_goals"]:
+                self._save_data()
         
         # 次のレビュー時刻を設定
-        self.next_review_time = now + self.config.get("review_interval_hours", 1) * 3600
-        
-        # データの保存
-        self._save_data()
+        self.next_review_time = now + self._review_interval_seconds
         
         self.logger.info(f"Goal review completed: {review_results}")
         return {"status": "success", "results": review_results}
     
     def _load_data(self) -> None:
         """データファイルから目標データをロード"""
-        if os.path.exists(self.data_file):
-            try:
-                with open(self.data_file, "r", encoding='utf-8') as f:
-                    data = json.load(f)
-                
-                self.goals = data.get("goals", [])
-                self.completed_goals = data.get("completed_goals", [])
-                
-                self.logger.info(f"Loaded {len(self.goals)} active goals and {len(self.completed_goals)} completed goals")
-            except Exception as e:
-                self.logger.error(f"Error loading goal data: {str(e)}")
-                # デフォルトの空のリストを使用
-                self.goals = []
-                self.completed_goals = []
+        try:
+            with open(self.data_file, "rb") as f:
+                raw = f.read()
+        except FileNotFoundError:
+            return
+        except OSError as e:
+            self.logger.error(f"Error loading goal data: {str(e)}")
+            return
+        
+        try:
+            data = orjson.loads(raw) if ORJSON_AVAILABLE else json.loads(raw)
+            
+            self.goals = data.get("goals", [])
+            self.completed_goals = data.get("completed_goals", [])
+            
+            for goal in self.goals:
+                self._normalize_goal(goal)
+            for goal in self.completed_goals:
+                self._normalize_goal(goal)
+            
+            self.logger.info(f"Loaded {len(self.goals)} active goals and {len(self.completed_goals)} completed goals")
+        except Exception as e:
+            # 再読み込みせずに、読み込み済みの内容の先頭を診断用に記録
+            self.logger.error(f"Error loading goal data: {str(e)} (size={len(raw)} bytes, head={raw[:80]!r})")
+            # デフォルトの空のリストを使用
+            self.goals = []
+            self.completed_goals = []
+    
+    @staticmethod
+    def _normalize_goal(goal: Dict[str, Any]) -> None:
+        """古いデータ形式の目標に欠けているキーを既定値で補う"""
+        for key, default in _GOAL_DEFAULTS:
+            if key not in goal:
+                goal[key] = default() if callable(default) else default
+        
+        if "completed_subtask_count" not in goal:
+            goal["completed_subtask_count"] = sum(1 for st in goal["subtasks"] if st.get("completed"))
+    
+    def _rebuild_index(self) -> None:
+        """目標ID・依存関係・優先度のインデックスを現在の目標リストから再構築"""
+        self._goal_index = {goal["id"]: goal for goal in self.completed_goals}
+        self._goal_index.update((goal["id"], goal) for goal in self.goals)
+        
+        self._dependency_sets = {
+            goal["id"]: set(goal["dependencies"]) for goal in self.goals if goal["dependencies"]
+        }
+        
+        self._by_priority = {priority: [] for priority in range(1, 6)}
+        for goal in self.goals:
+            self._priority_bucket(goal["priority"]).append(goal)
+        
+        self._refresh_last_optimization_goal_date()
+    
+    def _refresh_last_optimization_goal_date(self) -> None:
+        """保持している目標から最後に最適化目標を作成した日付を求め直す"""
+        optimization_dates = [
+            _created_date(goal) for goal in self._goal_index.values() if goal["type"] == "optimization"
+        ]
+        self._last_optimization_goal_date = max(filter(None, optimization_dates), default=None)
+    
+    def _priority_bucket(self, priority: int) -> List[Dict[str, Any]]:
+        """優先度に対応するアクティブ目標のバケットを取得（範囲外の値は1-5に丸める）"""
+        return self._by_priority[max(1, min(5, priority))]
+    
+    @contextmanager
+    def batched(self):
+        """
+        ブロック内の保存をまとめ、終了時に一度だけ書き出すコンテキストマネージャ
+        
+        Example:
+            with goal_system.batched():
+                goal_system.set_goal("...")
+                goal_system.set_goal("...")
+        """
+        self._suppress_save += 1
+        try:
+            yield self
+        finally:
+            self._suppress_save -= 1
+            if self._suppress_save == 0:
+                self.flush()
+    
+    def _make_atexit_hook(self):
+        """インスタンスを強参照しない終了時の保存処理を作成"""
+        flush_ref = weakref.WeakMethod(self.flush)
+        
+        def flush_at_exit() -> None:
+            flush = flush_ref()
+            if flush is not None:
+                flush()
+        
+        return flush_at_exit
+    
+    def close(self) -> None:
+        """未保存の変更を書き出し、終了時の保存処理の登録を解除"""
+        self.flush()
+        atexit.unregister(self._atexit_hook)
+    
+    def flush(self) -> None:
+        """未保存の変更があればデータファイルに書き出す"""
+        if self._dirty:
+            self._write_data()
     
     def _save_data(self) -> None:
+        """目標データの変更を記録し、バッチ中でなければ保存"""
+        self._dirty = True
+        if self._suppress_save > 0:
+            return
+        self._write_data()
+    
+    def _write_data(self) -> None:
         """目標データをデータファイルに保存"""
         try:
             # ディレクトリの確認
@@ -550,35 +745,43 @@ class GoalSystem:
                 "updated_at": datetime.now().isoformat()
             }
             
-            with open(self.data_file, "w", encoding='utf-8') as f:
-                json.dump(data, f, ensure_ascii=False, indent=2)
+            if ORJSON_AVAILABLE:
+                buf = orjson.dumps(data, option=orjson.OPT_INDENT_2 | orjson.OPT_NON_STR_KEYS)
+            else:
+                buf = json.dumps(data, ensure_ascii=False, indent=2).encode("utf-8")
             
+            # 一時ファイルに書き込んでから置き換え、書き込み途中のファイルが残らないようにする
+            tmp_file = self.data_file + ".tmp"
+            with open(tmp_file, "wb") as f:
+                f.write(buf)
+            os.replace(tmp_file, self.data_file)
+            
+            self._dirty = False
             self.logger.debug("Goal data saved")
         except Exception as e:
             self.logger.error(f"Error saving goal data: {str(e)}")
     
-    def _has_circular_dependency(self, goal_id: str, dependency_id: str, visited: Optional[set] = None) -> bool:
-        """目標間の循環依存をチェック"""
-        if visited is None:
-            visited = set()
-        
-        if goal_id in visited:
-            return False
-        
-        visited.add(goal_id)
-        
-        # 依存先がチェック対象と一致する場合
-        if goal_id == dependency_id:
-            return True
-        
-        # このゴールの依存先をチェック
-        goal = self.get_goal(goal_id)
-        if not goal:
-            return False
+    def _has_circular_dependency(self, goal_id: str, dependency_id: str) -> bool:
+        """目標間の循環依存をチェック（goal_idの依存をたどってdependency_idに到達するか）"""
+        visited = {goal_id}
+        queue = deque([goal_id])
         
-        for dep_id in goal["dependencies"]:
-            if self._has_circular_dependency(dep_id, dependency_id, visited):
+        while queue:
+            current_id = queue.popleft()
+            
+            # 依存先がチェック対象と一致する場合
+            if current_id == dependency_id:
                 return True
+            
+            # この目標の依存先をたどる
+            goal = self._goal_index.get(current_id)
+            if not goal:
+                continue
+            
+            for dep_id in goal["dependencies"]:
+                if dep_id not in visited:
+                    visited.add(dep_id)
+                    queue.append(dep_id)
         
         return False
     
@@ -589,50 +792,33 @@ class GoalSystem:
         Returns:
             統計情報
         """
-        # タイプ別の目標数
-        type_counts = {}
+        # タイプ別・優先度別の目標数、進捗率、依存関係の数を一度の走査で集計
+        type_counts = Counter()
+        priority_counts = Counter()
+        total_progress = 0
+        dependency_count = 0
         for goal in self.goals:
-            goal_type = goal["type"]
-            if goal_type not in type_counts:
-                type_counts[goal_type] = 1
-            else:
-                type_counts[goal_type] += 1
-        
-        # 優先度別の目標数
-        priority_counts = {}
-        for goal in self.goals:
-            priority = goal["priority"]
-            if priority not in priority_counts:
-                priority_counts[priority] = 1
-            else:
-                priority_counts[priority] += 1
+            type_counts[goal["type"]] += 1
+            priority_counts[goal["priority"]] += 1
+            total_progress += goal["progress"]
+            dependency_count += len(goal["dependencies"])
         
         # 進捗率の平均
-        avg_progress = sum(goal["progress"] for goal in self.goals) / len(self.goals) if self.goals else 0
-        
-        # 依存関係の数
-        dependency_count = sum(len(goal["dependencies"]) for goal in self.goals)
+        avg_progress = total_progress / len(self.goals) if self.goals else 0
         
-        # 最近完了した目標
-        recent_completed = []
-        if self.completed_goals:
-            sorted_completed = sorted(
-                self.completed_goals,
-                key=lambda g: g.get("completed_at", ""),
-                reverse=True
-            )
-            recent_completed = sorted_completed[:5]  # 最新5件
+        # 最近完了した目標（最新5件）
+        recent_completed = heapq.nlargest(5, self.completed_goals, key=lambda g: g.get("completed_at", ""))
         
         return {
             "active_goals": len(self.goals),
             "completed_goals": len(self.completed_goals),
-            "goal_types": type_counts,
-            "priority_distribution": priority_counts,
+            "goal_types": dict(type_counts),
+            "priority_distribution": dict(priority_counts),
             "average_progress": avg_progress,
             "dependency_count": dependency_count,
             "recently_completed": [
                 {"id": g["id"], "description": g["description"], "completed_at": g.get("completed_at")}
                 for g in recent_completed
             ],
-            "next_review_in_seconds": max(0, self.next_review_time - time.time())
+            "next_review_in_seconds": max(0, self.next_review_time - time.monotonic())
         }
@@ -10,10 +10,163 @@ import json
 import os
 import time
 import logging
+import threading
+import hashlib
+import heapq
+import math
+from array import array
 from datetime import datetime
+from collections import OrderedDict
+from functools import wraps
 from typing import Dict, List, Any, Optional, Tuple
 import re
 
+# sqlite-vecが利用可能な場合は埋め込みの近傍検索をSQLite内で実行
+try:
+    import sqlite_vec
+    SQLITE_VEC_AVAILABLE = True
+except ImportError:
+    SQLITE_VEC_AVAILABLE = False
+
+# orjsonが利用可能な場合はエクスポートのシリアライズに使用
+try:
+    import orjson
+    ORJSON_AVAILABLE = True
+except ImportError:
+    ORJSON_AVAILABLE = False
+
+# 検索キーワード抽出用（呼び出しごとの再構築を避けるためモジュールレベルで保持）
+_KEYWORD_RE = re.compile(r'\b\w{3,20}\b')
+_STOPWORDS = frozenset({
+    "and", "or", "the", "is", "are", "in", "on", "at", "to", "for", "with", "by",
+    "about", "like", "that", "this", "these", "those", "from", "as", "of"
+})
+
+# 検索結果の種類ごとの列名（search_knowledgeの統合クエリの列順に対応）
+_SEARCH_COLUMNS = {
+    "fact": ("id", "content", "source", "confidence", "created_at", "updated_at", "category", "embedding_id"),
+    "concept": ("id", "name", "description", "confidence", "created_at", "updated_at", "definitions"),
+    "relation": ("id", "source_concept_id", "target_concept_id", "relation_type", "description",
+                 "confidence", "created_at", "source_name", "target_name"),
+}
+
+# RETURNING句はSQLite 3.35以降でのみ使える（それより古い場合は挿入後にIDを取得し直す）
+_SQLITE_SUPPORTS_RETURNING = sqlite3.sqlite_version_info >= (3, 35, 0)
+
+# 頻繁に実行するSQL文（同じ文字列を使い回し、sqlite3の文キャッシュに常に当たるようにする）
+_SQL_INSERT_FACT = """
+    INSERT INTO facts (content, source, confidence, created_at, updated_at, category, content_hash)
+    VALUES (?, ?, ?, ?, ?, ?, ?)
+    ON CONFLICT(content_hash) DO NOTHING
+"""
+_SQL_SELECT_FACT_ID = "SELECT id FROM facts WHERE content_hash=?"
+# 結果として返す事実の列（内部用のcontent_hashは含めない）
+_FACT_COLUMNS = ", ".join(_SEARCH_COLUMNS["fact"])
+_SQL_SELECT_CONCEPT_ID = "SELECT id FROM concepts WHERE name=?"
+_SQL_INSERT_CONCEPT_NAME = "INSERT INTO concepts (name, created_at, updated_at) VALUES (?, ?, ?)"
+# 概念を保存（既存の場合は説明が指定されたときのみ更新）
+_SQL_UPSERT_CONCEPT = """
+    INSERT INTO concepts (name, description, confidence, created_at, updated_at)
+    VALUES (?, ?, ?, ?, ?)
+    ON CONFLICT(name) DO UPDATE SET
+        description = COALESCE(NULLIF(excluded.description, ''), concepts.description),
+        updated_at = CASE WHEN COALESCE(excluded.description, '') <> ''
+                          THEN excluded.updated_at ELSE concepts.updated_at END
+"""
+_SQL_INSERT_DEFINITION = """
+    INSERT INTO concept_definitions (concept_id, definition, source, confidence, created_at)
+    VALUES (?, ?, ?, ?, ?)
+"""
+_SQL_INSERT_RELATION = """
+    INSERT INTO relations
+    (source_concept_id, target_concept_id, relation_type, description, confidence, created_at)
+    VALUES (?, ?, ?, ?, ?, ?)
+"""
+# 項目タイプ → 信頼度更新SQL（関係テーブルにはupdated_at列がない）
+_SQL_UPDATE_CONFIDENCE = {
+    "fact": "UPDATE facts SET confidence=:confidence, updated_at=:updated_at WHERE id=:id",
+    "concept": "UPDATE concepts SET confidence=:confidence, updated_at=:updated_at WHERE id=:id",
+    "relation": "UPDATE relations SET confidence=:confidence WHERE id=:id",
+}
+
+def _synchronized(method):
+    """
+    共有接続へのアクセスをインスタンスのロックで直列化するデコレータ。
+    メソッドがコミットせずに終了した場合（エラー時）は未確定の変更をロールバックする。
+    """
+    @wraps(method)
+    def wrapper(self, *args, **kwargs):
+        with self._lock:
+            try:
+                return method(self, *args, **kwargs)
+            finally:
+                if self._conn.in_transaction:
+                    self._conn.rollback()
+                    # ロールバックされた行のIDがキャッシュに残らないよう破棄
+                    self._concept_id_cache.clear()
+                    self._fact_id_cache.clear()
+    return wrapper
+
+# これ以上の件数の事実をインポートする場合は、二次インデックスを外して一括挿入後に再作成する
+_INDEX_REBUILD_THRESHOLD = 1000
+
+# 埋め込みの保存形式 → (vec0の要素型, 値の変換SQL関数)
+_EMBEDDING_FORMATS = {
+    "float32": ("float", "?"),
+    "int8": ("int8", "vec_int8(?)"),
+    "bit": ("bit", "vec_bit(?)"),
+}
+
+def _quantize_int8(vector: List[float]) -> bytes:
+    """
+    ベクトルを最大絶対値で-127〜127に量子化（コサイン距離はベクトルごとの拡大縮小に依存しないため
+    スケールを保存する必要はない）
+    """
+    peak = max((abs(x) for x in vector), default=0.0)
+    if peak == 0:
+        return bytes(len(vector))
+    scale = 127.0 / peak
+    return array("b", (int(round(x * scale)) for x in vector)).tobytes()
+
+def _quantize_bit(vector: List[float]) -> bytes:
+    """ベクトルを符号ビットに変換し、8次元ずつ1バイトに詰める（先頭の次元を最上位ビットとする）"""
+    packed = bytearray((len(vector) + 7) // 8)
+    for i, x in enumerate(vector):
+        if x > 0:
+            packed[i >> 3] |= 0x80 >> (i & 7)
+    return bytes(packed)
+
+def _content_hash(content: str) -> bytes:
+    """事実内容の16バイトのハッシュ（重複チェックの索引キーとキャッシュキーに使用）"""
+    return hashlib.blake2b(content.encode("utf-8"), digest_size=16).digest()
+
+def _dump_json(obj: Any) -> bytes:
+    """1つの値をUTF-8のJSONバイト列に変換"""
+    if ORJSON_AVAILABLE:
+        return orjson.dumps(obj)
+    return json.dumps(obj, ensure_ascii=False).encode("utf-8")
+
+class _LRUCache(OrderedDict):
+    """件数上限付きのLRUキャッシュ"""
+    
+    def __init__(self, maxsize: int = 1024):
+        super().__init__()
+        self.maxsize = maxsize
+    
+    def lookup(self, key):
+        """キーの値を返す（存在しない場合はNone）。参照したキーは最新扱いにする"""
+        value = self.get(key)
+        if value is not None:
+            self.move_to_end(key)
+        return value
+    
+    def put(self, key, value) -> None:
+        """値を登録し、上限を超えた場合は最も古いキーを削除"""
+        self[key] = value
+        self.move_to_end(key)
+        if len(self) > self.maxsize:
+            self.popitem(last=False)
+
 class KnowledgeBase:
     """
     知識ベースを管理するクラス
@@ -39,17 +192,58 @@ class KnowledgeBase:
             self.logger.warning(f"設定ファイルの読み込みに失敗しました: {str(e)}。デフォルト設定を使用します。")
             self.config = {"default": True}
         
+        # 共有接続（自律スレッドとメインスレッドから使われるためロックで直列化）
+        self._lock = threading.RLock()
+        self._conn = sqlite3.connect(self.db_path, check_same_thread=False, cached_statements=200)
+        self._conn.row_factory = sqlite3.Row  # 結果を辞書として取得
+        
+        # 概念名→ID、事実内容のハッシュ→ID（未登録は-1）のキャッシュ
+        self._concept_id_cache = _LRUCache(1024)
+        self._fact_id_cache = _LRUCache(1024)
+        
         # DB初期化
         self._initialize_db()
         
         self.logger.info("Knowledge base initialized")
     
+    def close(self) -> None:
+        """データベース接続を閉じる"""
+        with self._lock:
+            try:
+                self._conn.execute("PRAGMA optimize")
+            except sqlite3.Error:
+                pass
+            self._conn.close()
+    
+    @_synchronized
+    def vacuum(self) -> bool:
+        """
+        データベースファイルを再構築して未使用領域を解放
+        
+        Returns:
+            処理が成功したかどうか
+        """
+        try:
+            # VACUUMはトランザクション内では実行できない
+            self._conn.execute("VACUUM")
+            self.logger.info("Knowledge base vacuumed")
+            return True
+        except Exception as e:
+            self.logger.error(f"Error vacuuming knowledge base: {str(e)}")
+            return False
+    
     def _initialize_db(self):
         """データベースの初期化"""
         try:
-            # DBに接続
-            conn = sqlite3.connect(self.db_path)
-            cursor = conn.cursor()
+            cursor = self._conn.cursor()
+            
+            # 接続設定（WALは永続的で、コミットごとのfsyncを減らし読み書きを並行させる）
+            cursor.execute("PRAGMA journal_mode=WAL")
+            cursor.execute("PRAGMA synchronous=NORMAL")
+            cursor.execute("PRAGMA temp_store=MEMORY")
+            cursor.execute("PRAGMA cache_size=-20000")  # 約20MBのページキャッシュ
+            cursor.execute("PRAGMA mmap_size=268435456")  # 256MBのメモリマップ
+            cursor.execute("PRAGMA foreign_keys=ON")
             
             # 事実テーブルの作成
             cursor.execute('''
@@ -61,9 +255,11 @@ class KnowledgeBase:
                 created_at TEXT,
                 updated_at TEXT,
                 category TEXT DEFAULT 'general',
-                embedding_id INTEGER
+                embedding_id INTEGER,
+                content_hash BLOB  -- 内容のハッシュ（重複チェック用）
             )
             ''')
+            removed_fact_ids = self._ensure_content_hash(cursor)
             
             # 概念テーブルの作成
             cursor.execute('''
@@ -124,8 +320,34 @@ class KnowledgeBase:
             )
             ''')
             
-            conn.commit()
-            conn.close()
+            # 検索・重複チェックで使われる列のインデックス
+            # （重複チェックは固定長のハッシュで行うため、本文のインデックスは不要）
+            cursor.execute("DROP INDEX IF EXISTS idx_facts_content")
+            cursor.execute("CREATE UNIQUE INDEX IF NOT EXISTS idx_facts_hash ON facts(content_hash)")
+            cursor.execute("CREATE INDEX IF NOT EXISTS idx_facts_category_conf ON facts(category, confidence DESC)")
+            cursor.execute("CREATE INDEX IF NOT EXISTS idx_relations_src ON relations(source_concept_id)")
+            cursor.execute("CREATE INDEX IF NOT EXISTS idx_relations_tgt ON relations(target_concept_id)")
+            cursor.execute("CREATE INDEX IF NOT EXISTS idx_concept_defs_concept ON concept_definitions(concept_id)")
+            
+            # 部分一致検索用の全文検索インデックス
+            self._fts_enabled = self._create_fts_tables(cursor)
+            
+            # 埋め込みの近傍検索用ベクトルインデックス
+            self.embedding_dim = int(self.config.get("embedding_dim", 768))
+            self.embedding_format = self.config.get("embedding_format", "float32")
+            if self.embedding_format not in _EMBEDDING_FORMATS:
+                self.logger.warning(f"Unknown embedding format: {self.embedding_format}. Using float32.")
+                self.embedding_format = "float32"
+            self._vec_enabled = self._create_vec_table(cursor)
+            
+            # 移行時に削除した重複行の埋め込みも削除（残すと近傍検索の枠を占有してしまう）
+            if removed_fact_ids:
+                params = [(fact_id,) for fact_id in removed_fact_ids]
+                cursor.executemany("DELETE FROM embeddings WHERE id=?", params)
+                if self._vec_enabled:
+                    cursor.executemany("DELETE FROM embeddings_vec WHERE rowid=?", params)
+            
+            self._conn.commit()
             
             self.logger.info("Database initialized successfully")
             
@@ -133,6 +355,126 @@ class KnowledgeBase:
             self.logger.error(f"Database initialization error: {str(e)}")
             raise
     
+    def _ensure_content_hash(self, cursor) -> List[int]:
+        """
+        既存のDBにcontent_hash列を追加し、未計算の行のハッシュを埋めて重複行を除く
+        
+        Returns:
+            削除した重複行のIDのリスト
+        """
+        cursor.execute("PRAGMA table_info(facts)")
+        if "content_hash" not in {row["name"] for row in cursor.fetchall()}:
+            cursor.execute("ALTER TABLE facts ADD COLUMN content_hash BLOB")
+        
+        cursor.execute("SELECT id, content FROM facts WHERE content_hash IS NULL")
+        rows = [(_content_hash(row["content"]), row["id"]) for row in cursor.fetchall()]
+        if rows:
+            cursor.executemany("UPDATE facts SET content_hash=? WHERE id=?", rows)
+        
+        # 一意インデックスを作成する前に、旧スキーマで許されていた同一内容の重複行を
+        # 最も古い行（最小のID）だけ残して削除する
+        cursor.execute("SELECT 1 FROM sqlite_master WHERE type='index' AND name='idx_facts_hash'")
+        if cursor.fetchone() is not None:
+            return []
+        
+        cursor.execute(
+            "SELECT id FROM facts WHERE id NOT IN (SELECT MIN(id) FROM facts GROUP BY content_hash)"
+        )
+        removed_ids = [row[0] for row in cursor.fetchall()]
+        if removed_ids:
+            cursor.executemany("DELETE FROM facts WHERE id=?", [(fact_id,) for fact_id in removed_ids])
+            self.logger.info(f"Removed {len(removed_ids)} duplicate facts before creating idx_facts_hash")
+        return removed_ids
+    
+    def _create_fts_tables(self, cursor) -> bool:
+        """
+        事実・概念の全文検索（FTS5 trigram）テーブルと同期用トリガーを作成
+        
+        Returns:
+            FTS5が利用可能かどうか（利用できない場合は通常のLIKE検索を使用）
+        """
+        cursor.execute("SELECT name FROM sqlite_master WHERE type='table' AND name IN ('facts_fts', 'concepts_fts')")
+        existing = {row[0] for row in cursor.fetchall()}
+        
+        try:
+            cursor.execute('''
+            CREATE VIRTUAL TABLE IF NOT EXISTS facts_fts USING fts5(
+                content, content='facts', content_rowid='id', tokenize='trigram'
+            )
+            ''')
+            cursor.execute('''
+            CREATE VIRTUAL TABLE IF NOT EXISTS concepts_fts USING fts5(
+                name, description, content='concepts', content_rowid='id', tokenize='trigram'
+            )
+            ''')
+        except sqlite3.OperationalError as e:
+            self.logger.warning(f"FTS5 is not available, falling back to LIKE search: {str(e)}")
+            return False
+        
+        # 元テーブルの変更をFTSインデックスに反映するトリガー
+        cursor.executescript('''
+        CREATE TRIGGER IF NOT EXISTS facts_fts_ai AFTER INSERT ON facts BEGIN
+            INSERT INTO facts_fts(rowid, content) VALUES (new.id, new.content);
+        END;
+        CREATE TRIGGER IF NOT EXISTS facts_fts_ad AFTER DELETE ON facts BEGIN
+            INSERT INTO facts_fts(facts_fts, rowid, content) VALUES ('delete', old.id, old.content);
+        END;
+        CREATE TRIGGER IF NOT EXISTS facts_fts_au AFTER UPDATE OF content ON facts BEGIN
+            INSERT INTO facts_fts(facts_fts, rowid, content) VALUES ('delete', old.id, old.content);
+            INSERT INTO facts_fts(rowid, content) VALUES (new.id, new.content);
+        END;
+        CREATE TRIGGER IF NOT EXISTS concepts_fts_ai AFTER INSERT ON concepts BEGIN
+            INSERT INTO concepts_fts(rowid, name, description) VALUES (new.id, new.name, new.description);
+        END;
+        CREATE TRIGGER IF NOT EXISTS concepts_fts_ad AFTER DELETE ON concepts BEGIN
+            INSERT INTO concepts_fts(concepts_fts, rowid, name, description)
+            VALUES ('delete', old.id, old.name, old.description);
+        END;
+        CREATE TRIGGER IF NOT EXISTS concepts_fts_au AFTER UPDATE OF name, description ON concepts BEGIN
+            INSERT INTO concepts_fts(concepts_fts, rowid, name, description)
+            VALUES ('delete', old.id, old.name, old.description);
+            INSERT INTO concepts_fts(rowid, name, description) VALUES (new.id, new.name, new.description);
+        END;
+        ''')
+        
+        # 既存のDBに新しくFTSテーブルを追加した場合は既存データから構築
+        if "facts_fts" not in existing:
+            cursor.execute("INSERT INTO facts_fts(facts_fts) VALUES ('rebuild')")
+        if "concepts_fts" not in existing:
+            cursor.execute("INSERT INTO concepts_fts(concepts_fts) VALUES ('rebuild')")
+        
+        return True
+    
+    def _create_vec_table(self, cursor) -> bool:
+        """
+        sqlite-vecのvec0仮想テーブルを作成
+        
+        Returns:
+            sqlite-vecが利用可能かどうか（利用できない場合はembeddingsテーブルに保存）
+        """
+        if not SQLITE_VEC_AVAILABLE:
+            return False
+        
+        try:
+            self._conn.enable_load_extension(True)
+            try:
+                sqlite_vec.load(self._conn)
+            finally:
+                self._conn.enable_load_extension(False)
+            # bit型はハミング距離、それ以外はコサイン距離で比較
+            element_type = _EMBEDDING_FORMATS[self.embedding_format][0]
+            metric = "" if element_type == "bit" else " distance_metric=cosine"
+            cursor.execute(
+                "CREATE VIRTUAL TABLE IF NOT EXISTS embeddings_vec USING vec0("
+                f"embedding {element_type}[{self.embedding_dim}]{metric})"
+            )
+        except (AttributeError, sqlite3.Error) as e:
+            self.logger.warning(f"sqlite-vec is not available, falling back to Python search: {str(e)}")
+            return False
+        
+        return True
+    
+    @_synchronized
     def store_fact(self, content: str, source: Optional[str] = None, confidence: float = 0.7, 
                   category: str = "general") -> int:
         """
@@ -149,26 +491,31 @@ class KnowledgeBase:
         """
         try:
             # 重複チェック
-            if self._is_duplicate_fact(content):
+            fact_id = self._get_fact_id(content)
+            if fact_id != -1:
                 self.logger.info(f"Duplicate fact detected: {content[:50]}...")
-                return self._get_fact_id(content)
+                return fact_id
             
-            conn = sqlite3.connect(self.db_path)
-            cursor = conn.cursor()
+            cursor = self._conn.cursor()
             
             now = datetime.now().isoformat()
+            key = _content_hash(content)
             
-            cursor.execute(
-                '''
-                INSERT INTO facts (content, source, confidence, created_at, updated_at, category)
-                VALUES (?, ?, ?, ?, ?, ?)
-                ''',
-                (content, source, confidence, now, now, category)
-            )
+            params = (content, source, confidence, now, now, category, key)
+            if _SQLITE_SUPPORTS_RETURNING:
+                cursor.execute(_SQL_INSERT_FACT + " RETURNING id", params)
+                row = cursor.fetchone()
+            else:
+                cursor.execute(_SQL_INSERT_FACT, params)
+                row = (cursor.lastrowid,) if cursor.rowcount == 1 else None
+            if row is None:
+                # 別の接続が同じ内容を先に保存していた場合
+                cursor.execute(_SQL_SELECT_FACT_ID, (key,))
+                row = cursor.fetchone()
             
-            fact_id = cursor.lastrowid
-            conn.commit()
-            conn.close()
+            fact_id = row[0]
+            self._conn.commit()
+            self._fact_id_cache.put(key, fact_id)
             
             self.logger.info(f"Stored new fact (ID: {fact_id})")
             return fact_id
@@ -177,6 +524,7 @@ class KnowledgeBase:
             self.logger.error(f"Error storing fact: {str(e)}")
             return -1
     
+    @_synchronized
     def store_concept(self, name: str, description: Optional[str] = None, 
                      definitions: Optional[List[Dict[str, Any]]] = None,
                      confidence: float = 0.7) -> int:
@@ -193,53 +541,37 @@ class KnowledgeBase:
             新しい概念のID
         """
         try:
-            conn = sqlite3.connect(self.db_path)
-            cursor = conn.cursor()
+            cursor = self._conn.cursor()
             
             now = datetime.now().isoformat()
             
-            # まず概念自体を保存
-            try:
-                cursor.execute(
-                    '''
-                    INSERT INTO concepts (name, description, confidence, created_at, updated_at)
-                    VALUES (?, ?, ?, ?, ?)
-                    ''',
-                    (name, description, confidence, now, now)
-                )
-                concept_id = cursor.lastrowid
-            except sqlite3.IntegrityError:
-                # 既に存在する概念の場合はIDを取得
-                cursor.execute("SELECT id FROM concepts WHERE name=?", (name,))
-                concept_id = cursor.fetchone()[0]
-                
-                # 説明を更新
-                if description:
-                    cursor.execute(
-                        "UPDATE concepts SET description=?, updated_at=? WHERE id=?",
-                        (description, now, concept_id)
-                    )
+            # 概念自体を保存（既存の場合は説明が指定されたときのみ更新）
+            params = (name, description, confidence, now, now)
+            if _SQLITE_SUPPORTS_RETURNING:
+                cursor.execute(_SQL_UPSERT_CONCEPT + " RETURNING id", params)
+            else:
+                cursor.execute(_SQL_UPSERT_CONCEPT, params)
+                cursor.execute(_SQL_SELECT_CONCEPT_ID, (name,))
+            concept_id = cursor.fetchone()[0]
+            self._concept_id_cache.put(name, concept_id)
             
             # 定義を保存
             if definitions:
-                for definition in definitions:
-                    cursor.execute(
-                        '''
-                        INSERT INTO concept_definitions 
-                        (concept_id, definition, source, confidence, created_at)
-                        VALUES (?, ?, ?, ?, ?)
-                        ''',
+                cursor.executemany(
+                    _SQL_INSERT_DEFINITION,
+                    [
                         (
-                            concept_id, 
+                            concept_id,
                             definition.get("content", ""),
                             definition.get("source", ""),
                             definition.get("confidence", 0.7),
                             now
                         )
-                    )
+                        for definition in definitions
+                    ]
+                )
             
-            conn.commit()
-            conn.close()
+            self._conn.commit()
             
             self.logger.info(f"Stored concept: {name} (ID: {concept_id})")
             return concept_id
@@ -248,6 +580,7 @@ class KnowledgeBase:
             self.logger.error(f"Error storing concept: {str(e)}")
             return -1
     
+    @_synchronized
     def store_relation(self, source_concept: str, target_concept: str, relation_type: str,
                       description: Optional[str] = None, confidence: float = 0.7) -> int:
         """
@@ -264,27 +597,22 @@ class KnowledgeBase:
             新しい関係のID
         """
         try:
-            conn = sqlite3.connect(self.db_path)
-            cursor = conn.cursor()
-            
-            # 概念IDの取得（存在しない場合は作成）
-            source_id = self._get_or_create_concept_id(cursor, source_concept)
-            target_id = self._get_or_create_concept_id(cursor, target_concept)
+            cursor = self._conn.cursor()
             
+            # 関係と新しく作成する概念で同じ時刻を使う
             now = datetime.now().isoformat()
             
+            # 概念IDの取得（存在しない場合は作成）
+            source_id = self._get_or_create_concept_id(cursor, source_concept, now)
+            target_id = self._get_or_create_concept_id(cursor, target_concept, now)
+            
             cursor.execute(
-                '''
-                INSERT INTO relations 
-                (source_concept_id, target_concept_id, relation_type, description, confidence, created_at)
-                VALUES (?, ?, ?, ?, ?, ?)
-                ''',
+                _SQL_INSERT_RELATION,
                 (source_id, target_id, relation_type, description, confidence, now)
             )
             
             relation_id = cursor.lastrowid
-            conn.commit()
-            conn.close()
+            self._conn.commit()
             
             self.logger.info(f"Stored relation: {source_concept} {relation_type} {target_concept} (ID: {relation_id})")
             return relation_id
@@ -293,6 +621,7 @@ class KnowledgeBase:
             self.logger.error(f"Error storing relation: {str(e)}")
             return -1
     
+    @_synchronized
     def search_knowledge(self, query: str, limit: int = 10) -> Dict[str, List[Dict[str, Any]]]:
         """
         知識ベースを検索
@@ -305,15 +634,9 @@ class KnowledgeBase:
             検索結果（事実、概念、関係を含む辞書）
         """
         try:
-            conn = sqlite3.connect(self.db_path)
-            conn.row_factory = sqlite3.Row  # 結果を辞書として取得
-            cursor = conn.cursor()
+            cursor = self._conn.cursor()
             
-            # 検索履歴に記録
-            cursor.execute(
-                "INSERT INTO search_history (query, timestamp) VALUES (?, ?)",
-                (query, datetime.now().isoformat())
-            )
+            searched_at = datetime.now().isoformat()
             
             # クエリからキーワードを抽出
             keywords = self._extract_keywords(query)
@@ -321,84 +644,102 @@ class KnowledgeBase:
             if keywords:
                 search_pattern = "%" + "%".join(keywords) + "%"
             
-            # 事実を検索
-            cursor.execute(
-                "SELECT * FROM facts WHERE content LIKE ? ORDER BY confidence DESC LIMIT ?",
-                (search_pattern, limit)
-            )
-            facts = [dict(row) for row in cursor.fetchall()]
-            
-            # 概念を検索
+            # 事実・概念・関係を1文で検索し、種類(kind)・並び順のキー・各列を共通の列位置で返す
+            # （種類ごとにLIMITを適用するため、各検索は副問い合わせ内で並べ替えて件数を絞る）
+            if self._fts_enabled and keywords:
+                # いずれかのキーワードを含む行をFTS5のMATCHで絞り込み、BM25の関連度順に並べる
+                match_expr = " OR ".join(f'"{keyword}"' for keyword in keywords)
+                params = {
+                    "match": match_expr,
+                    "name_match": f"name : ({match_expr})",
+                    "pattern": search_pattern,
+                    "limit": limit
+                }
+                fact_source = "facts_fts JOIN facts f ON f.id = facts_fts.rowid WHERE facts_fts MATCH :match"
+                fact_rank = "bm25(facts_fts)"
+                concept_source = "concepts_fts JOIN concepts c ON c.id = concepts_fts.rowid WHERE concepts_fts MATCH :match"
+                concept_rank = "bm25(concepts_fts)"
+                concept_name_filter = "IN (SELECT rowid FROM concepts_fts WHERE concepts_fts MATCH :name_match)"
+            else:
+                # FTSが使えない場合（またはキーワードがない場合）はLIKEで絞り込み、信頼度順に並べる
+                params = {"pattern": search_pattern, "limit": limit}
+                if self._fts_enabled:
+                    fact_source = "facts f WHERE f.id IN (SELECT rowid FROM facts_fts WHERE content LIKE :pattern)"
+                    concept_source = '''concepts c WHERE c.id IN (
+                        SELECT rowid FROM concepts_fts WHERE name LIKE :pattern
+                        UNION SELECT rowid FROM concepts_fts WHERE description LIKE :pattern)'''
+                    concept_name_filter = "IN (SELECT rowid FROM concepts_fts WHERE name LIKE :pattern)"
+                else:
+                    fact_source = "facts f WHERE f.content LIKE :pattern"
+                    concept_source = "concepts c WHERE c.name LIKE :pattern OR c.description LIKE :pattern"
+                    concept_name_filter = "IN (SELECT id FROM concepts WHERE name LIKE :pattern)"
+                fact_rank = "-f.confidence"
+                concept_rank = "-c.confidence"
+            
+            # 列数を揃えるため不足分はNULLで埋める（JSONを経由しないので数値の精度は保たれる）
+            fact_columns = ", ".join(f"f.{column}" for column in _SEARCH_COLUMNS["fact"])
             cursor.execute(
-                '''
-                SELECT c.*, GROUP_CONCAT(d.definition, '|') as definitions, 
-                       GROUP_CONCAT(d.source, '|') as definition_sources,
-                       GROUP_CONCAT(d.confidence, '|') as definition_confidences
-                FROM concepts c
-                LEFT JOIN concept_definitions d ON c.id = d.concept_id
-                WHERE c.name LIKE ? OR c.description LIKE ?
-                GROUP BY c.id
-                ORDER BY c.confidence DESC
-                LIMIT ?
+                f'''
+                SELECT * FROM (
+                    SELECT 'fact' AS kind, {fact_rank} AS rank, -f.confidence AS tiebreak,
+                           {fact_columns}, NULL
+                    FROM {fact_source}
+                    ORDER BY rank, tiebreak LIMIT :limit)
+                UNION ALL
+                SELECT * FROM (
+                    SELECT 'concept', {concept_rank} AS rank, -c.confidence AS tiebreak,
+                           c.id, c.name, c.description, c.confidence, c.created_at, c.updated_at, (
+                               SELECT json_group_array(json_object(
+                                   'content', d.definition, 'source', d.source, 'confidence', d.confidence))
+                               FROM (SELECT definition, source, confidence FROM concept_definitions
+                                     WHERE concept_id = c.id ORDER BY id) d
+                           ), NULL, NULL
+                    FROM {concept_source}
+                    ORDER BY rank, tiebreak LIMIT :limit)
+                UNION ALL
+                SELECT * FROM (
+                    SELECT 'relation', -r.confidence AS rank, 0 AS tiebreak,
+                           r.id, r.source_concept_id, r.target_concept_id, r.relation_type,
+                           r.description, r.confidence, r.created_at, sc.name, tc.name
+                    FROM relations r
+                    JOIN concepts sc ON r.source_concept_id = sc.id
+                    JOIN concepts tc ON r.target_concept_id = tc.id
+                    WHERE sc.id {concept_name_filter} OR tc.id {concept_name_filter} OR r.description LIKE :pattern
+                    ORDER BY rank LIMIT :limit)
+                ORDER BY kind, rank, tiebreak
                 ''',
-                (search_pattern, search_pattern, limit)
+                params
             )
             
-            concepts = []
+            results = {"fact": [], "concept": [], "relation": []}
             for row in cursor.fetchall():
-                concept = dict(row)
-                
-                # 複数の定義を分割して加工
-                if concept.get('definitions'):
-                    definitions = []
-                    def_texts = concept['definitions'].split('|')
-                    def_sources = concept.get('definition_sources', '').split('|') if concept.get('definition_sources') else []
-                    def_confidences = concept.get('definition_confidences', '').split('|') if concept.get('definition_confidences') else []
-                    
-                    for i, text in enumerate(def_texts):
-                        if text:
-                            def_item = {"content": text}
-                            if i < len(def_sources) and def_sources[i]:
-                                def_item["source"] = def_sources[i]
-                            if i < len(def_confidences) and def_confidences[i]:
-                                try:
-                                    def_item["confidence"] = float(def_confidences[i])
-                                except ValueError:
-                                    def_item["confidence"] = 0.7
-                            definitions.append(def_item)
-                    
-                    concept['definitions'] = definitions
-                    
-                # 不要なフィールドを削除
-                concept.pop('definition_sources', None)
-                concept.pop('definition_confidences', None)
-                
-                concepts.append(concept)
-            
-            # 関係を検索（関連する概念名を含む）
-            cursor.execute(
-                '''
-                SELECT r.*, sc.name as source_name, tc.name as target_name
-                FROM relations r
-                JOIN concepts sc ON r.source_concept_id = sc.id
-                JOIN concepts tc ON r.target_concept_id = tc.id
-                WHERE sc.name LIKE ? OR tc.name LIKE ? OR r.description LIKE ?
-                ORDER BY r.confidence DESC
-                LIMIT ?
-                ''',
-                (search_pattern, search_pattern, search_pattern, limit)
-            )
-            relations = [dict(row) for row in cursor.fetchall()]
-            
-            # 検索履歴を更新（結果数を記録）
+                kind = row[0]
+                results[kind].append(dict(zip(_SEARCH_COLUMNS[kind], row[3:])))
+            facts = results["fact"]
+            relations = results["relation"]
+            
+            concepts = results["concept"]
+            for concept in concepts:
+                # 定義のJSON配列を展開（空の値のフィールドは含めない）
+                definitions = []
+                for item in json.loads(concept["definitions"] or "[]"):
+                    if item["content"]:
+                        def_item = {"content": item["content"]}
+                        if item["source"]:
+                            def_item["source"] = item["source"]
+                        if item["confidence"] is not None:
+                            def_item["confidence"] = item["confidence"]
+                        definitions.append(def_item)
+                concept["definitions"] = definitions
+            
+            # 検索履歴に記録（結果数を含めて1行で保存）
             result_count = len(facts) + len(concepts) + len(relations)
             cursor.execute(
-                "UPDATE search_history SET result_count=? WHERE id=(SELECT MAX(id) FROM search_history)",
-                (result_count,)
+                "INSERT INTO search_history (query, result_count, timestamp) VALUES (?, ?, ?)",
+                (query, result_count, searched_at)
             )
             
-            conn.commit()
-            conn.close()
+            self._conn.commit()
             
             self.logger.info(f"Searched knowledge for '{query}', found {result_count} results")
             
@@ -414,6 +755,7 @@ class KnowledgeBase:
             self.logger.error(f"Error searching knowledge: {str(e)}")
             return {"facts": [], "concepts": [], "relations": [], "query": query, "total_results": 0}
     
+    @_synchronized
     def update_confidence(self, item_type: str, item_id: int, confidence: float) -> bool:
         """
         知識項目の信頼度を更新
@@ -431,34 +773,19 @@ class KnowledgeBase:
                 self.logger.warning(f"Invalid confidence value: {confidence}")
                 return False
             
-            conn = sqlite3.connect(self.db_path)
-            cursor = conn.cursor()
-            
-            now = datetime.now().isoformat()
-            
-            if item_type == "fact":
-                cursor.execute(
-                    "UPDATE facts SET confidence=?, updated_at=? WHERE id=?",
-                    (confidence, now, item_id)
-                )
-            elif item_type == "concept":
-                cursor.execute(
-                    "UPDATE concepts SET confidence=?, updated_at=? WHERE id=?",
-                    (confidence, now, item_id)
-                )
-            elif item_type == "relation":
-                cursor.execute(
-                    "UPDATE relations SET confidence=? WHERE id=?",
-                    (confidence, item_id)
-                )
-            else:
+            sql = _SQL_UPDATE_CONFIDENCE.get(item_type)
+            if sql is None:
                 self.logger.warning(f"Unknown item type: {item_type}")
-                conn.close()
                 return False
             
+            cursor = self._conn.cursor()
+            cursor.execute(
+                sql,
+                {"confidence": confidence, "updated_at": datetime.now().isoformat(), "id": item_id}
+            )
+            
             affected = cursor.rowcount
-            conn.commit()
-            conn.close()
+            self._conn.commit()
             
             if affected > 0:
                 self.logger.info(f"Updated confidence for {item_type} ID {item_id} to {confidence}")
@@ -471,57 +798,193 @@ class KnowledgeBase:
             self.logger.error(f"Error updating confidence: {str(e)}")
             return False
     
-    def get_knowledge_stats(self) -> Dict[str, Any]:
+    @_synchronized
+    def store_embedding(self, fact_id: int, vector: List[float]) -> bool:
         """
-        知識ベースの統計情報を取得
+        事実の埋め込みベクトルを保存（既存の埋め込みは置き換える）
         
+        Args:
+            fact_id: 事実のID
+            vector: 埋め込みベクトル
+            
         Returns:
-            統計情報の辞書
+            保存が成功したかどうか
         """
         try:
-            conn = sqlite3.connect(self.db_path)
-            cursor = conn.cursor()
+            if len(vector) != self.embedding_dim:
+                self.logger.warning(f"Invalid embedding dimension: {len(vector)} (expected {self.embedding_dim})")
+                return False
             
-            # 事実の数
-            cursor.execute("SELECT COUNT(*) FROM facts")
-            facts_count = cursor.fetchone()[0]
+            cursor = self._conn.cursor()
+            blob = self._encode_embedding(vector)
             
-            # 概念の数
-            cursor.execute("SELECT COUNT(*) FROM concepts")
-            concepts_count = cursor.fetchone()[0]
+            if self._vec_enabled:
+                # vec0はUPSERTに対応していないため削除してから挿入
+                cursor.execute("DELETE FROM embeddings_vec WHERE rowid=?", (fact_id,))
+                cursor.execute(
+                    "INSERT INTO embeddings_vec(rowid, embedding) "
+                    f"VALUES (?, {_EMBEDDING_FORMATS[self.embedding_format][1]})",
+                    (fact_id, blob)
+                )
+            else:
+                cursor.execute(
+                    "INSERT OR REPLACE INTO embeddings (id, vector, created_at) VALUES (?, ?, ?)",
+                    (fact_id, blob, datetime.now().isoformat())
+                )
             
-            # 関係の数
-            cursor.execute("SELECT COUNT(*) FROM relations")
-            relations_count = cursor.fetchone()[0]
+            cursor.execute("UPDATE facts SET embedding_id=? WHERE id=?", (fact_id, fact_id))
+            self._conn.commit()
+            return True
             
-            # 定義の数
-            cursor.execute("SELECT COUNT(*) FROM concept_definitions")
-            definitions_count = cursor.fetchone()[0]
+        except Exception as e:
+            self.logger.error(f"Error storing embedding: {str(e)}")
+            return False
+    
+    @_synchronized
+    def search_by_embedding(self, query_vector: List[float], k: int = 10) -> List[Dict[str, Any]]:
+        """
+        埋め込みベクトルの距離が近い事実を検索
+        （bit形式ではハミング距離、それ以外はコサイン距離）
+        
+        Args:
+            query_vector: 検索クエリの埋め込みベクトル
+            k: 返す件数
             
-            # カテゴリ別の事実数
-            cursor.execute(
-                "SELECT category, COUNT(*) as count FROM facts GROUP BY category"
-            )
-            categories = {row[0]: row[1] for row in cursor.fetchall()}
+        Returns:
+            距離の昇順に並んだ事実のリスト
+        """
+        try:
+            if len(query_vector) != self.embedding_dim:
+                self.logger.warning(f"Invalid embedding dimension: {len(query_vector)} (expected {self.embedding_dim})")
+                return []
             
-            # 平均信頼度
-            cursor.execute("SELECT AVG(confidence) FROM facts")
-            facts_avg_confidence = cursor.fetchone()[0] or 0
+            cursor = self._conn.cursor()
             
-            cursor.execute("SELECT AVG(confidence) FROM concepts")
-            concepts_avg_confidence = cursor.fetchone()[0] or 0
+            if self._vec_enabled:
+                cursor.execute(
+                    "SELECT rowid, distance FROM embeddings_vec "
+                    f"WHERE embedding MATCH {_EMBEDDING_FORMATS[self.embedding_format][1]} AND k = ? "
+                    "ORDER BY distance",
+                    (self._encode_embedding(query_vector), k)
+                )
+                nearest = [(row[1], row[0]) for row in cursor.fetchall()]
+            else:
+                nearest = heapq.nsmallest(k, self._scan_embeddings(cursor, query_vector))
             
-            cursor.execute("SELECT AVG(confidence) FROM relations")
-            relations_avg_confidence = cursor.fetchone()[0] or 0
+            if not nearest:
+                return []
             
-            # 検索履歴の統計
-            cursor.execute("SELECT COUNT(*) FROM search_history")
-            search_count = cursor.fetchone()[0]
+            ids = [fact_id for _, fact_id in nearest]
+            placeholders = ",".join("?" * len(ids))
+            cursor.execute(
+                f"SELECT id, content, source, confidence, category FROM facts WHERE id IN ({placeholders})",
+                ids
+            )
+            facts = {row["id"]: row for row in cursor.fetchall()}
+            
+            return [
+                {
+                    "id": fact_id,
+                    "content": facts[fact_id]["content"],
+                    "source": facts[fact_id]["source"],
+                    "confidence": facts[fact_id]["confidence"],
+                    "category": facts[fact_id]["category"],
+                    "distance": distance
+                }
+                for distance, fact_id in nearest
+                if fact_id in facts
+            ]
             
-            cursor.execute("SELECT AVG(result_count) FROM search_history WHERE result_count IS NOT NULL")
-            avg_search_results = cursor.fetchone()[0] or 0
+        except Exception as e:
+            self.logger.error(f"Error searching by embedding: {str(e)}")
+            return []
+    
+    def _encode_embedding(self, vector: List[float]) -> bytes:
+        """設定された保存形式でベクトルをバイト列に変換"""
+        if self.embedding_format == "int8":
+            return _quantize_int8(vector)
+        if self.embedding_format == "bit":
+            return _quantize_bit(vector)
+        return array("f", vector).tobytes()  # float32のリトルエンディアン
+    
+    def _scan_embeddings(self, cursor, query_vector: List[float]):
+        """
+        sqlite-vecが使えない場合にembeddingsテーブルを走査して(距離, 事実ID)を返す
+        """
+        cursor.execute("SELECT id, vector FROM embeddings WHERE vector IS NOT NULL")
+        
+        if self.embedding_format == "bit":
+            query_bits = int.from_bytes(_quantize_bit(query_vector), "big")
+            size = (len(query_vector) + 7) // 8
+            for row in cursor:
+                if len(row["vector"]) != size:
+                    continue
+                yield bin(query_bits ^ int.from_bytes(row["vector"], "big")).count("1"), row["id"]
+            return
+        
+        query_norm = math.sqrt(sum(x * x for x in query_vector))
+        if query_norm == 0:
+            return
+        
+        typecode = "b" if self.embedding_format == "int8" else "f"
+        for row in cursor:
+            vector = array(typecode)
+            vector.frombytes(row["vector"])
+            if len(vector) != len(query_vector):
+                continue
+            norm = math.sqrt(sum(x * x for x in vector))
+            if norm == 0:
+                continue
+            dot = sum(a * b for a, b in zip(query_vector, vector))
+            yield 1.0 - dot / (query_norm * norm), row["id"]
+    
+    @_synchronized
+    def get_knowledge_stats(self) -> Dict[str, Any]:
+        """
+        知識ベースの統計情報を取得
+        
+        Returns:
+            統計情報の辞書
+        """
+        try:
+            cursor = self._conn.cursor()
+            
+            # 件数と平均値は1文のスカラーサブクエリでまとめて取得
+            cursor.execute(
+                """
+                SELECT
+                    (SELECT COUNT(*) FROM facts),
+                    (SELECT COUNT(*) FROM concepts),
+                    (SELECT COUNT(*) FROM relations),
+                    (SELECT COUNT(*) FROM concept_definitions),
+                    (SELECT AVG(confidence) FROM facts),
+                    (SELECT AVG(confidence) FROM concepts),
+                    (SELECT AVG(confidence) FROM relations),
+                    (SELECT COUNT(*) FROM search_history),
+                    (SELECT AVG(result_count) FROM search_history WHERE result_count IS NOT NULL)
+                """
+            )
+            (
+                facts_count,
+                concepts_count,
+                relations_count,
+                definitions_count,
+                facts_avg_confidence,
+                concepts_avg_confidence,
+                relations_avg_confidence,
+                search_count,
+                avg_search_results,
+            ) = cursor.fetchone()
+            facts_avg_confidence = facts_avg_confidence or 0
+            concepts_avg_confidence = concepts_avg_confidence or 0
+            relations_avg_confidence = relations_avg_confidence or 0
+            avg_search_results = avg_search_results or 0
             
-            conn.close()
+            # カテゴリ別の事実数
+            cursor.execute(
+                "SELECT category, COUNT(*) as count FROM facts GROUP BY category"
+            )
+            categories = {row[0]: row[1] for row in cursor.fetchall()}
             
             return {
                 "facts_count": facts_count,
@@ -552,6 +1015,7 @@ class KnowledgeBase:
                 "error": str(e)
             }
     
+    @_synchronized
     def export_knowledge(self, output_file: str = "knowledge_export.json") -> bool:
         """
         知識ベースをJSON形式でエクスポート
@@ -563,104 +1027,66 @@ class KnowledgeBase:
             エクスポートが成功したかどうか
         """
         try:
-            conn = sqlite3.connect(self.db_path)
-            conn.row_factory = sqlite3.Row
-            cursor = conn.cursor()
-            
-            # 事実の取得
-            cursor.execute("SELECT * FROM facts")
-            facts = [dict(row) for row in cursor.fetchall()]
-            
-            # 概念と定義の取得
-            cursor.execute(
-                '''
-                SELECT c.*, GROUP_CONCAT(d.id) as def_ids, 
-                       GROUP_CONCAT(d.definition) as definitions,
-                       GROUP_CONCAT(d.source) as sources, 
-                       GROUP_CONCAT(d.confidence) as confidences,
-                       GROUP_CONCAT(d.created_at) as def_created_ats
-                FROM concepts c
-                LEFT JOIN concept_definitions d ON c.id = d.concept_id
-                GROUP BY c.id
-                '''
-            )
-            
-            concepts = {}
-            for row in cursor.fetchall():
-                concept = dict(row)
-                concept_id = concept["id"]
-                
-                # 定義情報の処理
-                definitions = []
-                if concept.get("def_ids") and concept.get("definitions"):
-                    def_ids = str(concept["def_ids"]).split(",")
-                    def_texts = str(concept["definitions"]).split(",")
-                    def_sources = str(concept.get("sources", "")).split(",") if concept.get("sources") else []
-                    def_confs = str(concept.get("confidences", "")).split(",") if concept.get("confidences") else []
-                    def_dates = str(concept.get("def_created_ats", "")).split(",") if concept.get("def_created_ats") else []
-                    
-                    for i in range(len(def_ids)):
-                        if i < len(def_texts):
-                            def_item = {"id": int(def_ids[i]), "content": def_texts[i]}
-                            
-                            if i < len(def_sources) and def_sources[i]:
-                                def_item["source"] = def_sources[i]
-                                
-                            if i < len(def_confs) and def_confs[i]:
-                                try:
-                                    def_item["confidence"] = float(def_confs[i])
-                                except ValueError:
-                                    def_item["confidence"] = 0.7
-                                    
-                            if i < len(def_dates) and def_dates[i]:
-                                def_item["created_at"] = def_dates[i]
-                                
-                            definitions.append(def_item)
+            cursor = self._conn.cursor()
+            cursor.arraysize = 1000
+            counts = {}
+            
+            # 全件をメモリに載せず、1行ずつJSONに変換して書き出す
+            tmp_file = output_file + ".tmp"
+            with open(tmp_file, "wb") as f:
+                # 事実
+                f.write(b'{\n"facts": [')
+                cursor.execute(f"SELECT {_FACT_COLUMNS} FROM facts")
+                counts["facts_count"] = self._write_json_rows(
+                    f, (_dump_json(dict(row)) for row in cursor)
+                )
                 
-                # 概念情報の整理
-                concept_info = {
-                    "id": concept_id,
-                    "name": concept["name"],
-                    "confidence": concept["confidence"],
-                    "created_at": concept["created_at"],
-                    "updated_at": concept["updated_at"],
-                    "definitions": definitions
-                }
+                # 概念と定義（SQLiteが生成したJSONをそのまま書き出し、概念IDをキーとする）
+                # json_patch('{}', ...)で値がNULLのキーを除き、空の説明・ソースは出力しない
+                f.write(b'],\n"concepts": {')
+                cursor.execute(
+                    '''
+                    SELECT c.id, json_patch('{}', json_object(
+                        'id', c.id, 'name', c.name, 'confidence', c.confidence,
+                        'created_at', c.created_at, 'updated_at', c.updated_at,
+                        'definitions', json(COALESCE((
+                            SELECT json_group_array(json_patch('{}', json_object(
+                                'id', d.id, 'content', d.definition, 'source', NULLIF(d.source, ''),
+                                'confidence', d.confidence, 'created_at', NULLIF(d.created_at, ''))))
+                            FROM (SELECT * FROM concept_definitions WHERE concept_id = c.id ORDER BY id) d
+                        ), '[]')),
+                        'description', NULLIF(c.description, '')
+                    )) AS concept_json
+                    FROM concepts c
+                    '''
+                )
+                counts["concepts_count"] = self._write_json_rows(
+                    f,
+                    (
+                        b'"%d": ' % row[0] + row[1].encode("utf-8")
+                        for row in cursor
+                    )
+                )
                 
-                if concept.get("description"):
-                    concept_info["description"] = concept["description"]
+                # 関係
+                f.write(b'},\n"relations": [')
+                cursor.execute(
+                    '''
+                    SELECT r.*, sc.name as source_name, tc.name as target_name
+                    FROM relations r
+                    JOIN concepts sc ON r.source_concept_id = sc.id
+                    JOIN concepts tc ON r.target_concept_id = tc.id
+                    '''
+                )
+                counts["relations_count"] = self._write_json_rows(
+                    f, (_dump_json(dict(row)) for row in cursor)
+                )
                 
-                concepts[concept_id] = concept_info
-            
-            # 関係の取得
-            cursor.execute(
-                '''
-                SELECT r.*, sc.name as source_name, tc.name as target_name
-                FROM relations r
-                JOIN concepts sc ON r.source_concept_id = sc.id
-                JOIN concepts tc ON r.target_concept_id = tc.id
-                '''
-            )
-            relations = [dict(row) for row in cursor.fetchall()]
-            
-            # 知識データをまとめる
-            knowledge_data = {
-                "facts": facts,
-                "concepts": concepts,
-                "relations": relations,
-                "metadata": {
-                    "exported_at": datetime.now().isoformat(),
-                    "facts_count": len(facts),
-                    "concepts_count": len(concepts),
-                    "relations_count": len(relations)
-                }
-            }
-            
-            # JSONとして保存
-            with open(output_file, "w", encoding="utf-8") as f:
-                json.dump(knowledge_data, f, ensure_ascii=False, indent=2)
+                metadata = {"exported_at": datetime.now().isoformat(), **counts}
+                f.write(b'],\n"metadata": ' + _dump_json(metadata) + b'\n}\n')
             
-            conn.close()
+            # 書き込み途中のファイルが残らないよう、完成してから置き換える
+            os.replace(tmp_file, output_file)
             
             self.logger.info(f"Exported knowledge to {output_file}")
             return True
@@ -669,6 +1095,18 @@ class KnowledgeBase:
             self.logger.error(f"Error exporting knowledge: {str(e)}")
             return False
     
+    @staticmethod
+    def _write_json_rows(f, rows) -> int:
+        """JSON化済みの要素を1行ずつカンマ区切りで書き出し、件数を返す"""
+        count = 0
+        for row in rows:
+            f.write(b"\n  " + row if count == 0 else b",\n  " + row)
+            count += 1
+        if count:
+            f.write(b"\n")
+        return count
+    
+    @_synchronized
     def import_knowledge(self, input_file: str) -> Dict[str, int]:
         """
         JSONから知識ベースにデータをインポート
@@ -694,57 +1132,39 @@ class KnowledgeBase:
                 "relations_imported": 0
             }
             
-            # 事実のインポート
-            for fact in data.get("facts", []):
-                content = fact.get("content")
-                if content:
-                    self.store_fact(
-                        content=content,
-                        source=fact.get("source"),
-                        confidence=fact.get("confidence", 0.7),
-                        category=fact.get("category", "general")
-                    )
-                    stats["facts_imported"] += 1
-            
-            # 概念のインポート
-            concepts_id_map = {}  # 元のID→新しいIDのマッピング
-            
-            for concept_id, concept in data.get("concepts", {}).items():
-                name = concept.get("name")
-                if name:
-                    definitions = []
-                    for def_item in concept.get("definitions", []):
-                        if isinstance(def_item, dict) and "content" in def_item:
-                            definitions.append(def_item)
-                    
-                    new_id = self.store_concept(
-                        name=name,
-                        description=concept.get("description"),
-                        definitions=definitions,
-                        confidence=concept.get("confidence", 0.7)
-                    )
-                    
-                    if new_id > 0:
-                        concepts_id_map[int(concept_id)] = new_id
-                        stats["concepts_imported"] += 1
-            
-            # 関係のインポート
-            for relation in data.get("relations", []):
-                source_name = relation.get("source_name")
-                target_name = relation.get("target_name")
-                relation_type = relation.get("relation_type")
-                
-                if source_name and target_name and relation_type:
-                    relation_id = self.store_relation(
-                        source_concept=source_name,
-                        target_concept=target_name,
-                        relation_type=relation_type,
-                        description=relation.get("description"),
-                        confidence=relation.get("confidence", 0.7)
-                    )
-                    
-                    if relation_id > 0:
-                        stats["relations_imported"] += 1
+            # 全件を一つのトランザクションでまとめて書き込む
+            # （インデックスのDROPもロールバックできるよう、DDLより前に明示的に開始する）
+            now = datetime.now().isoformat()
+            cursor = self._conn.cursor()
+            if not self._conn.in_transaction:
+                cursor.execute("BEGIN")
+            
+            # 概念名→IDの対応を一度だけ読み込み、関係の解決にも使用
+            cursor.execute("SELECT name, id FROM concepts")
+            concept_ids = {row[0]: row[1] for row in cursor.fetchall()}
+            
+            # 大量の事実を取り込む場合は行ごとのBツリー更新を避けるためインデックスを外す
+            # （idx_facts_hashは重複チェックに使うため残す）
+            facts = data.get("facts", [])
+            rebuild_index = len(facts) >= _INDEX_REBUILD_THRESHOLD
+            if rebuild_index:
+                cursor.execute("DROP INDEX IF EXISTS idx_facts_category_conf")
+            
+            stats["facts_imported"] = self._bulk_store_facts(cursor, facts, now)
+            
+            if rebuild_index:
+                cursor.execute("CREATE INDEX IF NOT EXISTS idx_facts_category_conf ON facts(category, confidence DESC)")
+            
+            stats["concepts_imported"] = self._bulk_store_concepts(cursor, data.get("concepts", {}), now, concept_ids)
+            stats["relations_imported"] = self._bulk_store_relations(cursor, data.get("relations", []), now, concept_ids)
+            
+            self._conn.commit()
+            # 未登録(-1)としてキャッシュされた内容が取り込まれている可能性があるため破棄
+            self._fact_id_cache.clear()
+            
+            # 取り込んだデータに合わせてクエリプランナーの統計情報を更新
+            cursor.execute("ANALYZE")
+            cursor.execute("PRAGMA optimize")
             
             self.logger.info(f"Imported knowledge: {stats}")
             return {
@@ -757,54 +1177,135 @@ class KnowledgeBase:
             self.logger.error(f"Error importing knowledge: {str(e)}")
             return {"status": "error", "message": str(e)}
     
-    def _get_or_create_concept_id(self, cursor, concept_name: str) -> int:
+    def _bulk_store_facts(self, cursor, facts: List[Dict[str, Any]], now: str) -> int:
+        """事実をexecutemanyで一括保存（既存・バッチ内の重複内容はスキップ）"""
+        rows = [
+            (
+                fact["content"],
+                fact.get("source"),
+                fact.get("confidence", 0.7),
+                now,
+                now,
+                fact.get("category", "general"),
+                _content_hash(fact["content"])
+            )
+            for fact in facts if fact.get("content")
+        ]
+        cursor.executemany(_SQL_INSERT_FACT, rows)
+        return len(rows)
+    
+    def _bulk_store_concepts(self, cursor, concepts: Dict[str, Dict[str, Any]], now: str,
+                             concept_ids: Dict[str, int]) -> int:
+        """概念を保存し、定義はexecutemanyで一括保存"""
+        imported = 0
+        definition_rows = []
+        
+        for concept in concepts.values():
+            name = concept.get("name")
+            if not name:
+                continue
+            
+            description = concept.get("description")
+            concept_id = concept_ids.get(name)
+            if concept_id is None:
+                cursor.execute(
+                    '''
+                    INSERT INTO concepts (name, description, confidence, created_at, updated_at)
+                    VALUES (?, ?, ?, ?, ?)
+                    ''',
+                    (name, description, concept.get("confidence", 0.7), now, now)
+                )
+                concept_id = cursor.lastrowid
+                concept_ids[name] = concept_id
+            elif description:
+                cursor.execute(
+                    "UPDATE concepts SET description=?, updated_at=? WHERE id=?",
+                    (description, now, concept_id)
+                )
+            
+            for def_item in concept.get("definitions", []):
+                if isinstance(def_item, dict) and "content" in def_item:
+                    definition_rows.append((
+                        concept_id,
+                        def_item.get("content", ""),
+                        def_item.get("source", ""),
+                        def_item.get("confidence", 0.7),
+                        now
+                    ))
+            
+            imported += 1
+        
+        cursor.executemany(_SQL_INSERT_DEFINITION, definition_rows)
+        return imported
+    
+    def _bulk_store_relations(self, cursor, relations: List[Dict[str, Any]], now: str,
+                              concept_ids: Dict[str, int]) -> int:
+        """関係をexecutemanyで一括保存（未登録の概念は作成）"""
+        rows = []
+        for relation in relations:
+            source_name = relation.get("source_name")
+            target_name = relation.get("target_name")
+            relation_type = relation.get("relation_type")
+            
+            if source_name and target_name and relation_type:
+                ids = []
+                for concept_name in (source_name, target_name):
+                    if concept_name not in concept_ids:
+                        cursor.execute(_SQL_INSERT_CONCEPT_NAME, (concept_name, now, now))
+                        concept_ids[concept_name] = cursor.lastrowid
+                    ids.append(concept_ids[concept_name])
+                
+                rows.append((
+                    ids[0],
+                    ids[1],
+                    relation_type,
+                    relation.get("description"),
+                    relation.get("confidence", 0.7),
+                    now
+                ))
+        
+        cursor.executemany(_SQL_INSERT_RELATION, rows)
+        return len(rows)
+    
+    def _get_or_create_concept_id(self, cursor, concept_name: str, now: str) -> int:
         """概念名からIDを取得（存在しない場合は作成）"""
-        cursor.execute("SELECT id FROM concepts WHERE name=?", (concept_name,))
+        concept_id = self._concept_id_cache.lookup(concept_name)
+        if concept_id is not None:
+            return concept_id
+        
+        cursor.execute(_SQL_SELECT_CONCEPT_ID, (concept_name,))
         result = cursor.fetchone()
         
         if result:
-            return result[0]
+            concept_id = result[0]
         else:
             # 新しい概念を作成
-            now = datetime.now().isoformat()
-            cursor.execute(
-                "INSERT INTO concepts (name, created_at, updated_at) VALUES (?, ?, ?)",
-                (concept_name, now, now)
-            )
-            return cursor.lastrowid
+            cursor.execute(_SQL_INSERT_CONCEPT_NAME, (concept_name, now, now))
+            concept_id = cursor.lastrowid
+        
+        self._concept_id_cache.put(concept_name, concept_id)
+        return concept_id
     
     def _is_duplicate_fact(self, content: str) -> bool:
         """内容が既存の事実と重複しているかチェック"""
-        conn = sqlite3.connect(self.db_path)
-        cursor = conn.cursor()
-        
-        # 完全一致をチェック
-        cursor.execute("SELECT COUNT(*) FROM facts WHERE content=?", (content,))
-        count = cursor.fetchone()[0]
-        
-        conn.close()
-        return count > 0
+        return self._get_fact_id(content) != -1
     
     def _get_fact_id(self, content: str) -> int:
-        """内容から事実のIDを取得"""
-        conn = sqlite3.connect(self.db_path)
-        cursor = conn.cursor()
+        """内容から事実のIDを取得（存在しない場合は-1）"""
+        key = _content_hash(content)
+        fact_id = self._fact_id_cache.lookup(key)
+        if fact_id is not None:
+            return fact_id
         
-        cursor.execute("SELECT id FROM facts WHERE content=?", (content,))
+        cursor = self._conn.cursor()
+        cursor.execute(_SQL_SELECT_FACT_ID, (key,))
         result = cursor.fetchone()
         
-        conn.close()
-        return result[0] if result else -1
+        fact_id = result[0] if result else -1
+        self._fact_id_cache.put(key, fact_id)
+        return fact_id
     
     def _extract_keywords(self, text: str) -> List[str]:
         """テキストから検索キーワードを抽出"""
-        # 簡易的な実装
-        # 文字列をスペースやカンマなどで分割し、長すぎる/短すぎる単語を除外
-        words = re.findall(r'\b\w{3,20}\b', text.lower())
-        
-        # ストップワードの除外
-        stopwords = {"and", "or", "the", "is", "are", "in", "on", "at", "to", "for", "with", "by",
-                   "about", "like", "that", "this", "these", "those", "from", "as", "of"}
-        keywords = [w for w in words if w not in stopwords]
-        
-        return keywords
+        # 長すぎる/短すぎる単語とストップワードを除外
+        return [w for w in _KEYWORD_RE.findall(text.lower()) if w not in _STOPWORDS]
@@ -1,8 +1,65 @@
 import logging
 import json
-from typing import Dict, List, Any, Optional
+import re
+import time
+from collections import Counter, deque
+from types import MappingProxyType
+from typing import Dict, List, Any, NamedTuple, Optional
 from datetime import datetime
 
+
+# Keyword tables are module constants so they are built once, not on every call
+_TOPIC_KEYWORDS = {
+    "programming": frozenset({"code", "programming", "software", "development", "python", "java"}),
+    "data": frozenset({"data", "analysis", "analytics", "statistics", "visualization"}),
+    "business": frozenset({"business", "strategy", "marketing", "sales", "management"}),
+    "education": frozenset({"education", "learning", "teaching", "school", "student"})
+}
+
+# Reverse index from keyword to topic
+_WORD_TO_TOPIC = {word: topic for topic, words in _TOPIC_KEYWORDS.items() for word in words}
+
+# Keywords are matched as whole tokens (so "dislike" does not also count as "like").
+# Tokens are ASCII word runs, so Japanese or other non-ASCII text next to a keyword
+# acts as a separator ("pythonのコード" still yields "python").
+_WORD_RE = re.compile(r"\w+", re.ASCII)
+_POSITIVE_WORDS = frozenset({"good", "great", "excellent", "helpful", "thanks", "thank", "like", "love"})
+_NEGATIVE_WORDS = frozenset({"bad", "unhelpful", "wrong", "incorrect", "confusing", "hate", "dislike"})
+
+# Fast path for ASCII text: map every non-word byte to a space, then split on whitespace
+# (produces the same tokens as _WORD_RE, which the non-ASCII path uses)
+_ASCII_WORD_TABLE = bytes(c if chr(c).isalnum() or c == 0x5F else 0x20 for c in range(256))
+_POSITIVE_WORDS_ASCII = frozenset(word.encode("ascii") for word in _POSITIVE_WORDS)
+_NEGATIVE_WORDS_ASCII = frozenset(word.encode("ascii") for word in _NEGATIVE_WORDS)
+
+# Read-only templates for the fixed suggestions; callers get their own dict copies
+_RESPONSE_QUALITY_SUGGESTION = MappingProxyType({
+    "area": "response_quality",
+    "description": "Improve response quality based on negative feedback patterns",
+    "priority": "high",
+    "requires_review": True
+})
+_KNOWLEDGE_BASE_SUGGESTION = MappingProxyType({
+    "area": "knowledge_base",
+    "description": "Enhance knowledge in frequently discussed topics",
+    "priority": "medium",
+    "requires_review": True
+})
+
+
+class FeedbackRecord(NamedTuple):
+    """A single piece of user feedback kept in the learning history."""
+    timestamp: float  # time.time() when the feedback was recorded
+    feedback: str
+    sentiment: float
+    interaction_id: Optional[str]
+    
+    @property
+    def iso_timestamp(self) -> str:
+        """The timestamp formatted as an ISO 8601 string."""
+        return datetime.fromtimestamp(self.timestamp).isoformat()
+
+
 class LearningManager:
     """
     Manages bounded learning capabilities for the assistant.
@@ -20,8 +77,13 @@ class LearningManager:
         
         # Storage for learned information
         self.learned_preferences = {}
-        self.interaction_patterns = {}
-        self.feedback_history = []
+        self.interaction_patterns = Counter()
+        # Bounded history with a running count of the negative records it holds
+        self.feedback_history = deque(maxlen=self.config.get("history_limit", 1000))
+        self._negative_count = 0
+        self._feedback_total = 0
+        # Suggestions computed for a given _feedback_total, reused until new feedback arrives
+        self._suggestions_cache = None
         
         # Learning boundaries
         self.allowed_improvement_areas = self.config.get("improvement_areas", [
@@ -43,8 +105,8 @@ class LearningManager:
         if not self.config.get("enabled", False):
             return
             
-        # Extract patterns from the interaction
-        self._extract_interaction_patterns(user_input, assistant_response)
+        # Extract patterns from the interaction (lowercased once for all helpers)
+        self._extract_interaction_patterns(user_input.lower(), assistant_response)
         
         # Log the interaction
         self.logger.debug("Recorded interaction for learning")
@@ -63,31 +125,40 @@ class LearningManager:
         if not self.config.get("enabled", False):
             return {"status": "learning_disabled"}
             
+        # Lowercase once and share it between the analysis helpers
+        lower_feedback = feedback.lower()
+        
         # Simple sentiment analysis
-        sentiment = self._analyze_sentiment(feedback)
+        sentiment = self._analyze_sentiment(lower_feedback)
         
         # Record the feedback
-        feedback_record = {
-            "timestamp": datetime.now().isoformat(),
-            "feedback": feedback,
-            "sentiment": sentiment,
-            "interaction_id": interaction_id
-        }
-        
+        feedback_record = FeedbackRecord(
+            timestamp=time.time(),
+            feedback=feedback,
+            sentiment=sentiment,
+            interaction_id=interaction_id
+        )
+        
+        # Account for the oldest record before the deque drops it
+        if len(self.feedback_history) == self.feedback_history.maxlen and self.feedback_history[0].sentiment < 0:
+            self._negative_count -= 1
         self.feedback_history.append(feedback_record)
+        if sentiment < 0:
+            self._negative_count += 1
+        self._feedback_total += 1
         
         # Update preferences based on feedback
         if sentiment > 0:
-            self._extract_positive_preferences(feedback)
+            self._extract_positive_preferences(lower_feedback)
         elif sentiment < 0:
-            self._extract_negative_preferences(feedback)
+            self._extract_negative_preferences(lower_feedback)
         
         self.logger.info(f"Processed feedback with sentiment: {sentiment}")
         
         return {
             "status": "processed",
             "sentiment": sentiment,
-            "feedback_id": len(self.feedback_history) - 1
+            "feedback_id": self._feedback_total - 1
         }
     
     def get_improvement_suggestions(self) -> List[Dict[str, Any]]:
@@ -100,6 +171,9 @@ class LearningManager:
         if not self.config.get("enabled", False):
             return []
             
+        if self._suggestions_cache is not None and self._suggestions_cache[0] == self._feedback_total:
+            return [dict(suggestion) for suggestion in self._suggestions_cache[1]]
+        
         # This is a simplified implementation
         # In a real system, this would use more sophisticated analysis
         
@@ -107,68 +181,41 @@ class LearningManager:
         
         # Check feedback history for patterns
         if self.feedback_history:
-            negative_feedback_count = sum(1 for f in self.feedback_history if f["sentiment"] < 0)
-            if negative_feedback_count > 3:
-                suggestions.append({
-                    "area": "response_quality",
-                    "description": "Improve response quality based on negative feedback patterns",
-                    "priority": "high",
-                    "requires_review": True
-                })
+            if self._negative_count > 3:
+                suggestions.append(_RESPONSE_QUALITY_SUGGESTION)
         
         # Check for knowledge gaps
         if "knowledge_base" in self.allowed_improvement_areas:
             # In a real system, this would analyze actual knowledge gaps
-            suggestions.append({
-                "area": "knowledge_base",
-                "description": "Enhance knowledge in frequently discussed topics",
-                "priority": "medium",
-                "requires_review": True
-            })
-        
-        return suggestions
+            suggestions.append(_KNOWLEDGE_BASE_SUGGESTION)
+        
+        self._suggestions_cache = (self._feedback_total, suggestions)
+        return [dict(suggestion) for suggestion in suggestions]
     
-    def _extract_interaction_patterns(self, user_input: str, assistant_response: str) -> None:
-        """Extract patterns from an interaction."""
+    def _extract_interaction_patterns(self, lower_input: str, assistant_response: str) -> None:
+        """Extract patterns from an interaction (user input already lowercased)."""
         # This is a simplified implementation
         # In a real system, this would use more sophisticated NLP
         
         # Extract topics
-        topics = self._extract_topics(user_input)
+        topics = self._extract_topics(lower_input)
         
         # Update interaction patterns
-        for topic in topics:
-            if topic not in self.interaction_patterns:
-                self.interaction_patterns[topic] = 1
-            else:
-                self.interaction_patterns[topic] += 1
+        self.interaction_patterns.update(topics)
     
-    def _extract_topics(self, text: str) -> List[str]:
-        """Extract topics from text."""
+    def _extract_topics(self, lower_text: str) -> List[str]:
+        """Extract topics from lowercased text."""
         # This is a simplified implementation
         # In a real system, this would use more sophisticated NLP
         
         # Simple keyword-based topic extraction
-        topics = []
-        
-        keywords = {
-            "programming": ["code", "programming", "software", "development", "python", "java"],
-            "data": ["data", "analysis", "analytics", "statistics", "visualization"],
-            "business": ["business", "strategy", "marketing", "sales", "management"],
-            "education": ["education", "learning", "teaching", "school", "student"]
-        }
-        
-        lower_text = text.lower()
-        
-        for topic, words in keywords.items():
-            if any(word in lower_text for word in words):
-                topics.append(topic)
+        matched = {_WORD_TO_TOPIC[token] for token in _WORD_RE.findall(lower_text) if token in _WORD_TO_TOPIC}
         
-        return topics
+        return [topic for topic in _TOPIC_KEYWORDS if topic in matched]
     
-    def _analyze_sentiment(self, text: str) -> float:
+    def _analyze_sentiment(self, lower_text: str) -> float:
         """
-        Analyze sentiment of text.
+        Analyze sentiment of lowercased text.
         
         Returns:
             Sentiment score (-1.0 to 1.0)
@@ -176,26 +223,26 @@ class LearningManager:
         # This is a simplified implementation
         # In a real system, this would use more sophisticated NLP
         
-        positive_words = ["good", "great", "excellent", "helpful", "thanks", "thank", "like", "love"]
-        negative_words = ["bad", "unhelpful", "wrong", "incorrect", "confusing", "hate", "dislike"]
-        
-        lower_text = text.lower()
-        
-        positive_count = sum(1 for word in positive_words if word in lower_text)
-        negative_count = sum(1 for word in negative_words if word in lower_text)
+        # Each distinct sentiment word counts once, however often it occurs
+        if lower_text.isascii():
+            tokens = set(lower_text.encode("ascii").translate(_ASCII_WORD_TABLE).split())
+            positive_count = len(_POSITIVE_WORDS_ASCII.intersection(tokens))
+            negative_count = len(_NEGATIVE_WORDS_ASCII.intersection(tokens))
+        else:
+            tokens = set(_WORD_RE.findall(lower_text))
+            positive_count = len(_POSITIVE_WORDS.intersection(tokens))
+            negative_count = len(_NEGATIVE_WORDS.intersection(tokens))
         
         if positive_count == 0 and negative_count == 0:
             return 0.0
             
         return (positive_count - negative_count) / (positive_count + negative_count)
     
-    def _extract_positive_preferences(self, feedback: str) -> None:
-        """Extract user preferences from positive feedback."""
+    def _extract_positive_preferences(self, lower_feedback: str) -> None:
+        """Extract user preferences from positive (lowercased) feedback."""
         # This is a simplified implementation
         # In a real system, this would use more sophisticated NLP
         
-        lower_feedback = feedback.lower()
-        
         if "concise" in lower_feedback or "brief" in lower_feedback:
             self.learned_preferences["response_length"] = "concise"
         
@@ -205,13 +252,11 @@ class LearningManager:
         if "examples" in lower_feedback:
             self.learned_preferences["include_examples"] = True
     
-    def _extract_negative_preferences(self, feedback: str) -> None:
-        """Extract user preferences from negative feedback."""
+    def _extract_negative_preferences(self, lower_feedback: str) -> None:
+        """Extract user preferences from negative (lowercased) feedback."""
         # This is a simplified implementation
         # In a real system, this would use more sophisticated NLP
         
-        lower_feedback = feedback.lower()
-        
         if "too long" in lower_feedback or "too detailed" in lower_feedback:
             self.learned_preferences["response_length"] = "concise"
         
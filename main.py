@@ -7,10 +7,7 @@ from datetime import datetime
 
 from self_evolving_ai import SelfEvolvingAI
 from dummy_components import DummySafetyFilter, DummyProcessOptimizer, DummyResourceManager, DummySelfPreservation, DummyGoalManager, DummyFeedbackSystem, DummyWebKnowledgeFetcher
-
-def clear_screen():
-    """Clear the console screen."""
-    os.system('cls' if os.name == 'nt' else 'clear')
+from console import clear_screen
 
 def print_header(mode="basic"):
     """Print application header."""
@@ -69,7 +66,8 @@ def run_basic_assistant(args):
             
             if command == "debug" and args.debug:
                 print("\n[DEBUG INFO]")
-                print(f"Active plans: {json.dumps(assistant.planner.active_plans, indent=2)}")
+                # Plan tasks are shared read-only mappings, so serialize them as plain dicts
+                print(f"Active plans: {json.dumps(assistant.planner.active_plans, indent=2, default=dict)}")
                 print(f"Safety violations: {json.dumps(assistant.safety_filter.safety_violations, indent=2)}")
                 print(f"Context size: {len(assistant.context['session_history'])}")
 
@@ -90,8 +88,10 @@ def run_evolving_assistant(args):
         # Get user input
         user_input = input("\nYou > ")
         
+        cmd_lower = user_input.lower()
+        
         # Check for exit command
-        if user_input.lower() in ["exit", "quit"]:
+        if cmd_lower in ("exit", "quit"):
             print("\nShutting down the system. Thank you for using it.")
             ai.stop()
             session_active = False
@@ -99,20 +99,13 @@ def run_evolving_assistant(args):
         
         # Check for special commands
         if user_input.startswith("/"):
-            if user_input.lower() == "/status":
-                show_system_status(ai)
-                continue
-                
-            elif user_input.lower() == "/evolve":
-                run_evolution_cycle(ai)
-                continue
-                
-            elif user_input.lower() == "/help":
-                show_help()
+            handler = COMMAND_HANDLERS.get(cmd_lower)
+            if handler:
+                handler(ai)
                 continue
                 
             # Handle search command
-            elif user_input.lower().startswith("/search:"):
+            if cmd_lower.startswith("/search:"):
                 query = user_input[8:].strip()
                 if query:
                     print(f"\nSearching for \"{query}\"...")
@@ -146,45 +139,49 @@ def run_evolving_assistant(args):
 def show_system_status(ai):
     """Display system status"""
     status = ai.get_system_status()
+    # Collect every line and write them out in one go
+    lines = []
     
-    print("\n" + "=" * 50)
-    print("System Status".center(50))
-    print("=" * 50)
+    lines.append("\n" + "=" * 50)
+    lines.append("System Status".center(50))
+    lines.append("=" * 50)
     
     # Basic information
-    print(f"\nBasic Information:")
-    print(f"  Status: {status['system_state']['status']}")
-    print(f"  Start Time: {status['system_state']['started_at']}")
-    print(f"  Uptime: {status['uptime_seconds']:.1f} seconds")
-    print(f"  Evolution Cycles: {status['evolution_cycles_completed']}")
+    lines.append(f"\nBasic Information:")
+    lines.append(f"  Status: {status['system_state']['status']}")
+    lines.append(f"  Start Time: {status['system_state']['started_at']}")
+    lines.append(f"  Uptime: {status['uptime_seconds']:.1f} seconds")
+    lines.append(f"  Evolution Cycles: {status['evolution_cycles_completed']}")
     
     # Health information
-    print(f"\nHealth Information:")
-    print(f"  Health Score: {status['health']['health_score']}")
-    print(f"  Status: {status['health']['status']}")
-    print(f"  Error Components: {len(status['health']['error_components'])}")
+    lines.append(f"\nHealth Information:")
+    lines.append(f"  Health Score: {status['health']['health_score']}")
+    lines.append(f"  Status: {status['health']['status']}")
+    lines.append(f"  Error Components: {len(status['health']['error_components'])}")
     
     # Resource information
-    print(f"\nResource Information:")
-    print(f"  Memory Usage: {status['resources']['system']['memory_usage_percent']}%")
-    print(f"  CPU Usage: {status['resources']['system']['cpu_usage_percent']}%")
+    lines.append(f"\nResource Information:")
+    lines.append(f"  Memory Usage: {status['resources']['system']['memory_usage_percent']}%")
+    lines.append(f"  CPU Usage: {status['resources']['system']['cpu_usage_percent']}%")
     
     # Goals and optimizations
-    print(f"\nGoals and Optimizations:")
-    print(f"  Active Goals: {status['active_goals']}")
-    print(f"  Active Optimizations: {status['active_optimizations']}")
-    print(f"  Completed Goals: {status['system_state']['goals_completed']}")
+    lines.append(f"\nGoals and Optimizations:")
+    lines.append(f"  Active Goals: {status['active_goals']}")
+    lines.append(f"  Active Optimizations: {status['active_optimizations']}")
+    lines.append(f"  Completed Goals: {status['system_state']['goals_completed']}")
     
     # Knowledge base information
     kb_stats = ai.get_knowledge_stats()
-    print(f"\nKnowledge Base:")
-    print(f"  Facts: {kb_stats['facts_count']} items")
-    print(f"  Concepts: {kb_stats['concepts_count']} items")
-    print(f"  Methods: {kb_stats['methods_count']} items")
-    print(f"  Relations: {kb_stats['relations_count']} items")
-    print(f"  Total: {kb_stats['total_items']} items")
+    lines.append(f"\nKnowledge Base:")
+    lines.append(f"  Facts: {kb_stats['facts_count']} items")
+    lines.append(f"  Concepts: {kb_stats['concepts_count']} items")
+    lines.append(f"  Methods: {kb_stats['methods_count']} items")
+    lines.append(f"  Relations: {kb_stats['relations_count']} items")
+    lines.append(f"  Total: {kb_stats['total_items']} items")
     
-    print("\n" + "=" * 50)
+    lines.append("\n" + "=" * 50)
+    
+    sys.stdout.write("\n".join(lines) + "\n")
 
 def run_evolution_cycle(ai):
     """Run an evolution cycle"""
@@ -219,6 +216,13 @@ def show_help():
     print("  exit or quit - Exit the program")
     print("\n" + "=" * 50)
 
+# Exact-match special commands and their handlers (each takes the AI instance)
+COMMAND_HANDLERS = {
+    "/status": show_system_status,
+    "/evolve": run_evolution_cycle,
+    "/help": lambda ai: show_help()
+}
+
 def main():
     """Main application entry point."""
     parser = argparse.ArgumentParser(description="AI Assistant Demo")
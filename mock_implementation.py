@@ -11,9 +11,28 @@ import time
 from datetime import datetime, timedelta
 import logging
 import os
-import psutil
 from typing import Dict, List, Any, Optional
 
+# psutilは初回使用時に読み込む（起動時のインポートコストを避ける）
+_psutil = None
+
+# システム統計の実測値のキャッシュ（短時間の連続呼び出しではpsutilを呼ばない）
+_SYSTEM_STATS_TTL = 1.0
+_system_stats_cache = {"ts": 0.0, "value": None}
+
+def _get_psutil():
+    """psutilを遅延インポートして返す"""
+    global _psutil
+    if _psutil is None:
+        import psutil
+        # 以降のcpu_percent(None)が直前の呼び出しからの差分を返せるよう初回計測しておく
+        try:
+            psutil.cpu_percent(None)
+        except Exception:
+            pass
+        _psutil = psutil
+    return _psutil
+
 def create_mock_response(query: str) -> str:
     """モックレスポンスを生成する"""
     responses = [
@@ -23,27 +42,28 @@ def create_mock_response(query: str) -> str:
         f"「{query}」という質問を分析しました。以下の情報が参考になれば幸いです。"
     ]
     
-    # 基本応答の選択
-    response = random.choice(responses)
+    # 基本応答の選択（各部分をリストに集めて最後に連結する）
+    parts = [random.choice(responses)]
     
     # 追加コンテンツの生成
     keywords = query.lower().split()
     if keywords:
         sample_keywords = random.sample(keywords, min(3, len(keywords)))
         topics = [k.capitalize() for k in sample_keywords]
+        topic_list = ', '.join(topics)
         
         # キーワードに基づくコンテンツ
-        response += f"\n\n{', '.join(topics)}に関連するいくつかの重要なポイントを説明します：\n\n"
+        parts.append(f"\n\n{topic_list}に関連するいくつかの重要なポイントを説明します：\n\n")
         
         for topic in topics:
-            response += f"• {topic}は重要な概念であり、多くの分野に影響を与えています。\n"
-            response += f"• 最近の{topic}の発展は目覚ましいものがあります。\n"
+            parts.append(f"• {topic}は重要な概念であり、多くの分野に影響を与えています。\n")
+            parts.append(f"• 最近の{topic}の発展は目覚ましいものがあります。\n")
         
         # 結論部分
-        response += f"\n上記の情報から考えると、{topics[0]}と{topics[-1]}の関係は特に注目に値します。"
-        response += f"今後も{', '.join(topics)}に関する新しい情報を取り入れながら学習を続けていきます。"
+        parts.append(f"\n上記の情報から考えると、{topics[0]}と{topics[-1]}の関係は特に注目に値します。")
+        parts.append(f"今後も{topic_list}に関する新しい情報を取り入れながら学習を続けていきます。")
     
-    return response
+    return "".join(parts)
 
 def generate_mock_knowledge_items(query: str, count: int = 5) -> List[Dict[str, Any]]:
     """モックの知識項目を生成する"""
@@ -53,13 +73,13 @@ def generate_mock_knowledge_items(query: str, count: int = 5) -> List[Dict[str,
     if not keywords:
         keywords = ["情報", "知識", "学習", "AI", "技術"]
     
-    for i in range(count):
-        # キーワードからランダムに選択
-        keyword = random.choice(keywords)
-        
-        # 知識項目のタイプをランダムに選択
-        item_type = random.choice(["fact", "concept", "method", "relation"])
-        
+    # 乱数はループの前にまとめて生成
+    picked_keywords = random.choices(keywords, k=count)
+    item_types = random.choices(["fact", "concept", "method", "relation"], k=count)
+    confidences = [round(random.uniform(0.7, 0.95), 2) for _ in range(count)]
+    timestamp = datetime.now().isoformat()
+    
+    for keyword, item_type, confidence in zip(picked_keywords, item_types, confidences):
         # タイプに応じたコンテンツを生成
         if item_type == "fact":
             content = f"{keyword.capitalize()}に関する最新の研究では、重要な発見がありました。この分野は急速に発展しています。"
@@ -71,52 +91,61 @@ def generate_mock_knowledge_items(query: str, count: int = 5) -> List[Dict[str,
             other_keyword = random.choice([k for k in keywords if k != keyword]) if len(keywords) > 1 else "関連概念"
             content = f"{keyword.capitalize()}と{other_keyword.capitalize()}には密接な関係があります。片方の変化がもう片方に影響を与えることがあります。"
         
-        # 信頼度をランダムに設定
-        confidence = round(random.uniform(0.7, 0.95), 2)
-        
         # 知識項目の作成
         item = {
             "content": content,
             "type": item_type,
             "confidence": confidence,
             "extracted_from": f"Mock source for {keyword}",
-            "timestamp": datetime.now().isoformat()
+            "timestamp": timestamp
         }
         
         items.append(item)
     
     return items
 
-def get_mock_system_stats() -> Dict[str, Any]:
-    """モックのシステム統計情報を生成する"""
-    # 実際のシステムリソースを取得（可能な場合）
+def _get_system_resources() -> Dict[str, Any]:
+    """実際のシステムリソースを取得する（TTLの間はキャッシュを返す）"""
+    now = time.monotonic()
+    cached = _system_stats_cache["value"]
+    if cached is not None and now - _system_stats_cache["ts"] < _SYSTEM_STATS_TTL:
+        return cached
+    
     try:
+        psutil = _get_psutil()
         process = psutil.Process(os.getpid())
         memory = psutil.virtual_memory()
         
-        stats = {
-            "timestamp": datetime.now().isoformat(),
-            "system": {
-                "memory_total_mb": memory.total / 1024 / 1024,
-                "memory_available_mb": memory.available / 1024 / 1024,
-                "memory_usage_percent": memory.percent,
-                "cpu_usage_percent": psutil.cpu_percent(interval=0.1),
-                "process_memory_mb": process.memory_info().rss / 1024 / 1024
-            }
+        system = {
+            "memory_total_mb": memory.total / 1024 / 1024,
+            "memory_available_mb": memory.available / 1024 / 1024,
+            "memory_usage_percent": memory.percent,
+            # 前回の呼び出しからのCPU使用率（ブロックしない）
+            "cpu_usage_percent": psutil.cpu_percent(interval=None),
+            "process_memory_mb": process.memory_info().rss / 1024 / 1024
         }
     except:
         # 例外が発生した場合はモックデータを使用
-        stats = {
-            "timestamp": datetime.now().isoformat(),
-            "system": {
-                "memory_total_mb": 8192,
-                "memory_available_mb": 4096,
-                "memory_usage_percent": 50,
-                "cpu_usage_percent": 30,
-                "process_memory_mb": 150
-            }
+        system = {
+            "memory_total_mb": 8192,
+            "memory_available_mb": 4096,
+            "memory_usage_percent": 50,
+            "cpu_usage_percent": 30,
+            "process_memory_mb": 150
         }
     
+    _system_stats_cache["ts"] = now
+    _system_stats_cache["value"] = system
+    return system
+
+def get_mock_system_stats() -> Dict[str, Any]:
+    """モックのシステム統計情報を生成する"""
+    # 実際のシステムリソースを取得（可能な場合）
+    stats = {
+        "timestamp": datetime.now().isoformat(),
+        "system": dict(_get_system_resources())
+    }
+    
     # モックデータの追加
     simulated_stats = {
         "active_goals": random.randint(3, 7),
@@ -142,32 +171,61 @@ def create_mock_goals(count: int = 3) -> List[Dict[str, Any]]:
         "多角的視点の獲得: 複数の視点からの分析能力の向上"
     ]
     
-    goals = []
-    for i in range(count):
-        # ランダムな目標を作成
-        goal = {
-            "id": f"goal_{int(time.time())}_{i}",
-            "area": random.choice(goal_areas),
-            "description": random.choice(goal_descriptions),
-            "priority": random.randint(1, 5),
-            "created_at": datetime.now().isoformat(),
+    # 乱数はループの前にまとめて生成
+    areas = random.choices(goal_areas, k=count)
+    descriptions = random.choices(goal_descriptions, k=count)
+    priorities = random.choices(range(1, 6), k=count)
+    progresses = random.choices(range(10, 91), k=count)
+    now = datetime.now()
+    id_prefix = f"goal_{int(now.timestamp())}"
+    created_at = now.isoformat()
+    
+    # ランダムな目標を作成
+    return [
+        {
+            "id": f"{id_prefix}_{i}",
+            "area": area,
+            "description": description,
+            "priority": priority,
+            "created_at": created_at,
             "status": "active",
-            "progress": random.randint(10, 90)
+            "progress": progress
         }
-        
-        goals.append(goal)
-    
-    return goals
+        for i, (area, description, priority, progress) in enumerate(
+            zip(areas, descriptions, priorities, progresses)
+        )
+    ]
+
+# 進化サイクルの各値の乱数範囲（下限, 上限）。整数は上限を含む
+_CYCLE_FLOAT_RANGES = ((1.5, 4.0), (2.0, 5.0), (1.0, 3.0), (3.0, 7.0))
+_CYCLE_INT_RANGES = (
+    (3, 7), (1, 3), (2, 5),                           # 目標
+    (1, 3), (0, 2), (1, 3), (0, 2), (0, 1),           # 最適化
+    (2, 5), (1, 3), (0, 2),                           # フィードバック
+    (3, 7), (2, 5), (1, 4),                           # 知識拡張
+    (50, 200), (30, 100), (20, 80), (15, 60), (200, 500)  # 知識ベース統計
+)
+
+def _draw_cycle_randoms():
+    """
+    進化サイクル用の乱数をまとめて生成する
+    （randomモジュールのみを使うため、random.seed()で結果を再現できる）
+    """
+    floats = [random.uniform(low, high) for low, high in _CYCLE_FLOAT_RANGES]
+    ints = [random.randint(low, high) for low, high in _CYCLE_INT_RANGES]
+    return floats, ints
 
 def create_mock_evolution_cycle() -> Dict[str, Any]:
     """モックの進化サイクル結果を生成する"""
+    floats, ints = _draw_cycle_randoms()
+    
     # 目標フェーズ
     goals_result = {
         "phase": "goal_setting",
-        "duration": random.uniform(1.5, 4.0),
-        "growth_needs_identified": random.randint(3, 7),
-        "new_goals_set": random.randint(1, 3),
-        "goals_updated": random.randint(2, 5),
+        "duration": floats[0],
+        "growth_needs_identified": ints[0],
+        "new_goals_set": ints[1],
+        "goals_updated": ints[2],
         "new_goals": create_mock_goals(2),
         "updated_goals": []
     }
@@ -175,50 +233,51 @@ def create_mock_evolution_cycle() -> Dict[str, Any]:
     # 最適化フェーズ
     optimizations_result = {
         "phase": "optimization",
-        "duration": random.uniform(2.0, 5.0),
+        "duration": floats[1],
         "efficiency_analysis": {
             "status": "success",
-            "bottlenecks": random.randint(1, 3),
-            "redundant_operations": random.randint(0, 2)
+            "bottlenecks": ints[3],
+            "redundant_operations": ints[4]
         },
-        "optimizations_implemented": random.randint(1, 3),
-        "optimizations_evaluated": random.randint(0, 2),
-        "optimizations_completed": random.randint(0, 1),
+        "optimizations_implemented": ints[5],
+        "optimizations_evaluated": ints[6],
+        "optimizations_completed": ints[7],
         "new_optimizations": []
     }
     
     # フィードバックフェーズ
     feedback_result = {
         "phase": "feedback",
-        "duration": random.uniform(1.0, 3.0),
-        "suggestions_generated": random.randint(2, 5),
-        "suggestions_processed": random.randint(1, 3),
+        "duration": floats[2],
+        "suggestions_generated": ints[8],
+        "suggestions_processed": ints[9],
         "resource_status": random.choice(["normal", "warning", "critical"]),
-        "allocation_changes": random.randint(0, 2),
+        "allocation_changes": ints[10],
         "processed_suggestions": []
     }
     
     # 知識拡張フェーズ
     knowledge_result = {
         "phase": "knowledge_expansion",
-        "duration": random.uniform(3.0, 7.0),
-        "topics_identified": random.randint(3, 7),
-        "expansions_performed": random.randint(2, 5),
-        "successful_expansions": random.randint(1, 4),
+        "duration": floats[3],
+        "topics_identified": ints[11],
+        "expansions_performed": ints[12],
+        "successful_expansions": ints[13],
         "knowledge_base_stats": {
-            "facts": random.randint(50, 200),
-            "concepts": random.randint(30, 100),
-            "methods": random.randint(20, 80),
-            "relations": random.randint(15, 60),
-            "total": random.randint(200, 500)
+            "facts": ints[14],
+            "concepts": ints[15],
+            "methods": ints[16],
+            "relations": ints[17],
+            "total": ints[18]
         },
         "expansions": []
     }
     
-    # 進化サイクル全体
+    # 進化サイクル全体（IDとタイムスタンプは同じ時刻から生成）
+    now = datetime.now()
     cycle_result = {
-        "cycle_id": f"cycle_{int(time.time())}",
-        "timestamp": datetime.now().isoformat(),
+        "cycle_id": f"cycle_{int(now.timestamp())}",
+        "timestamp": now.isoformat(),
         "goals": goals_result,
         "optimizations": optimizations_result,
         "feedback": feedback_result,
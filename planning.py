@@ -1,14 +1,71 @@
-from typing import Dict, List, Any, Optional
+from typing import Dict, List, Any, Mapping, Optional, Tuple
 import logging
 import time
 import uuid
+from collections import Counter, deque
 from datetime import datetime
+from types import MappingProxyType
+
+
+def _task(description: str, reasoning: str) -> Mapping[str, str]:
+    """Build a read-only task template."""
+    return MappingProxyType({"description": description, "reasoning": reasoning})
+
+
+# Task templates per objective bucket, built once and shared by every plan
+_TASK_TEMPLATES = {
+    "analyze": (
+        _task("Gather relevant data for analysis",
+              "Data collection is necessary before any analysis can begin"),
+        _task("Perform initial data processing",
+              "Raw data needs to be cleaned and formatted"),
+        _task("Conduct analysis",
+              "Apply analytical methods to the processed data"),
+        _task("Summarize findings",
+              "Compile results into a coherent summary"),
+    ),
+    "create": (
+        _task("Define requirements and specifications",
+              "Clear requirements are needed before building anything"),
+        _task("Design the structure or framework",
+              "A solid design helps guide the implementation"),
+        _task("Implement core components",
+              "Build the essential parts of the system"),
+        _task("Test and refine",
+              "Ensure the creation works as expected"),
+    ),
+    # Generic task structure
+    "generic": (
+        _task("Analyze the objective",
+              "Understanding the goal is the first step"),
+        _task("Identify key components",
+              "Breaking down the problem into manageable parts"),
+        _task("Process each component",
+              "Addressing each part of the problem"),
+        _task("Synthesize results",
+              "Combining individual solutions into a coherent whole"),
+    ),
+}
+
+
+def _objective_bucket(objective: str) -> str:
+    """Classify an objective into one of the task template buckets."""
+    # Simple keyword-based classification, lowercasing only once
+    lower_objective = objective.lower()
+    if "analyze" in lower_objective:
+        return "analyze"
+    if "create" in lower_objective or "build" in lower_objective:
+        return "create"
+    return "generic"
 
 class Planner:
     """
     Planning capabilities for the assistant with safety guardrails.
     """
     
+    # Maximum number of completed plans kept in plan_history
+    _PLAN_HISTORY_LIMIT = 10000
+    
     def __init__(self, max_steps: int = 10, requires_oversight: bool = True):
         """
         Initialize the planner with safety parameters.
@@ -24,8 +81,14 @@ class Planner:
         # Track active plans
         self.active_plans = {}
         
-        # Plan history for learning and optimization
-        self.plan_history = []
+        # Plan history for learning and optimization (oldest plans are dropped past the limit)
+        self.plan_history = deque(maxlen=self._PLAN_HISTORY_LIMIT)
+        
+        # Running totals over plan_history, updated as plans enter and leave it
+        self._exec_time_sum = 0.0
+        self._success_sum = 0.0
+        self._step_sum = 0
+        self._step_counts = Counter()
     
     def create_plan(self, objective: str) -> Dict[str, Any]:
         """
@@ -50,8 +113,9 @@ class Planner:
             self.logger.warning(f"Plan exceeded max steps ({len(tasks)} > {self.max_steps}), truncating")
             tasks = tasks[:self.max_steps]
         
-        # Create a structured plan
+        # Create a structured plan (created and updated share one timestamp)
         plan_id = f"plan_{str(uuid.uuid4())[:8]}"
+        now = datetime.now().isoformat()
         plan = {
             "id": plan_id,
             "objective": objective,
@@ -59,8 +123,8 @@ class Planner:
             "status": "pending_approval" if self.requires_oversight else "ready",
             "progress": 0,
             "results": {},
-            "created_at": datetime.now().isoformat(),
-            "updated_at": datetime.now().isoformat(),
+            "created_at": now,
+            "updated_at": now,
             "execution_times": [],
             "metrics": {
                 "planning_duration": 0,
@@ -84,17 +148,18 @@ class Planner:
         Returns:
             A string description of the plan
         """
-        description = f"Plan to achieve: {plan['objective']}\n\n"
+        # Collect the pieces and join once at the end
+        parts = [f"Plan to achieve: {plan['objective']}\n\n"]
         
         for i, task in enumerate(plan["tasks"], 1):
-            description += f"Step {i}: {task['description']}\n"
+            parts.append(f"Step {i}: {task['description']}\n")
             if "reasoning" in task:
-                description += f"   Reasoning: {task['reasoning']}\n"
+                parts.append(f"   Reasoning: {task['reasoning']}\n")
         
         if self.requires_oversight:
-            description += "\nThis plan requires your approval before execution."
+            parts.append("\nThis plan requires your approval before execution.")
         
-        return description
+        return "".join(parts)
     
     def execute_plan(self, plan: Dict[str, Any]) -> str:
         """
@@ -112,13 +177,20 @@ class Planner:
         if plan["status"] == "pending_approval" and self.requires_oversight:
             return "This plan requires approval before execution. Please confirm to proceed."
         
+        # Completed plans have moved to plan_history and cannot be executed again
+        if plan_id not in self.active_plans:
+            self.logger.warning(f"Attempted to execute completed or non-existent plan: {plan_id}")
+            return "This plan has already been completed or is unknown."
+        
         self.logger.info(f"Executing plan {plan_id}")
         
-        # Record execution start time
-        self.active_plans[plan_id]["execution_times"].append({
-            "start": datetime.now().isoformat(),
+        # Record execution start time (from the same clock reading as start_time)
+        active_plan = self.active_plans[plan_id]
+        execution_time = {
+            "start": datetime.fromtimestamp(start_time).isoformat(),
             "end": None
-        })
+        }
+        active_plan["execution_times"].append(execution_time)
         
         results = []
         for i, task in enumerate(plan["tasks"]):
@@ -129,21 +201,27 @@ class Planner:
             results.append(result)
             
             # Update progress
-            self.active_plans[plan_id]["progress"] = (i + 1) / len(plan["tasks"]) * 100
+            active_plan["progress"] = (i + 1) / len(plan["tasks"]) * 100
         
         # Update plan metrics
         end_time = time.time()
         execution_duration = end_time - start_time
+        end_iso = datetime.fromtimestamp(end_time).isoformat()
+        execution_time["end"] = end_iso
         
         # Mark plan as complete
-        self.active_plans[plan_id]["status"] = "completed"
-        self.active_plans[plan_id]["results"] = results
-        self.active_plans[plan_id]["updated_at"] = datetime.now().isoformat()
-        self.active_plans[plan_id]["metrics"]["execution_duration"] = execution_duration
-        self.active_plans[plan_id]["metrics"]["success_rate"] = 1.0  # Simplified implementation
-        
-        # Add to plan history
-        completed_plan = self.active_plans[plan_id].copy()
+        active_plan["status"] = "completed"
+        active_plan["results"] = results
+        active_plan["updated_at"] = end_iso
+        active_plan["metrics"]["execution_duration"] = execution_duration
+        active_plan["metrics"]["success_rate"] = 1.0  # Simplified implementation
+        
+        # Move the completed plan from the active plans to the history,
+        # keeping the running metrics totals in step with what the history holds
+        completed_plan = self.active_plans.pop(plan_id)
+        if len(self.plan_history) == self.plan_history.maxlen:
+            self._update_metrics_totals(self.plan_history[0], -1)
+        self._update_metrics_totals(completed_plan, 1)
         self.plan_history.append(completed_plan)
         
         return "\n".join(results)
@@ -171,7 +249,7 @@ class Planner:
         self.logger.info(f"Plan {plan_id} approved for execution")
         return True
     
-    def _extract_tasks(self, objective: str) -> List[Dict[str, Any]]:
+    def _extract_tasks(self, objective: str) -> Tuple[Mapping[str, str], ...]:
         """
         Extract a list of tasks from an objective.
         
@@ -179,69 +257,28 @@ class Planner:
             objective: The objective to extract tasks from
             
         Returns:
-            List of task dictionaries
+            Shared, read-only tuple of task mappings
         """
         # This is a simplified implementation
         # In a real system, this would use more sophisticated NLP and planning
+        return _TASK_TEMPLATES[_objective_bucket(objective)]
         
-        # Simple keyword-based task extraction
-        tasks = []
-        
-        if "analyze" in objective.lower():
-            tasks.append({
-                "description": "Gather relevant data for analysis",
-                "reasoning": "Data collection is necessary before any analysis can begin"
-            })
-            tasks.append({
-                "description": "Perform initial data processing",
-                "reasoning": "Raw data needs to be cleaned and formatted"
-            })
-            tasks.append({
-                "description": "Conduct analysis",
-                "reasoning": "Apply analytical methods to the processed data"
-            })
-            tasks.append({
-                "description": "Summarize findings",
-                "reasoning": "Compile results into a coherent summary"
-            })
-        elif "create" in objective.lower() or "build" in objective.lower():
-            tasks.append({
-                "description": "Define requirements and specifications",
-                "reasoning": "Clear requirements are needed before building anything"
-            })
-            tasks.append({
-                "description": "Design the structure or framework",
-                "reasoning": "A solid design helps guide the implementation"
-            })
-            tasks.append({
-                "description": "Implement core components",
-                "reasoning": "Build the essential parts of the system"
-            })
-            tasks.append({
-                "description": "Test and refine",
-                "reasoning": "Ensure the creation works as expected"
-            })
-        else:
-            # Generic task structure
-            tasks.append({
-                "description": "Analyze the objective",
-                "reasoning": "Understanding the goal is the first step"
-            })
-            tasks.append({
-                "description": "Identify key components",
-                "reasoning": "Breaking down the problem into manageable parts"
-            })
-            tasks.append({
-                "description": "Process each component",
-                "reasoning": "Addressing each part of the problem"
-            })
-            tasks.append({
-                "description": "Synthesize results",
-                "reasoning": "Combining individual solutions into a coherent whole"
-            })
-        
-        return tasks
+    def _update_metrics_totals(self, plan: Dict[str, Any], sign: int) -> None:
+        """
+        Add (sign=1) or remove (sign=-1) a completed plan's contribution to the metrics totals.
         
+        Args:
+            plan: A completed plan
+            sign: 1 when the plan enters plan_history, -1 when it is evicted
+        """
+        step_count = len(plan["tasks"])
+        self._exec_time_sum += sign * plan["metrics"]["execution_duration"]
+        self._success_sum += sign * plan["metrics"]["success_rate"]
+        self._step_sum += sign * step_count
+        self._step_counts[step_count] += sign
+        if not self._step_counts[step_count]:
+            del self._step_counts[step_count]
+    
     def get_plan_metrics(self) -> Dict[str, Any]:
         """
         Get metrics about plan execution and performance.
@@ -261,19 +298,12 @@ class Planner:
             }
         }
         
-        # Calculate metrics from plan history
-        if self.plan_history:
-            # Average execution time
-            execution_times = [p.get("metrics", {}).get("execution_duration", 0) for p in self.plan_history]
-            metrics["average_execution_time"] = sum(execution_times) / len(execution_times) if execution_times else 0
-            
-            # Success rate
-            success_rates = [p.get("metrics", {}).get("success_rate", 0) for p in self.plan_history]
-            metrics["success_rate"] = sum(success_rates) / len(success_rates) if success_rates else 0
-            
-            # Task complexity
-            step_counts = [len(p.get("tasks", [])) for p in self.plan_history]
-            metrics["task_complexity"]["average_steps"] = sum(step_counts) / len(step_counts) if step_counts else 0
-            metrics["task_complexity"]["max_steps"] = max(step_counts) if step_counts else 0
+        # Calculate metrics from the running totals kept by execute_plan
+        completed_count = len(self.plan_history)
+        if completed_count:
+            metrics["average_execution_time"] = self._exec_time_sum / completed_count
+            metrics["success_rate"] = self._success_sum / completed_count
+            metrics["task_complexity"]["average_steps"] = self._step_sum / completed_count
+            metrics["task_complexity"]["max_steps"] = max(self._step_counts)
         
         return metrics
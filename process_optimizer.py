@@ -1,9 +1,114 @@
 import logging
 import json
+import math
+import numbers
+import sys
 import time
+import zlib
 from typing import Dict, List, Any, Optional
-from datetime import datetime
-import copy
+from datetime import datetime, timedelta, timezone
+from collections import Counter
+from array import array
+from collections import deque
+from itertools import islice
+
+# NumPyが利用可能な場合のみ処理時間の統計をベクトル演算で計算
+try:
+    import numpy as np
+    NUMPY_AVAILABLE = True
+except ImportError:
+    NUMPY_AVAILABLE = False
+
+# Numbaが利用可能な場合は冗長操作検出の走査ループをJITコンパイル
+try:
+    import numba
+    NUMBA_AVAILABLE = True
+except ImportError:
+    NUMBA_AVAILABLE = False
+
+
+# 直近に整形した壁時計の秒と、そのISO形式の文字列（秒単位まで）
+_iso_second_cache = [None, ""]
+
+
+def _now_iso(now: Optional[float] = None) -> str:
+    """
+    現在時刻（またはtime.time()の値）をISO形式の文字列に変換
+    
+    同じ秒の間は秒までの部分を使い回し、マイクロ秒だけを付け足す。
+    """
+    if now is None:
+        now = time.time()
+    # datetime.fromtimestampと同じ丸め方でマイクロ秒を求める
+    fraction, second = math.modf(now)
+    second = int(second)
+    microsecond = round(fraction * 1000000)
+    if microsecond >= 1000000:
+        second += 1
+        microsecond -= 1000000
+    if second != _iso_second_cache[0]:
+        _iso_second_cache[0] = second
+        _iso_second_cache[1] = datetime.fromtimestamp(second).isoformat()
+    return f"{_iso_second_cache[1]}.{microsecond:06d}"
+
+
+# 時刻を整数マイクロ秒で扱うための基準（浮動小数点の丸め誤差を避ける）
+_EPOCH = datetime(1970, 1, 1, tzinfo=timezone.utc)
+_MICROSECOND = timedelta(microseconds=1)
+
+
+def _scan_repeated_tasks(times, keys, num_keys):
+    """
+    開始時刻順に並べたタスクから、同一キーのタスクが1秒以内に繰り返された箇所を検出
+    
+    Args:
+        times: 開始時刻（エポックからのマイクロ秒、開始時刻順）
+        keys: タスクキーの整数ID（timesと同じ順序）
+        num_keys: タスクキーの種類数
+        
+    Returns:
+        (検出位置のリスト, 直前の同一タスクとの時間差（マイクロ秒）のリスト)
+    """
+    seen = [False] * num_keys
+    last_times = [0] * num_keys
+    positions = []
+    time_diffs = []
+    
+    for i in range(len(times)):
+        key = keys[i]
+        if seen[key]:
+            time_diff = times[i] - last_times[key]
+            if time_diff < 1000000:  # 1秒以内の同一タスク
+                positions.append(i)
+                time_diffs.append(time_diff)
+        seen[key] = True
+        last_times[key] = times[i]
+    
+    return positions, time_diffs
+
+
+def _scan_failed_retries(task_ids, is_error):
+    """
+    エラーの直後に同一タスクIDがエラーで再実行された箇所を検出
+    
+    Args:
+        task_ids: タスクIDの整数ID（記録順）
+        is_error: 各タスクがエラーだったかどうか
+        
+    Returns:
+        リトライ元タスクの位置のリスト
+    """
+    positions = []
+    for i in range(len(task_ids) - 1):
+        if is_error[i] and is_error[i + 1] and task_ids[i] == task_ids[i + 1]:
+            positions.append(i)
+    return positions
+
+
+if NUMBA_AVAILABLE:
+    # コンパイル結果をディスクにキャッシュし、次回以降の起動でのコンパイルを省く
+    _scan_repeated_tasks = numba.njit(cache=True)(_scan_repeated_tasks)
+    _scan_failed_retries = numba.njit(cache=True)(_scan_failed_retries)
 
 class ProcessOptimizer:
     """
@@ -11,6 +116,12 @@ class ProcessOptimizer:
     処理効率を分析し、システムのパフォーマンスを向上させる。
     """
     
+    # 保持するタスク実行記録の上限
+    _TASK_HISTORY_LIMIT = 1000
+    
+    # 保持する最適化イベントの上限
+    _OPTIMIZATION_HISTORY_LIMIT = 10000
+    
     def __init__(self, config_path: str = "config.json"):
         """
         ProcessOptimizerの初期化
@@ -25,8 +136,11 @@ class ProcessOptimizer:
         self.config = config.get("self_improvement", {})
         self.logger = logging.getLogger("process_optimizer")
         
-        # 最適化履歴
-        self.optimization_history = []
+        # 最適化履歴（上限を超えると古いものから自動的に削除）
+        self.optimization_history = deque(maxlen=self._OPTIMIZATION_HISTORY_LIMIT)
+        
+        # 最適化の実装時刻（エポック秒）。評価時に文字列を解析し直さずに済ませる
+        self._implemented_epochs = {}
         
         # アクティブな最適化
         self.active_optimizations = {}
@@ -39,8 +153,23 @@ class ProcessOptimizer:
             "max_concurrent_optimizations": 3
         }
         
-        # 処理タスクの履歴
-        self.task_history = []
+        # 処理タスクの履歴（上限を超えると古いものから自動的に削除）
+        self.task_history = deque(maxlen=self._TASK_HISTORY_LIMIT)
+        
+        # 履歴と並行して数値だけを保持するリングバッファ
+        # （文字列は整数コードに置き換え、分析時にPythonオブジェクトを辿らずに済ませる）
+        self._task_durations = array('d')
+        self._task_component_codes = array('i')
+        self._task_type_codes = array('i')
+        self._task_status_codes = array('i')
+        self._task_recorded_epochs = array('d')
+        self._ring_head = 0
+        self._codes = {}
+        self._code_names = []
+        
+        # 履歴全体のコンポーネント別・ステータス別件数（記録・削除のたびに更新）
+        self._component_counts = Counter()
+        self._status_counts = Counter()
         
         # 許可された改善領域
         self.allowed_improvement_areas = self.config.get("improvement_areas", [
@@ -66,15 +195,50 @@ class ProcessOptimizer:
                 self.logger.warning(f"Task execution record missing required field: {field}")
                 return
         
-        # 現在の時刻を追加
-        task_data["recorded_at"] = datetime.now().isoformat()
+        # 処理時間は数値列に格納するため、数値でない記録は受け付けない
+        if not isinstance(task_data["duration"], numbers.Real):
+            self.logger.warning(f"Task execution record has non-numeric duration: {task_data['duration']!r}")
+            return
         
-        # 履歴に追加
-        self.task_history.append(task_data)
+        # 繰り返し現れる文字列を共有オブジェクトにして、メモリと比較・ハッシュのコストを抑える
+        for field in ("component", "task_type", "result_status"):
+            value = task_data.get(field)
+            if isinstance(value, str):
+                task_data[field] = sys.intern(value)
         
-        # 履歴が大きくなりすぎたら古いデータを削除
-        if len(self.task_history) > 1000:
-            self.task_history = self.task_history[-1000:]
+        # 現在の時刻を追加
+        recorded_epoch = time.time()
+        task_data["recorded_at"] = _now_iso(recorded_epoch)
+        
+        # 数値列と件数を更新
+        duration = task_data["duration"]
+        component_code = self._code_for(task_data["component"])
+        type_code = self._code_for(task_data.get("task_type"))
+        status_code = self._code_for(task_data["result_status"])
+        
+        if len(self._task_durations) < self._TASK_HISTORY_LIMIT:
+            self._task_durations.append(duration)
+            self._task_component_codes.append(component_code)
+            self._task_type_codes.append(type_code)
+            self._task_status_codes.append(status_code)
+            self._task_recorded_epochs.append(recorded_epoch)
+        else:
+            # 最も古い記録の位置を上書きし、その分の件数を差し引く
+            head = self._ring_head
+            self._discount(self._component_counts, self._task_component_codes[head])
+            self._discount(self._status_counts, self._task_status_codes[head])
+            self._task_durations[head] = duration
+            self._task_component_codes[head] = component_code
+            self._task_type_codes[head] = type_code
+            self._task_status_codes[head] = status_code
+            self._task_recorded_epochs[head] = recorded_epoch
+            self._ring_head = (head + 1) % self._TASK_HISTORY_LIMIT
+        
+        self._component_counts[component_code] += 1
+        self._status_counts[status_code] += 1
+        
+        # 履歴に追加（上限を超えた分はdequeが削除する）
+        self.task_history.append(task_data)
         
         self.logger.debug(f"Recorded task execution for {task_data['task_id']}")
     
@@ -92,14 +256,20 @@ class ProcessOptimizer:
         if not self.task_history:
             return {"status": "insufficient_data"}
         
-        # 対象タスクをフィルタリング
-        filtered_tasks = self.task_history
-        
-        if component:
-            filtered_tasks = [t for t in filtered_tasks if t.get("component") == component]
+        # 数値列を古い順に取り出す
+        filtered_tasks = list(self.task_history)
+        durations = self._ring_values(self._task_durations)
+        component_codes = self._ring_values(self._task_component_codes)
+        status_codes = self._ring_values(self._task_status_codes)
         
-        if task_type:
-            filtered_tasks = [t for t in filtered_tasks if t.get("task_type") == task_type]
+        # 対象タスクをフィルタリング
+        filtered = bool(component or task_type)
+        if filtered:
+            selected = self._select_tasks(component, task_type)
+            filtered_tasks = [filtered_tasks[i] for i in selected]
+            durations = self._take(durations, selected)
+            component_codes = self._take(component_codes, selected)
+            status_codes = self._take(status_codes, selected)
         
         if len(filtered_tasks) < self.optimization_settings["min_data_points"]:
             return {
@@ -108,52 +278,53 @@ class ProcessOptimizer:
             }
         
         # 基本的な統計
-        durations = [t.get("duration", 0) for t in filtered_tasks]
-        avg_duration = sum(durations) / len(durations)
-        max_duration = max(durations)
-        min_duration = min(durations)
-        
-        # 結果ステータスの統計
-        status_counts = {}
-        for task in filtered_tasks:
-            status = task.get("result_status", "unknown")
-            if status not in status_counts:
-                status_counts[status] = 1
-            else:
-                status_counts[status] += 1
+        if NUMPY_AVAILABLE:
+            avg_duration = float(durations.mean())
+            max_duration = float(durations.max())
+            min_duration = float(durations.min())
+            duration_variance = float(durations.var())
+            long_running_mask = durations > avg_duration * 1.5
+            long_running_count = int(np.count_nonzero(long_running_mask))
+            example_indices = np.flatnonzero(long_running_mask)[:3].tolist() if long_running_count else []
+        else:
+            avg_duration = sum(durations) / len(durations)
+            max_duration = max(durations)
+            min_duration = min(durations)
+            duration_variance = sum((d - avg_duration) ** 2 for d in durations) / len(durations)
+            long_running_threshold = avg_duration * 1.5
+            long_running_count = sum(1 for d in durations if d > long_running_threshold)
+            # 例示に使う先頭3件だけを取り出し、該当タスク全体のリストは作らない
+            example_indices = list(islice(
+                (i for i, d in enumerate(durations) if d > long_running_threshold), 3
+            ))
+        
+        # 結果ステータスの統計（全件が対象なら記録時に更新した件数をそのまま使う）
+        status_counter = self._count_codes(status_codes) if filtered else self._status_counts
+        status_counts = {self._code_names[code]: count for code, count in status_counter.items()}
         
         # コンポーネント別の統計
         component_stats = {}
         if not component:
-            for task in filtered_tasks:
-                comp = task.get("component", "unknown")
-                if comp not in component_stats:
-                    component_stats[comp] = {
-                        "count": 1,
-                        "total_duration": task.get("duration", 0)
-                    }
-                else:
-                    component_stats[comp]["count"] += 1
-                    component_stats[comp]["total_duration"] += task.get("duration", 0)
-            
-            # 平均を計算
-            for comp in component_stats:
-                if component_stats[comp]["count"] > 0:
-                    component_stats[comp]["avg_duration"] = (
-                        component_stats[comp]["total_duration"] / component_stats[comp]["count"]
-                    )
+            component_counter = self._count_codes(component_codes) if filtered else self._component_counts
+            total_durations = self._sum_by_code(component_codes, durations)
+            for code, count in component_counter.items():
+                total_duration = total_durations[code]
+                component_stats[self._code_names[code]] = {
+                    "count": count,
+                    "total_duration": total_duration,
+                    "avg_duration": total_duration / count
+                }
         
         # ボトルネックの特定
         bottlenecks = []
         
         # 処理時間の長いタスク
-        long_running_tasks = [t for t in filtered_tasks if t.get("duration", 0) > avg_duration * 1.5]
-        if long_running_tasks:
+        if long_running_count:
             bottlenecks.append({
                 "type": "long_running_tasks",
                 "description": "平均処理時間の1.5倍を超えるタスク",
-                "count": len(long_running_tasks),
-                "examples": [t.get("task_id") for t in long_running_tasks[:3]]
+                "count": long_running_count,
+                "examples": [filtered_tasks[i].get("task_id") for i in example_indices]
             })
         
         # エラー率の高いタスク
@@ -197,7 +368,7 @@ class ProcessOptimizer:
                 "average_processing_time": avg_duration,
                 "max_processing_time": max_duration,
                 "min_processing_time": min_duration,
-                "processing_time_variance": sum((d - avg_duration) ** 2 for d in durations) / len(durations)
+                "processing_time_variance": duration_variance
             },
             "result_distribution": status_counts,
             "bottlenecks": bottlenecks,
@@ -223,14 +394,18 @@ class ProcessOptimizer:
         if efficiency_metrics.get("status") != "success":
             return []
         
-        optimizations = []
+        # 対象（target）ごとに最初の提案だけを残す
+        optimizations = {}
+        
+        # レビュー要否の設定は全提案で共通なので一度だけ読む
+        requires_review = self.config.get("requires_review", True)
         
         # ボトルネックへの対応
         for bottleneck in efficiency_metrics.get("bottlenecks", []):
             bottleneck_type = bottleneck.get("type", "")
             
             if bottleneck_type == "long_running_tasks":
-                optimizations.append({
+                optimizations.setdefault("long_running_tasks", {
                     "id": f"opt_{int(time.time())}_{len(optimizations)}",
                     "type": "performance_optimization",
                     "target": "long_running_tasks",
@@ -238,11 +413,11 @@ class ProcessOptimizer:
                     "strategy": "タスク分割と並列処理の実装",
                     "expected_improvement": 0.3,  # 30%の改善を期待
                     "complexity": "medium",
-                    "requires_review": self.config.get("requires_review", True)
+                    "requires_review": requires_review
                 })
             
             elif bottleneck_type == "high_error_rate":
-                optimizations.append({
+                optimizations.setdefault("error_handling", {
                     "id": f"opt_{int(time.time())}_{len(optimizations)}",
                     "type": "reliability_optimization",
                     "target": "error_handling",
@@ -250,12 +425,12 @@ class ProcessOptimizer:
                     "strategy": "例外処理とリトライロジックの改善",
                     "expected_improvement": 0.4,  # エラー率40%削減を期待
                     "complexity": "medium",
-                    "requires_review": self.config.get("requires_review", True)
+                    "requires_review": requires_review
                 })
             
             elif bottleneck_type == "component_imbalance":
                 slow_component = bottleneck.get("slowest", {}).get("component", "unknown")
-                optimizations.append({
+                optimizations.setdefault(f"component_{slow_component}", {
                     "id": f"opt_{int(time.time())}_{len(optimizations)}",
                     "type": "performance_optimization",
                     "target": f"component_{slow_component}",
@@ -263,12 +438,12 @@ class ProcessOptimizer:
                     "strategy": "アルゴリズム効率化とキャッシュ導入",
                     "expected_improvement": 0.35,  # 35%の改善を期待
                     "complexity": "high",
-                    "requires_review": self.config.get("requires_review", True)
+                    "requires_review": requires_review
                 })
         
         # 冗長操作の最適化
         if efficiency_metrics.get("redundant_operations"):
-            optimizations.append({
+            optimizations.setdefault("redundant_operations", {
                 "id": f"opt_{int(time.time())}_{len(optimizations)}",
                 "type": "efficiency_optimization",
                 "target": "redundant_operations",
@@ -276,14 +451,14 @@ class ProcessOptimizer:
                 "strategy": "処理の統合と重複排除",
                 "expected_improvement": 0.2,  # 20%の改善を期待
                 "complexity": "low",
-                "requires_review": self.config.get("requires_review", True)
+                "requires_review": requires_review
             })
         
         # 一般的なパフォーマンス最適化
         time_metrics = efficiency_metrics.get("time_metrics", {})
         if time_metrics.get("processing_time_variance", 0) > time_metrics.get("average_processing_time", 0):
             # 処理時間のバラツキが大きい場合
-            optimizations.append({
+            optimizations.setdefault("processing_stability", {
                 "id": f"opt_{int(time.time())}_{len(optimizations)}",
                 "type": "stability_optimization",
                 "target": "processing_stability",
@@ -291,18 +466,10 @@ class ProcessOptimizer:
                 "strategy": "処理フローの標準化と予測可能性の向上",
                 "expected_improvement": 0.25,  # 25%の改善を期待
                 "complexity": "medium",
-                "requires_review": self.config.get("requires_review", True)
+                "requires_review": requires_review
             })
         
-        # 最適化の重複排除
-        unique_optimizations = []
-        optimization_targets = set()
-        
-        for opt in optimizations:
-            target = opt.get("target", "")
-            if target not in optimization_targets:
-                unique_optimizations.append(opt)
-                optimization_targets.add(target)
+        unique_optimizations = list(optimizations.values())
         
         self.logger.info(f"Proposed {len(unique_optimizations)} optimizations based on efficiency analysis")
         return unique_optimizations
@@ -328,13 +495,15 @@ class ProcessOptimizer:
         # これは実際のシステムではより複雑な実装になる
         # このデモでは、最適化を記録し、擬似的な結果を返す
         
+        implemented_epoch = time.time()
+        implemented_at = _now_iso(implemented_epoch)
         implementation = {
             "id": optimization_id,
             "status": "implemented",
-            "implemented_at": datetime.now().isoformat(),
+            "implemented_at": implemented_at,
             "parameters": parameters or {},
             "results": {
-                "performance_impact": 0.15 + 0.1 * (hash(optimization_id) % 3),  # 擬似的な改善効果
+                "performance_impact": 0.15 + 0.1 * (zlib.crc32(optimization_id.encode()) % 3),  # 擬似的な改善効果（IDから決定的に算出）
                 "stability_impact": 0.1,
                 "resource_usage_impact": -0.05  # リソース使用量の減少
             }
@@ -342,12 +511,13 @@ class ProcessOptimizer:
         
         # アクティブな最適化として記録
         self.active_optimizations[optimization_id] = implementation
+        self._implemented_epochs[optimization_id] = implemented_epoch
         
         # 履歴に追加
         self.optimization_history.append({
             "event": "optimization_implemented",
             "optimization_id": optimization_id,
-            "timestamp": datetime.now().isoformat(),
+            "timestamp": implemented_at,
             "parameters": parameters or {}
         })
         
@@ -373,35 +543,51 @@ class ProcessOptimizer:
         optimization = self.active_optimizations[optimization_id]
         
         # 実装時刻を取得
-        implemented_at = datetime.fromisoformat(optimization.get("implemented_at", datetime.now().isoformat()))
-        
-        # 実装前と後のタスクを比較
-        before_tasks = [
-            t for t in self.task_history 
-            if datetime.fromisoformat(t.get("recorded_at", "")) < implemented_at
-        ]
-        
-        after_tasks = [
-            t for t in self.task_history 
-            if datetime.fromisoformat(t.get("recorded_at", "")) >= implemented_at
-        ]
+        implemented_epoch = self._implemented_epochs.get(optimization_id)
+        if implemented_epoch is None:
+            implemented_epoch = datetime.fromisoformat(optimization.get("implemented_at", _now_iso())).timestamp()
+        
+        # 実装前と後のタスクを記録時刻の数値列で振り分けて比較
+        recorded_epochs = self._ring_values(self._task_recorded_epochs)
+        durations = self._ring_values(self._task_durations)
+        status_codes = self._ring_values(self._task_status_codes)
+        error_code = self._codes.get("error", -1)
+        
+        if NUMPY_AVAILABLE:
+            # 実装前を0、実装後を1とした区分ごとにbincountで件数・合計・エラー数を集計
+            partition = (recorded_epochs >= implemented_epoch).astype(np.intp)
+            before_count, after_count = np.bincount(partition, minlength=2).tolist()
+            before_total, after_total = np.bincount(partition, weights=durations, minlength=2).tolist()
+            before_errors, after_errors = np.bincount(
+                partition[status_codes == error_code], minlength=2
+            ).tolist()
+        else:
+            # 件数・合計・エラー数を1回の走査でまとめて集計
+            before_count = before_total = before_errors = 0
+            after_count = after_total = after_errors = 0
+            for epoch, duration, code in zip(recorded_epochs, durations, status_codes):
+                if epoch >= implemented_epoch:
+                    after_count += 1
+                    after_total += duration
+                    after_errors += code == error_code
+                else:
+                    before_count += 1
+                    before_total += duration
+                    before_errors += code == error_code
         
-        if len(before_tasks) < 5 or len(after_tasks) < 5:
+        if before_count < 5 or after_count < 5:
             return {
                 "status": "insufficient_data",
                 "message": "効果を評価するためのデータが不足しています"
             }
         
         # 処理時間の比較
-        before_avg_duration = sum(t.get("duration", 0) for t in before_tasks) / len(before_tasks)
-        after_avg_duration = sum(t.get("duration", 0) for t in after_tasks) / len(after_tasks)
+        before_avg_duration = before_total / before_count
+        after_avg_duration = after_total / after_count
         
         # エラー率の比較
-        before_errors = sum(1 for t in before_tasks if t.get("result_status") == "error")
-        after_errors = sum(1 for t in after_tasks if t.get("result_status") == "error")
-        
-        before_error_rate = before_errors / len(before_tasks) if before_tasks else 0
-        after_error_rate = after_errors / len(after_tasks) if after_tasks else 0
+        before_error_rate = before_errors / before_count
+        after_error_rate = after_errors / after_count
         
         # 改善率の計算
         if before_avg_duration > 0:
@@ -424,12 +610,12 @@ class ProcessOptimizer:
                 "before_implementation": {
                     "avg_duration": before_avg_duration,
                     "error_rate": before_error_rate,
-                    "sample_size": len(before_tasks)
+                    "sample_size": before_count
                 },
                 "after_implementation": {
                     "avg_duration": after_avg_duration,
                     "error_rate": after_error_rate,
-                    "sample_size": len(after_tasks)
+                    "sample_size": after_count
                 },
                 "improvements": {
                     "duration": duration_improvement,
@@ -442,18 +628,21 @@ class ProcessOptimizer:
                 "neutral" if overall_impact >= -0.05 else 
                 "regression"
             ),
-            "evaluation_time": datetime.now().isoformat()
+            "evaluation_time": _now_iso()
         }
         
         # 最適化の状態を更新
-        self.active_optimizations[optimization_id]["evaluation"] = copy.deepcopy(evaluation["metrics"])
+        # （metricsは数値だけを持つ2階層の辞書なので、各階層をコピーすればdeepcopyと同等）
+        self.active_optimizations[optimization_id]["evaluation"] = {
+            key: dict(values) for key, values in evaluation["metrics"].items()
+        }
         self.active_optimizations[optimization_id]["evaluation_status"] = evaluation["evaluation_status"]
         
         # 履歴に追加
         self.optimization_history.append({
             "event": "optimization_evaluated",
             "optimization_id": optimization_id,
-            "timestamp": datetime.now().isoformat(),
+            "timestamp": evaluation["evaluation_time"],
             "evaluation_status": evaluation["evaluation_status"],
             "overall_impact": overall_impact
         })
@@ -468,7 +657,107 @@ class ProcessOptimizer:
         Returns:
             最適化イベントの履歴
         """
-        return self.optimization_history
+        return list(self.optimization_history)
+    
+    def _code_for(self, name: Any) -> int:
+        """
+        文字列（コンポーネント名・タスクタイプ・ステータス）を整数コードに変換
+        """
+        code = self._codes.get(name)
+        if code is None:
+            code = len(self._code_names)
+            self._codes[name] = code
+            self._code_names.append(name)
+        return code
+    
+    @staticmethod
+    def _discount(counter: Counter, code: int) -> None:
+        """
+        件数を1減らし、0になったコードは取り除く
+        """
+        counter[code] -= 1
+        if counter[code] == 0:
+            del counter[code]
+    
+    def _ring_values(self, ring: array):
+        """
+        リングバッファの内容を古い順に並べて取得
+        
+        Args:
+            ring: 記録と並行して保持している数値列
+            
+        Returns:
+            NumPyが利用可能な場合はndarray（コピー）、それ以外はリスト
+        """
+        head = self._ring_head
+        if NUMPY_AVAILABLE:
+            # concatenateは常にコピーを返すため、arrayのバッファを掴んだままにならない
+            values = np.frombuffer(ring, dtype=np.float64 if ring.typecode == 'd' else np.intc)
+            return np.concatenate((values[head:], values[:head]))
+        return ring[head:].tolist() + ring[:head].tolist()
+    
+    def _select_tasks(self, component: Optional[str], task_type: Optional[str]):
+        """
+        条件に合うタスクの位置（古い順）を取得
+        """
+        component_code = self._codes.get(component, -1) if component else None
+        type_code = self._codes.get(task_type, -1) if task_type else None
+        
+        if NUMPY_AVAILABLE:
+            mask = np.ones(len(self.task_history), dtype=np.bool_)
+            if component_code is not None:
+                mask &= self._ring_values(self._task_component_codes) == component_code
+            if type_code is not None:
+                mask &= self._ring_values(self._task_type_codes) == type_code
+            return np.flatnonzero(mask)
+        
+        component_codes = self._ring_values(self._task_component_codes)
+        type_codes = self._ring_values(self._task_type_codes)
+        return [
+            i for i in range(len(component_codes))
+            if (component_code is None or component_codes[i] == component_code)
+            and (type_code is None or type_codes[i] == type_code)
+        ]
+    
+    @staticmethod
+    def _take(values, indices):
+        """
+        指定位置の値だけを取り出す
+        """
+        if NUMPY_AVAILABLE:
+            return values[indices]
+        return [values[i] for i in indices]
+    
+    def _count_codes(self, codes) -> Dict[int, int]:
+        """
+        コードごとの件数を初出順に集計
+        """
+        if NUMPY_AVAILABLE:
+            unique_codes, first_positions, counts = np.unique(codes, return_index=True, return_counts=True)
+            order = np.argsort(first_positions)
+            return dict(zip(unique_codes[order].tolist(), counts[order].tolist()))
+        return Counter(codes)
+    
+    def _sum_by_code(self, codes, durations):
+        """
+        コードごとに処理時間を合計（記録順に加算）
+        """
+        if NUMPY_AVAILABLE:
+            return np.bincount(codes, weights=durations, minlength=len(self._code_names)).tolist()
+        totals = [0.0] * len(self._code_names)
+        for code, duration in zip(codes, durations):
+            totals[code] += duration
+        return totals
+    
+    @staticmethod
+    def _epoch_microseconds(timestamp: str) -> int:
+        """
+        ISO形式の時刻をエポックからの整数マイクロ秒に変換（タイムゾーンなしの時刻はUTCとして扱う）
+        """
+        moment = datetime.fromisoformat(timestamp)
+        if moment.tzinfo is None:
+            moment = moment.replace(tzinfo=timezone.utc)
+        return (moment - _EPOCH) // _MICROSECOND
     
     def _detect_redundant_operations(self, tasks: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
         """
@@ -480,37 +769,50 @@ class ProcessOptimizer:
         # 実際のシステムではより高度なパターン検出を使用
         
         # 同一タスクが短時間に繰り返される場合
-        task_sequence = {}
-        
-        for task in sorted(tasks, key=lambda t: t.get("start_time", "")):
+        # 開始時刻は先に一度だけ取り出して並べ替えのキーに使い、整数のマイクロ秒にも
+        # 一度だけ変換する（タスクキーは整数IDに置き換えて走査する）
+        start_times = [t.get("start_time", "") for t in tasks]
+        order = sorted(range(len(tasks)), key=start_times.__getitem__)
+        ordered = [tasks[i] for i in order]
+        key_ids = {}
+        task_keys = []
+        times = []
+        for i, task in zip(order, ordered):
             task_key = f"{task.get('component', '')}-{task.get('task_type', '')}"
-            
-            if task_key in task_sequence:
-                prev_time = datetime.fromisoformat(task_sequence[task_key])
-                curr_time = datetime.fromisoformat(task.get("start_time", datetime.now().isoformat()))
-                
-                time_diff = (curr_time - prev_time).total_seconds()
-                
-                if time_diff < 1.0:  # 1秒以内の同一タスク
-                    redundant_ops.append({
-                        "type": "repeated_task",
-                        "description": f"短時間内に繰り返される同一タスク: {task_key}",
-                        "time_difference": time_diff,
-                        "task_ids": [task.get("task_id", "unknown")]
-                    })
-            
-            task_sequence[task_key] = task.get("start_time", "")
+            task_keys.append(task_key)
+            times.append(self._epoch_microseconds(start_times[i] or _now_iso()))
+        keys = [key_ids.setdefault(task_key, len(key_ids)) for task_key in task_keys]
+        
+        if NUMBA_AVAILABLE:
+            positions, time_diffs = _scan_repeated_tasks(
+                np.array(times, dtype=np.int64), np.array(keys, dtype=np.int64), len(key_ids)
+            )
+        else:
+            positions, time_diffs = _scan_repeated_tasks(times, keys, len(key_ids))
+        
+        for i, time_diff in zip(positions, time_diffs):
+            redundant_ops.append({
+                "type": "repeated_task",
+                "description": f"短時間内に繰り返される同一タスク: {task_keys[i]}",
+                "time_difference": time_diff / 1000000,
+                "task_ids": [ordered[i].get("task_id", "unknown")]
+            })
         
         # 失敗後の無意味なリトライ
-        for i in range(len(tasks) - 1):
-            if (tasks[i].get("result_status") == "error" and
-                tasks[i+1].get("task_id") == tasks[i].get("task_id") and
-                tasks[i+1].get("result_status") == "error"):
-                
-                redundant_ops.append({
-                    "type": "failed_retry",
-                    "description": f"失敗後の同一条件での無意味なリトライ: {tasks[i].get('task_id', 'unknown')}",
-                    "task_ids": [tasks[i].get("task_id", "unknown"), tasks[i+1].get("task_id", "unknown")]
-                })
+        id_map = {}
+        task_ids = [id_map.setdefault(t.get("task_id"), len(id_map)) for t in tasks]
+        is_error = [t.get("result_status") == "error" for t in tasks]
+        
+        if NUMBA_AVAILABLE:
+            positions = _scan_failed_retries(np.array(task_ids, dtype=np.int64), np.array(is_error, dtype=np.bool_))
+        else:
+            positions = _scan_failed_retries(task_ids, is_error)
+        
+        for i in positions:
+            redundant_ops.append({
+                "type": "failed_retry",
+                "description": f"失敗後の同一条件での無意味なリトライ: {tasks[i].get('task_id', 'unknown')}",
+                "task_ids": [tasks[i].get("task_id", "unknown"), tasks[i+1].get("task_id", "unknown")]
+            })
         
         return redundant_ops
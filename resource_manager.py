@@ -5,6 +5,43 @@ import os
 import psutil
 from typing import Dict, List, Any, Optional
 from datetime import datetime
+from collections import deque
+
+# NumPyが利用可能な場合のみ傾向分析の統計をベクトル演算で計算
+try:
+    import numpy as np
+    NUMPY_AVAILABLE = True
+except ImportError:
+    NUMPY_AVAILABLE = False
+
+# 閾値判定の結果を1つの整数にまとめるためのビット（上位3ビットが重大、下位3ビットが警告）
+_MEMORY_CRITICAL = 1 << 5
+_CPU_CRITICAL = 1 << 4
+_DISK_CRITICAL = 1 << 3
+_MEMORY_WARNING = 1 << 2
+_CPU_WARNING = 1 << 1
+_DISK_WARNING = 1
+_CRITICAL_MASK = _MEMORY_CRITICAL | _CPU_CRITICAL | _DISK_CRITICAL
+_WARNING_MASK = _MEMORY_WARNING | _CPU_WARNING | _DISK_WARNING
+
+# 保持するタスク優先度付け結果の上限
+_PRIORITY_CACHE_SIZE = 32
+
+# システム状態ごとの割り当て方針
+# （非重要タスクの縮小率, メモリ上限, CPU上限, 相対的なリソース予算, 推奨事項）
+_ALLOCATION_POLICIES = {
+    "critical": (0.5, 25, 5, None, (
+        "非重要タスクを一時停止",
+        "不要なコンポーネントをシャットダウン",
+        "データキャッシュをクリア"
+    )),
+    "warning": (None, None, None, 100, (
+        "低優先度タスクを延期",
+        "メモリ使用量の多いプロセスを最適化",
+        "一時データをクリーンアップ"
+    )),
+    "normal": (None, None, None, None, ())
+}
 
 class ResourceManager:
     """
@@ -12,6 +49,10 @@ class ResourceManager:
     システムのパフォーマンスを監視し、リソース使用を最適化する。
     """
     
+    # 計測値を使い回す期間（秒）。ディスク使用量は変化が遅いため長めにする
+    _MEMORY_TTL = 0.5
+    _DISK_TTL = 5.0
+    
     def __init__(self, config_path: str = "config.json"):
         """
         ResourceManagerの初期化
@@ -33,8 +74,10 @@ class ResourceManager:
             "storage": {}
         }
         
-        # パフォーマンスメトリクスの履歴
-        self.performance_history = []
+        # パフォーマンスメトリクスの履歴（直近100件、古いものから自動的に削除）
+        self.performance_history = deque(maxlen=100)
+        # 各エントリの記録時刻（time.monotonic()）。傾向分析で時刻文字列を解析し直さずに済ませる
+        self._history_times = deque(maxlen=100)
         
         # リソース使用量の閾値
         self.thresholds = {
@@ -55,6 +98,21 @@ class ResourceManager:
             "goal_manager": 4
         }
         
+        # メモリ・ディスクの計測値のキャッシュ（計測時刻, 値）
+        self._memory_cache = (0.0, None)
+        self._disk_cache = (0.0, None)
+        
+        # タスク優先度付けの結果キャッシュ（入力の署名 -> (並び順, 各タスクの優先度)）
+        self._priority_cache = {}
+        
+        # 自プロセスのハンドルは使い回す
+        self._process = psutil.Process(os.getpid())
+        
+        # CPU使用率は前回呼び出しからの差分で求めるため、ここで初回の計測を済ませておく
+        # （以降のmonitor_resourcesはinterval=Noneでブロックせずに値を得られる）
+        psutil.cpu_percent(interval=None)
+        self._process.cpu_percent(interval=None)
+        
         self.logger.info("Resource manager initialized")
     
     def monitor_resources(self) -> Dict[str, Any]:
@@ -64,21 +122,32 @@ class ResourceManager:
         Returns:
             リソース使用状況のメトリクス
         """
-        # メモリ使用量
-        memory = psutil.virtual_memory()
+        now = time.monotonic()
+        
+        # メモリ使用量（TTLの間は前回の計測値を使う）
+        measured_at, memory = self._memory_cache
+        if memory is None or now - measured_at > self._MEMORY_TTL:
+            memory = psutil.virtual_memory()
+            self._memory_cache = (now, memory)
         memory_usage_percent = memory.percent
         
-        # CPU使用量
-        cpu_usage_percent = psutil.cpu_percent(interval=0.1)
+        # CPU使用量（前回の呼び出しからの値、ブロックしない）
+        cpu_usage_percent = psutil.cpu_percent(interval=None)
         
-        # ディスク使用量
-        disk = psutil.disk_usage('/')
+        # ディスク使用量（TTLの間は前回の計測値を使う）
+        measured_at, disk = self._disk_cache
+        if disk is None or now - measured_at > self._DISK_TTL:
+            disk = psutil.disk_usage('/')
+            self._disk_cache = (now, disk)
         disk_usage_percent = disk.percent
         
-        # プロセス情報
-        process = psutil.Process(os.getpid())
-        process_memory_mb = process.memory_info().rss / 1024 / 1024
-        process_cpu_percent = process.cpu_percent(interval=0.1)
+        # プロセス情報（oneshotで/procの読み込みをまとめる）
+        with self._process.oneshot():
+            process_memory_mb = self._process.memory_info().rss / 1024 / 1024
+            process_cpu_percent = self._process.cpu_percent(interval=None)
+        
+        # 閾値との比較は1回だけ行い、状態判定とログ出力で共有する
+        threshold_flags = self._threshold_flags(memory_usage_percent, cpu_usage_percent, disk_usage_percent)
         
         metrics = {
             "timestamp": datetime.now().isoformat(),
@@ -95,18 +164,15 @@ class ResourceManager:
                 "memory_mb": process_memory_mb,
                 "cpu_percent": process_cpu_percent
             },
-            "status": self._determine_resource_status(memory_usage_percent, cpu_usage_percent, disk_usage_percent)
+            "status": self._determine_resource_status(threshold_flags)
         }
         
         # 履歴に追加
         self.performance_history.append(metrics)
-        
-        # 履歴が大きくなりすぎたら古いエントリを削除
-        if len(self.performance_history) > 100:
-            self.performance_history = self.performance_history[-100:]
+        self._history_times.append(now)
         
         # 警告レベルの確認とログ記録
-        self._log_resource_warnings(metrics)
+        self._log_resource_warnings(metrics, threshold_flags)
         
         return metrics
     
@@ -126,24 +192,11 @@ class ResourceManager:
         # ステータスに基づいた最適化戦略
         status = current_metrics["status"]
         
-        # リソース割り当て計画
-        allocation_plan = {
-            "memory": {},
-            "cpu": {},
-            "tasks": {},
-            "recommendations": []
-        }
-        
         # タスクの優先度付け
         prioritized_tasks = self._prioritize_tasks(active_tasks)
         
         # ステータスに応じた割り当て戦略
-        if status == "critical":
-            allocation_plan = self._critical_allocation(prioritized_tasks, current_metrics)
-        elif status == "warning":
-            allocation_plan = self._warning_allocation(prioritized_tasks, current_metrics)
-        else:  # normal
-            allocation_plan = self._normal_allocation(prioritized_tasks, current_metrics)
+        allocation_plan = self._allocate(prioritized_tasks, status)
         
         # 割り当てを更新
         self.resource_allocation = allocation_plan
@@ -178,7 +231,8 @@ class ResourceManager:
             usage_metrics: 使用量メトリクス
         """
         # これは実際のシステムでは使用されるが、このデモでは単純にログに記録
-        self.logger.info(f"Resource usage reported by {component_name}: {json.dumps(usage_metrics)}")
+        # （文字列化はログが実際に出力される場合にのみロガー側で行われる）
+        self.logger.info("Resource usage reported by %s: %s", component_name, usage_metrics)
         
         # 必要に応じて割り当てを微調整
         # この実装はシンプルなデモ
@@ -186,7 +240,7 @@ class ResourceManager:
             if usage_metrics["memory_mb"] > self.resource_allocation["memory"].get(component_name, 0) * 1.2:
                 # 使用量が割り当ての120%を超えた場合、割り当てを増やす
                 self.resource_allocation["memory"][component_name] = usage_metrics["memory_mb"] * 1.1
-                self.logger.info(f"Increased memory allocation for {component_name}")
+                self.logger.info("Increased memory allocation for %s", component_name)
     
     def get_resource_trend(self, metric_name: str, duration_minutes: int = 10) -> Dict[str, Any]:
         """
@@ -203,45 +257,58 @@ class ResourceManager:
             return {"status": "insufficient_data"}
         
         # 現在の時刻
-        now = datetime.now()
+        now = time.monotonic()
         
         # 指定期間内のデータをフィルタリング
+        # （履歴は時刻順なので新しい方から辿り、期間外に出たところで打ち切る）
         filtered_data = []
         
-        for entry in self.performance_history:
-            entry_time = datetime.fromisoformat(entry["timestamp"])
-            time_diff = (now - entry_time).total_seconds() / 60
+        for entry, entry_time in zip(reversed(self.performance_history), reversed(self._history_times)):
+            time_diff = (now - entry_time) / 60
             
-            if time_diff <= duration_minutes:
-                # システムメトリクス内のキーをチェック
-                if metric_name in entry["system"]:
-                    filtered_data.append({
-                        "timestamp": entry["timestamp"],
-                        "value": entry["system"][metric_name]
-                    })
-                # プロセスメトリクス内のキーをチェック
-                elif metric_name in entry["process"]:
-                    filtered_data.append({
-                        "timestamp": entry["timestamp"],
-                        "value": entry["process"][metric_name]
-                    })
+            if time_diff > duration_minutes:
+                break
+            
+            # システムメトリクス内のキーをチェック
+            if metric_name in entry["system"]:
+                filtered_data.append({
+                    "timestamp": entry["timestamp"],
+                    "value": entry["system"][metric_name]
+                })
+            # プロセスメトリクス内のキーをチェック
+            elif metric_name in entry["process"]:
+                filtered_data.append({
+                    "timestamp": entry["timestamp"],
+                    "value": entry["process"][metric_name]
+                })
         
         if not filtered_data:
             return {"status": "metric_not_found"}
         
+        # 古い順に戻す
+        filtered_data.reverse()
+        
         # データポイント数が少なすぎる場合
         if len(filtered_data) < 3:
             return {"status": "insufficient_data_points"}
         
         # 基本的な統計
-        values = [point["value"] for point in filtered_data]
-        avg_value = sum(values) / len(values)
-        min_value = min(values)
-        max_value = max(values)
+        if NUMPY_AVAILABLE:
+            values = np.fromiter((point["value"] for point in filtered_data), dtype=np.float64, count=len(filtered_data))
+            avg_value = float(values.mean())
+            min_value = float(values.min())
+            max_value = float(values.max())
+            first_value = float(values[0])
+            last_value = float(values[-1])
+        else:
+            values = [point["value"] for point in filtered_data]
+            avg_value = sum(values) / len(values)
+            min_value = min(values)
+            max_value = max(values)
+            first_value = values[0]
+            last_value = values[-1]
         
         # トレンド分析
-        first_value = values[0]
-        last_value = values[-1]
         trend_direction = "steady"
         
         if last_value > first_value * 1.1:
@@ -275,23 +342,33 @@ class ResourceManager:
         
         return trend_data
     
-    def _determine_resource_status(self, memory_percent: float, cpu_percent: float, disk_percent: float) -> str:
+    def _threshold_flags(self, memory_percent: float, cpu_percent: float, disk_percent: float) -> int:
         """
-        リソース使用量に基づいたシステム状態を判断
+        各リソースの使用量を閾値と比較し、結果をビットフラグにまとめる
         """
-        if (memory_percent >= self.thresholds["memory_critical"] or
-            cpu_percent >= self.thresholds["cpu_critical"] or
-            disk_percent >= self.thresholds["storage_critical"]):
+        thresholds = self.thresholds
+        return (
+            (memory_percent >= thresholds["memory_critical"]) << 5 |
+            (cpu_percent >= thresholds["cpu_critical"]) << 4 |
+            (disk_percent >= thresholds["storage_critical"]) << 3 |
+            (memory_percent >= thresholds["memory_warning"]) << 2 |
+            (cpu_percent >= thresholds["cpu_warning"]) << 1 |
+            (disk_percent >= thresholds["storage_warning"])
+        )
+    
+    def _determine_resource_status(self, threshold_flags: int) -> str:
+        """
+        閾値判定のビットフラグに基づいたシステム状態を判断
+        """
+        if threshold_flags & _CRITICAL_MASK:
             return "critical"
         
-        if (memory_percent >= self.thresholds["memory_warning"] or
-            cpu_percent >= self.thresholds["cpu_warning"] or
-            disk_percent >= self.thresholds["storage_warning"]):
+        if threshold_flags & _WARNING_MASK:
             return "warning"
         
         return "normal"
     
-    def _log_resource_warnings(self, metrics: Dict[str, Any]) -> None:
+    def _log_resource_warnings(self, metrics: Dict[str, Any], threshold_flags: int) -> None:
         """
         リソース警告をログに記録
         """
@@ -300,31 +377,51 @@ class ResourceManager:
         
         if status == "critical":
             # 重大なリソース警告
-            if system["memory_usage_percent"] >= self.thresholds["memory_critical"]:
+            if threshold_flags & _MEMORY_CRITICAL:
                 self.logger.warning(f"CRITICAL: Memory usage at {system['memory_usage_percent']}%")
             
-            if system["cpu_usage_percent"] >= self.thresholds["cpu_critical"]:
+            if threshold_flags & _CPU_CRITICAL:
                 self.logger.warning(f"CRITICAL: CPU usage at {system['cpu_usage_percent']}%")
             
-            if system["disk_usage_percent"] >= self.thresholds["storage_critical"]:
+            if threshold_flags & _DISK_CRITICAL:
                 self.logger.warning(f"CRITICAL: Disk usage at {system['disk_usage_percent']}%")
         
         elif status == "warning":
             # 警告レベルのリソース状態
-            if system["memory_usage_percent"] >= self.thresholds["memory_warning"]:
+            if threshold_flags & _MEMORY_WARNING:
                 self.logger.info(f"WARNING: Memory usage at {system['memory_usage_percent']}%")
             
-            if system["cpu_usage_percent"] >= self.thresholds["cpu_warning"]:
+            if threshold_flags & _CPU_WARNING:
                 self.logger.info(f"WARNING: CPU usage at {system['cpu_usage_percent']}%")
             
-            if system["disk_usage_percent"] >= self.thresholds["storage_warning"]:
+            if threshold_flags & _DISK_WARNING:
                 self.logger.info(f"WARNING: Disk usage at {system['disk_usage_percent']}%")
     
     def _prioritize_tasks(self, tasks: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
         """
         タスクの優先順位付け
+        
+        優先度はコンポーネントとタグだけで決まるため、それらと優先度設定の組が
+        前回までと同じなら、計算済みの並び順と優先度を再利用する。
         """
+        try:
+            signature = (
+                tuple(self.component_priorities.items()),
+                tuple((task.get("component", ""), tuple(task.get("tags", []))) for task in tasks)
+            )
+            cached = self._priority_cache.get(signature)
+        except TypeError:
+            # タグがハッシュできない場合はキャッシュを使わない
+            signature = cached = None
+        
+        if cached is not None:
+            order, priorities = cached
+            for task, priority in zip(tasks, priorities):
+                task["calculated_priority"] = priority
+            return [tasks[i] for i in order]
+        
         # まず安全性関連タスクを優先
+        priorities = []
         for task in tasks:
             component = task.get("component", "")
             priority = self.component_priorities.get(component, 1)
@@ -338,123 +435,84 @@ class ResourceManager:
                 priority += 3
             
             task["calculated_priority"] = priority
+            priorities.append(priority)
+        
+        # 優先度でソート（優先度は小さな整数なので、優先度ごとのバケットに振り分けて
+        # 高い方から連結する。同じ優先度内では元の順序を保つ）
+        if priorities and all(type(priority) is int and priority >= 0 for priority in priorities):
+            buckets = [[] for _ in range(max(priorities) + 1)]
+            for i, priority in enumerate(priorities):
+                buckets[priority].append(i)
+            order = [i for bucket in reversed(buckets) for i in bucket]
+        else:
+            order = sorted(range(len(tasks)), key=priorities.__getitem__, reverse=True)
         
-        # 優先度でソート
-        prioritized = sorted(tasks, key=lambda t: t.get("calculated_priority", 0), reverse=True)
-        return prioritized
-    
-    def _critical_allocation(self, prioritized_tasks: List[Dict[str, Any]], metrics: Dict[str, Any]) -> Dict[str, Any]:
-        """
-        リソースが危機的状況での割り当て戦略
-        """
-        # 緊急節約モード - 最小限のリソースを割り当て
-        allocation = {
-            "memory": {},
-            "cpu": {},
-            "tasks": {},
-            "recommendations": [
-                "非重要タスクを一時停止",
-                "不要なコンポーネントをシャットダウン",
-                "データキャッシュをクリア"
-            ]
-        }
+        if signature is not None:
+            if len(self._priority_cache) >= _PRIORITY_CACHE_SIZE:
+                # 最も古いエントリを削除
+                del self._priority_cache[next(iter(self._priority_cache))]
+            self._priority_cache[signature] = (order, priorities)
         
-        # 安全性関連タスクのみに十分なリソースを割り当て
-        for task in prioritized_tasks:
-            component = task.get("component", "")
-            
-            if "safety" in task.get("tags", []) or component == "safety_filter":
-                # 安全性コンポーネントには必要なリソースを確保
-                allocation["memory"][component] = task.get("memory_required", 50)  # MB
-                allocation["cpu"][component] = task.get("cpu_required", 10)  # パーセント
-                allocation["tasks"][task.get("id", "unknown")] = "active"
-            else:
-                # その他は最小限または一時停止
-                allocation["memory"][component] = min(task.get("memory_required", 50) * 0.5, 25)  # MB
-                allocation["cpu"][component] = min(task.get("cpu_required", 10) * 0.5, 5)  # パーセント
-                allocation["tasks"][task.get("id", "unknown")] = "suspended" if component != "self_preservation" else "active"
-        
-        return allocation
+        return [tasks[i] for i in order]
     
-    def _warning_allocation(self, prioritized_tasks: List[Dict[str, Any]], metrics: Dict[str, Any]) -> Dict[str, Any]:
+    def _allocate(self, prioritized_tasks: List[Dict[str, Any]], status: str) -> Dict[str, Any]:
         """
-        リソースが警告状態での割り当て戦略
+        システム状態に応じた割り当て方針に従って、タスクを1回走査してリソースを割り当てる
+        
+        - critical: 安全性関連タスクのみ要求通り、その他は縮小して一時停止
+        - warning: 優先度でスケーリングし、残りリソースの範囲で割り当て
+        - normal: すべてのタスクに要求通り割り当て
         """
-        # 省エネモード - 重要タスクを優先
-        allocation = {
-            "memory": {},
-            "cpu": {},
-            "tasks": {},
-            "recommendations": [
-                "低優先度タスクを延期",
-                "メモリ使用量の多いプロセスを最適化",
-                "一時データをクリーンアップ"
-            ]
-        }
+        reduction, memory_cap, cpu_cap, budget, recommendations = _ALLOCATION_POLICIES[status]
         
-        # 優先度に応じたリソース割り当て
-        remaining_memory = 100  # 単位はここでは重要でない（相対的な配分）
-        remaining_cpu = 100
+        memory_allocation = {}
+        cpu_allocation = {}
+        task_states = {}
+        remaining_memory = remaining_cpu = budget
         
         for task in prioritized_tasks:
             component = task.get("component", "")
-            priority = task.get("calculated_priority", 1)
+            task_id = task.get("id", "unknown")
             
-            # 必要なリソース
-            memory_required = task.get("memory_required", 50)
-            cpu_required = task.get("cpu_required", 10)
+            # 必要なリソース（実際のシステムでは動的に計算）
+            memory = task.get("memory_required", 50)  # MB
+            cpu = task.get("cpu_required", 10)  # パーセント
+            state = "active"
             
-            # 優先度に基づいたスケーリング
-            memory_scaled = memory_required * min(priority / 5, 1)
-            cpu_scaled = cpu_required * min(priority / 5, 1)
+            if reduction is not None:
+                # 緊急節約モード - 安全性コンポーネント以外は最小限にして一時停止
+                if not ("safety" in task.get("tags", []) or component == "safety_filter"):
+                    memory = min(memory * reduction, memory_cap)
+                    cpu = min(cpu * reduction, cpu_cap)
+                    if component != "self_preservation":
+                        state = "suspended"
             
-            # 残りリソースの確認
-            if remaining_memory >= memory_scaled and remaining_cpu >= cpu_scaled:
-                allocation["memory"][component] = memory_scaled
-                allocation["cpu"][component] = cpu_scaled
-                allocation["tasks"][task.get("id", "unknown")] = "active"
+            elif budget is not None:
+                # 省エネモード - 優先度に基づいてスケーリングし、残りリソースから割り当て
+                priority = task.get("calculated_priority", 1)
+                scale = min(priority / 5, 1)
+                memory *= scale
+                cpu *= scale
                 
-                remaining_memory -= memory_scaled
-                remaining_cpu -= cpu_scaled
-            else:
-                # リソース不足の場合
-                if priority >= 7:  # 高優先度タスク
-                    allocation["memory"][component] = min(memory_scaled, remaining_memory)
-                    allocation["cpu"][component] = min(cpu_scaled, remaining_cpu)
-                    allocation["tasks"][task.get("id", "unknown")] = "active"
-                    
-                    remaining_memory -= allocation["memory"][component]
-                    remaining_cpu -= allocation["cpu"][component]
-                else:
-                    # 低優先度タスクは待機状態に
-                    allocation["memory"][component] = 0
-                    allocation["cpu"][component] = 0
-                    allocation["tasks"][task.get("id", "unknown")] = "waiting"
-        
-        return allocation
-    
-    def _normal_allocation(self, prioritized_tasks: List[Dict[str, Any]], metrics: Dict[str, Any]) -> Dict[str, Any]:
-        """
-        通常状態でのリソース割り当て戦略
-        """
-        # 通常割り当て - すべてのタスクに十分なリソースを提供
-        allocation = {
-            "memory": {},
-            "cpu": {},
-            "tasks": {},
-            "recommendations": []
-        }
-        
-        for task in prioritized_tasks:
-            component = task.get("component", "")
-            
-            # 必要なリソース（実際のシステムでは動的に計算）
-            memory_required = task.get("memory_required", 50)
-            cpu_required = task.get("cpu_required", 10)
+                if remaining_memory < memory or remaining_cpu < cpu:
+                    # リソース不足の場合、高優先度タスクのみ残りを割り当て
+                    if priority >= 7:
+                        memory = min(memory, remaining_memory)
+                        cpu = min(cpu, remaining_cpu)
+                    else:
+                        memory = cpu = 0
+                        state = "waiting"
+                
+                remaining_memory -= memory
+                remaining_cpu -= cpu
             
-            # 通常モードでは要求通りに割り当て
-            allocation["memory"][component] = memory_required
-            allocation["cpu"][component] = cpu_required
-            allocation["tasks"][task.get("id", "unknown")] = "active"
-        
-        return allocation
+            memory_allocation[component] = memory
+            cpu_allocation[component] = cpu
+            task_states[task_id] = state
+        
+        return {
+            "memory": memory_allocation,
+            "cpu": cpu_allocation,
+            "tasks": task_states,
+            "recommendations": list(recommendations)
+        }
@@ -11,6 +11,8 @@ import logging
 import json
 import argparse
 import time
+import queue
+import threading
 from datetime import datetime
 
 # Windows環境での文字コード問題に対応
@@ -25,6 +27,7 @@ if sys.platform == 'win32':
             sys.stderr.reconfigure(encoding='utf-8')
 
 from autonomous_ai import AutonomousAI
+from console import clear_screen
 
 def setup_logging(debug=False):
     """ロギングの設定"""
@@ -39,9 +42,29 @@ def setup_logging(debug=False):
     )
     return logging.getLogger("main")
 
-def clear_screen():
-    """画面クリア"""
-    os.system('cls' if os.name == 'nt' else 'clear')
+def write_config(config_path, config):
+    """設定ファイルを一時ファイル経由で置き換え、書き込み途中の破損を防ぐ"""
+    tmp_path = config_path + ".tmp"
+    with open(tmp_path, "w", encoding='utf-8') as f:
+        json.dump(config, f, ensure_ascii=False, indent=2)
+    os.replace(tmp_path, config_path)
+
+def start_input_reader():
+    """
+    標準入力を読み取るデーモンスレッドを開始
+    
+    入力は1行ずつキューに積まれ、入力の終端ではNoneが積まれる。
+    メインスレッドは入力待ちでブロックされずに定期処理を行える。
+    """
+    input_queue = queue.Queue()
+    
+    def read_lines():
+        for line in iter(sys.stdin.readline, ""):
+            input_queue.put(line.rstrip("\n"))
+        input_queue.put(None)
+    
+    threading.Thread(target=read_lines, daemon=True).start()
+    return input_queue
 
 def print_header():
     """ヘッダー表示"""
@@ -79,12 +102,10 @@ def main():
                 config = json.load(f)
                 
             # 自律モードの設定を更新（コマンドライン引数が優先）
-            if args.no_auto:
+            # 設定が変わった場合のみ設定ファイルに書き戻す
+            if args.no_auto and config.get("autonomous_mode") is not False:
                 config["autonomous_mode"] = False
-                
-            # 設定ファイルに書き戻し
-            with open(args.config, "w", encoding='utf-8') as f:
-                json.dump(config, f, ensure_ascii=False, indent=2)
+                write_config(args.config, config)
                 
         except Exception as e:
             logger.error(f"Failed to load/update config: {str(e)}")
@@ -96,8 +117,7 @@ def main():
             }
             
             # 新しい設定ファイルを作成
-            with open(args.config, "w", encoding='utf-8') as f:
-                json.dump(config, f, ensure_ascii=False, indent=2)
+            write_config(args.config, config)
         
         # 自律AIの初期化
         ai = AutonomousAI(config_path=args.config)
@@ -109,13 +129,28 @@ def main():
         clear_screen()
         print_header()
         
+        input_queue = start_input_reader()
+        
         session_active = True
+        prompt_shown = False
         while session_active:
             # ユーザー入力を取得
-            user_input = input("\nあなた > ")
+            if not prompt_shown:
+                print("\nあなた > ", end="", flush=True)
+                prompt_shown = True
+            
+            try:
+                user_input = input_queue.get(timeout=0.25)
+            except queue.Empty:
+                # 入力待ちの間に定期処理を行う（自律スレッドが動いていない場合のみ）
+                if not ai.autonomous_active:
+                    ai.save_state_if_due()
+                continue
+            
+            prompt_shown = False
             
-            # 終了コマンドのチェック
-            if user_input.lower() in ["exit", "quit"]:
+            # 終了コマンドのチェック（入力の終端も終了として扱う）
+            if user_input is None or user_input.lower() in ["exit", "quit"]:
                 print("\nシステムを終了します。ご利用ありがとうございました。")
                 ai.stop()
                 session_active = False
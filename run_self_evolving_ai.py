@@ -6,6 +6,7 @@ import argparse
 from datetime import datetime
 
 from self_evolving_ai import SelfEvolvingAI
+from console import clear_screen
 
 def setup_logging():
     """Set up logging configuration"""
@@ -19,10 +20,6 @@ def setup_logging():
     )
     return logging.getLogger("run_script")
 
-def clear_screen():
-    """Clear the console screen."""
-    os.system('cls' if os.name == 'nt' else 'clear')
-
 def print_header():
     """Print application header."""
     print("=" * 80)
@@ -39,45 +36,49 @@ def print_header():
 def show_system_status(ai):
     """Display system status"""
     status = ai.get_system_status()
+    # 全行をまとめてから一度に書き出す
+    lines = []
     
-    print("\n" + "=" * 50)
-    print("システム状態".center(50))
-    print("=" * 50)
+    lines.append("\n" + "=" * 50)
+    lines.append("システム状態".center(50))
+    lines.append("=" * 50)
     
     # 基本情報
-    print(f"\n基本情報:")
-    print(f"  状態: {status['system_state']['status']}")
-    print(f"  開始時刻: {status['system_state']['started_at']}")
-    print(f"  実行時間: {status['uptime_seconds']:.1f}秒")
-    print(f"  進化サイクル: {status['evolution_cycles_completed']}回")
+    lines.append(f"\n基本情報:")
+    lines.append(f"  状態: {status['system_state']['status']}")
+    lines.append(f"  開始時刻: {status['system_state']['started_at']}")
+    lines.append(f"  実行時間: {status['uptime_seconds']:.1f}秒")
+    lines.append(f"  進化サイクル: {status['evolution_cycles_completed']}回")
     
     # 健全性情報
-    print(f"\n健全性情報:")
-    print(f"  健全性スコア: {status['health']['health_score']}")
-    print(f"  状態: {status['health']['status']}")
-    print(f"  エラーコンポーネント: {len(status['health']['error_components'])}")
+    lines.append(f"\n健全性情報:")
+    lines.append(f"  健全性スコア: {status['health']['health_score']}")
+    lines.append(f"  状態: {status['health']['status']}")
+    lines.append(f"  エラーコンポーネント: {len(status['health']['error_components'])}")
     
     # リソース情報
-    print(f"\nリソース情報:")
-    print(f"  メモリ使用率: {status['resources']['system']['memory_usage_percent']}%")
-    print(f"  CPU使用率: {status['resources']['system']['cpu_usage_percent']}%")
+    lines.append(f"\nリソース情報:")
+    lines.append(f"  メモリ使用率: {status['resources']['system']['memory_usage_percent']}%")
+    lines.append(f"  CPU使用率: {status['resources']['system']['cpu_usage_percent']}%")
     
     # 目標と最適化
-    print(f"\n目標と最適化:")
-    print(f"  アクティブな目標: {status['active_goals']}個")
-    print(f"  アクティブな最適化: {status['active_optimizations']}個")
-    print(f"  完了した目標: {status['system_state']['goals_completed']}個")
+    lines.append(f"\n目標と最適化:")
+    lines.append(f"  アクティブな目標: {status['active_goals']}個")
+    lines.append(f"  アクティブな最適化: {status['active_optimizations']}個")
+    lines.append(f"  完了した目標: {status['system_state']['goals_completed']}個")
     
     # 知識ベース情報
     kb_stats = ai.get_knowledge_stats()
-    print(f"\n知識ベース:")
-    print(f"  事実: {kb_stats['facts_count']}項目")
-    print(f"  概念: {kb_stats['concepts_count']}項目")
-    print(f"  方法: {kb_stats['methods_count']}項目")
-    print(f"  関係: {kb_stats['relations_count']}項目")
-    print(f"  合計: {kb_stats['total_items']}項目")
+    lines.append(f"\n知識ベース:")
+    lines.append(f"  事実: {kb_stats['facts_count']}項目")
+    lines.append(f"  概念: {kb_stats['concepts_count']}項目")
+    lines.append(f"  方法: {kb_stats['methods_count']}項目")
+    lines.append(f"  関係: {kb_stats['relations_count']}項目")
+    lines.append(f"  合計: {kb_stats['total_items']}項目")
     
-    print("\n" + "=" * 50)
+    lines.append("\n" + "=" * 50)
+    
+    sys.stdout.write("\n".join(lines) + "\n")
 
 def run_evolution_cycle(ai):
     """Run an evolution cycle"""
@@ -112,6 +113,13 @@ def show_help():
     print("  /exit または quit - プログラムを終了")
     print("\n" + "=" * 50)
 
+# 完全一致の特殊コマンドとその処理（いずれもAIインスタンスを受け取る）
+COMMAND_HANDLERS = {
+    "/status": show_system_status,
+    "/evolve": run_evolution_cycle,
+    "/help": lambda ai: show_help()
+}
+
 def main():
     """Main function to run the Self-Evolving AI"""
     logger = setup_logging()
@@ -147,8 +155,10 @@ def main():
             # ユーザー入力を取得
             user_input = input("\nあなた > ")
             
+            cmd_lower = user_input.lower()
+            
             # 終了コマンドのチェック
-            if user_input.lower() in ["exit", "quit"]:
+            if cmd_lower in ("exit", "quit"):
                 print("\nシステムを終了します。ご利用ありがとうございました。")
                 ai.stop()
                 session_active = False
@@ -156,20 +166,13 @@ def main():
             
             # 特殊コマンドのチェック
             if user_input.startswith("/"):
-                if user_input.lower() == "/status":
-                    show_system_status(ai)
-                    continue
-                    
-                elif user_input.lower() == "/evolve":
-                    run_evolution_cycle(ai)
-                    continue
-                    
-                elif user_input.lower() == "/help":
-                    show_help()
+                handler = COMMAND_HANDLERS.get(cmd_lower)
+                if handler:
+                    handler(ai)
                     continue
                     
                 # 検索コマンドの処理
-                elif user_input.lower().startswith("/search:"):
+                if cmd_lower.startswith("/search:"):
                     query = user_input[8:].strip()
                     if query:
                         print(f"\n「{query}」について検索しています...")
@@ -33,6 +33,11 @@ def run_tests():
     test_modules = [
         'test_goal_manager',
         'test_self_feedback',
+        'test_knowledge_base',
+        'test_goal_system',
+        'test_learning',
+        'test_process_optimizer',
+        'test_planning',
         # 他のテストモジュールを追加
     ]
     
@@ -99,6 +99,66 @@ class TestGoalManager(unittest.TestCase):
         self.assertEqual(self.goal_manager.goal_history[1]["previous"], 0)
         self.assertEqual(self.goal_manager.goal_history[1]["current"], 50)
     
+    def test_progress_snapshot(self):
+        """進捗スナップショットが登録順の値を返すことを確認"""
+        goal_id1 = self.goal_manager.set_goal("knowledge_base", "目標1", 2)
+        goal_id2 = self.goal_manager.set_goal("response_quality", "目標2", 4)
+        
+        self.goal_manager.update_goal_progress(goal_id2, 150)
+        self.goal_manager.update_goal_progress(goal_id1, 30.7)
+        
+        self.assertEqual(list(self.goal_manager.progress_snapshot()), [30, 100])
+        
+        # スナップショット取得後も目標を追加できることを確認
+        self.goal_manager.set_goal("reasoning_process", "目標3", 1)
+        self.assertEqual(len(self.goal_manager.progress), 3)
+    
+    def test_dump_history(self):
+        """履歴の書き出しと差分追記のテスト"""
+        import tempfile
+        goal_id = self.goal_manager.set_goal("knowledge_base", "履歴テスト", 2)
+        
+        with tempfile.TemporaryDirectory() as tmp_dir:
+            path = os.path.join(tmp_dir, "history.jsonl")
+            self.assertEqual(self.goal_manager.dump_history(path), 1)
+            
+            self.goal_manager.update_goal_progress(goal_id, 40)
+            next_index = self.goal_manager.dump_history_since(path, 1)
+            self.assertEqual(next_index, 2)
+            
+            # 新規分がない場合は何も追記されない
+            self.assertEqual(self.goal_manager.dump_history_since(path, next_index), 2)
+            
+            with open(path, "r", encoding="utf-8") as f:
+                entries = [json.loads(line) for line in f]
+        
+        self.assertEqual([e["event"] for e in entries], ["goal_created", "progress_updated"])
+        self.assertEqual(entries[1]["current"], 40)
+    
+    def test_history_by_event(self):
+        """イベント種別ごとの履歴取得と上限のテスト"""
+        goal_id = self.goal_manager.set_goal("knowledge_base", "履歴テスト", 2)
+        for progress in (10, 20, 30):
+            self.goal_manager.update_goal_progress(goal_id, progress)
+        
+        updates = self.goal_manager.get_history_by_event("progress_updated")
+        self.assertEqual([e["current"] for e in updates], [10, 20, 30])
+        self.assertEqual(self.goal_manager.get_history_by_event("goal_completed"), [])
+        
+        # 全体ビューは発生順に並ぶ
+        events = [e["event"] for e in self.goal_manager.goal_history]
+        self.assertEqual(events, ["goal_created"] + ["progress_updated"] * 3)
+        
+        # 上限を超えた古いエントリは破棄される
+        self.mock_config["self_improvement"]["history_max"] = 2
+        with patch('builtins.open', unittest.mock.mock_open(read_data=json.dumps(self.mock_config))):
+            bounded_manager = GoalManager()
+        goal_id = bounded_manager.set_goal("knowledge_base", "上限テスト", 2)
+        for progress in (10, 20, 30):
+            bounded_manager.update_goal_progress(goal_id, progress)
+        updates = bounded_manager.get_history_by_event("progress_updated")
+        self.assertEqual([e["current"] for e in updates], [20, 30])
+    
     def test_goal_completion(self):
         """目標完了処理のテスト"""
         # 目標を設定
@@ -0,0 +1,158 @@
+import sys
+import os
+import gc
+import json
+import weakref
+import shutil
+import tempfile
+import unittest
+from unittest.mock import patch
+
+# テスト対象のモジュールへのパスを追加
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from goal_system import GoalSystem
+
+class TestGoalSystem(unittest.TestCase):
+    """GoalSystemのテストクラス"""
+    
+    def setUp(self):
+        """テスト前の準備（一時ディレクトリに設定ファイルとデータファイルを配置）"""
+        self.temp_dir = tempfile.mkdtemp()
+        self.data_file = os.path.join(self.temp_dir, "goals_data.json")
+        self.config_path = os.path.join(self.temp_dir, "config.json")
+        with open(self.config_path, "w", encoding="utf-8") as f:
+            json.dump({"goals": {"data_file": self.data_file, "review_interval_hours": 0}}, f)
+    
+    def tearDown(self):
+        """テスト後のクリーンアップ"""
+        shutil.rmtree(self.temp_dir)
+    
+    def _write_goals(self, goals, completed_goals=()):
+        """データファイルに目標データを書き込む"""
+        with open(self.data_file, "w", encoding="utf-8") as f:
+            json.dump({"goals": list(goals), "completed_goals": list(completed_goals)}, f, ensure_ascii=False)
+    
+    @staticmethod
+    def _has_optimization_suggestion(goal_system):
+        return any(s["type"] == "optimization" for s in goal_system.suggest_new_goals())
+    
+    def test_load_goals_without_valid_created_at(self):
+        """作成日時が無い・不正な最適化目標を含むデータでも初期化できることを確認"""
+        self._write_goals([
+            {"id": "goal_a", "description": "作成日時なし", "type": "optimization"},
+            {"id": "goal_b", "description": "不正な作成日時", "type": "optimization", "created_at": "yesterday"}
+        ])
+        
+        goal_system = GoalSystem(config_path=self.config_path)
+        
+        self.assertEqual(len(goal_system.goals), 2)
+        self.assertTrue(self._has_optimization_suggestion(goal_system))
+    
+    def test_optimization_suggestion_after_removed_goal(self):
+        """本日作成した最適化目標がレビューで削除されると再び提案されることを確認"""
+        goal_system = GoalSystem(config_path=self.config_path)
+        goal = goal_system.set_goal("最適化", goal_type="optimization")
+        self.assertFalse(self._has_optimization_suggestion(goal_system))
+        
+        # 停滞した目標としてレビューで削除させる（自動追加は行わない）
+        goal["review_count"] = 5
+        with patch("goal_system.random.random", return_value=1.0):
+            result = goal_system.review_goals()
+        
+        self.assertEqual(result["results"]["removed_goals"], 1)
+        self.assertTrue(self._has_optimization_suggestion(goal_system))
+    
+    def test_completed_optimization_goal_still_counts(self):
+        """完了した最適化目標は当日の作成済みとして扱われることを確認"""
+        goal_system = GoalSystem(config_path=self.config_path)
+        goal = goal_system.set_goal("最適化", goal_type="optimization")
+        goal_system.update_progress(goal["id"], 100)
+        
+        self.assertIn(goal, goal_system.completed_goals)
+        self.assertFalse(self._has_optimization_suggestion(goal_system))
+    
+    def test_discarded_instance_is_not_kept_alive(self):
+        """終了時の保存処理の登録がインスタンスを保持し続けないことを確認"""
+        goal_system = GoalSystem(config_path=self.config_path)
+        ref = weakref.ref(goal_system)
+        del goal_system
+        gc.collect()
+        
+        self.assertIsNone(ref())
+    
+    def test_close_flushes_pending_changes(self):
+        """close()がバッチ中に溜まった変更を書き出すことを確認"""
+        goal_system = GoalSystem(config_path=self.config_path)
+        goal_system._suppress_save += 1
+        goal_system.set_goal("保存待ちの目標")
+        self.assertFalse(os.path.exists(self.data_file))
+        
+        goal_system._suppress_save -= 1
+        goal_system.close()
+        
+        with open(self.data_file, encoding="utf-8") as f:
+            self.assertEqual(json.load(f)["goals"][0]["description"], "保存待ちの目標")
+    
+    def test_completion_removes_only_the_completed_goal(self):
+        """完了した目標だけがアクティブ目標と優先度バケットから除かれることを確認"""
+        goal_system = GoalSystem(config_path=self.config_path)
+        goals = [goal_system.set_goal(f"目標{i}", priority=4) for i in range(3)]
+        
+        goal_system.update_progress(goals[1]["id"], 100)
+        
+        self.assertEqual([g["id"] for g in goal_system.goals], [goals[0]["id"], goals[2]["id"]])
+        self.assertEqual([g["id"] for g in goal_system._by_priority[4]], [goals[0]["id"], goals[2]["id"]])
+        self.assertIs(goal_system.get_goal(goals[1]["id"]), goal_system.completed_goals[-1])
+    
+    def test_batched_writes_once(self):
+        """batched()内の複数の変更が終了時に一度だけ書き出されることを確認"""
+        goal_system = GoalSystem(config_path=self.config_path)
+        
+        with patch.object(goal_system, "_write_data", wraps=goal_system._write_data) as write_data:
+            with goal_system.batched():
+                for i in range(3):
+                    goal_system.set_goal(f"目標{i}")
+                self.assertEqual(write_data.call_count, 0)
+        
+        self.assertEqual(write_data.call_count, 1)
+        with open(self.data_file, encoding="utf-8") as f:
+            self.assertEqual(len(json.load(f)["goals"]), 3)
+    
+    def test_failed_save_keeps_previous_file(self):
+        """保存に失敗しても以前のデータファイルが壊れず、一時ファイルも残らないことを確認"""
+        goal_system = GoalSystem(config_path=self.config_path)
+        goal_system.set_goal("保存済みの目標")
+        
+        goal_system.goals[0]["deadline"] = object()  # シリアライズできない値
+        goal_system._save_data()
+        
+        with open(self.data_file, encoding="utf-8") as f:
+            self.assertEqual(json.load(f)["goals"][0]["description"], "保存済みの目標")
+        self.assertFalse(os.path.exists(self.data_file + ".tmp"))
+        self.assertTrue(goal_system._dirty)
+        
+        # 読み込み直すと保存済みの内容が復元される
+        goal_system.goals[0]["deadline"] = None
+        goal_system.close()
+        reloaded = GoalSystem(config_path=self.config_path)
+        self.assertEqual([g["description"] for g in reloaded.goals], ["保存済みの目標"])
+    
+    def test_add_dependency_reuses_cached_set(self):
+        """依存関係の追加・重複チェックが同じ集合を使い回し、リストと一致することを確認"""
+        goal_system = GoalSystem(config_path=self.config_path)
+        first, second, third = (goal_system.set_goal(f"目標{i}") for i in range(3))
+        
+        self.assertTrue(goal_system.add_dependency(first["id"], second["id"]))
+        dependency_set = goal_system._dependency_sets[first["id"]]
+        
+        self.assertTrue(goal_system.add_dependency(first["id"], second["id"]))  # 重複は成功扱い
+        self.assertTrue(goal_system.add_dependency(first["id"], third["id"]))
+        self.assertFalse(goal_system.add_dependency(third["id"], first["id"]))  # 循環依存
+        
+        self.assertIs(goal_system._dependency_sets[first["id"]], dependency_set)
+        self.assertEqual(first["dependencies"], [second["id"], third["id"]])
+        self.assertEqual(dependency_set, {second["id"], third["id"]})
+
+if __name__ == '__main__':
+    unittest.main()
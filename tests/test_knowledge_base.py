@@ -0,0 +1,248 @@
+import sys
+import os
+import json
+import shutil
+import sqlite3
+import tempfile
+import unittest
+from unittest.mock import patch
+
+# テスト対象のモジュールへのパスを追加
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import knowledge_base
+from knowledge_base import KnowledgeBase, _INDEX_REBUILD_THRESHOLD
+
+class TestKnowledgeBase(unittest.TestCase):
+    """KnowledgeBaseのテストクラス"""
+    
+    def setUp(self):
+        """テスト前の準備（一時ディレクトリにDBを作成）"""
+        self.temp_dir = tempfile.mkdtemp()
+        self.db_path = os.path.join(self.temp_dir, "knowledge.db")
+        self.kb = KnowledgeBase(db_path=self.db_path, config_path=os.path.join(self.temp_dir, "missing.json"))
+    
+    def tearDown(self):
+        """テスト後のクリーンアップ"""
+        self.kb.close()
+        shutil.rmtree(self.temp_dir)
+    
+    def _index_names(self):
+        """facts テーブルのインデックス名の集合"""
+        cursor = self.kb._conn.execute("SELECT name FROM sqlite_master WHERE type='index' AND tbl_name='facts'")
+        return {row[0] for row in cursor.fetchall()}
+    
+    def _write_json(self, name, data):
+        """一時ディレクトリにJSONファイルを書き込む"""
+        path = os.path.join(self.temp_dir, name)
+        with open(path, "w", encoding="utf-8") as f:
+            json.dump(data, f, ensure_ascii=False)
+        return path
+    
+    def test_failed_bulk_import_keeps_index(self):
+        """大量インポートが失敗しても外したインデックスが復元されることを確認"""
+        facts = [{"content": f"fact {i}"} for i in range(_INDEX_REBUILD_THRESHOLD)]
+        facts.append({"content": {"not": "text"}})  # ハッシュ計算で失敗する内容
+        path = self._write_json("broken.json", {"facts": facts})
+        
+        result = self.kb.import_knowledge(path)
+        
+        self.assertEqual(result["status"], "error")
+        self.assertIn("idx_facts_category_conf", self._index_names())
+        self.assertEqual(self.kb.get_knowledge_stats()["facts_count"], 0)
+    
+    def test_legacy_db_with_duplicate_facts_opens(self):
+        """重複した事実を含む旧スキーマのDBを開くと重複がまとめられることを確認"""
+        legacy_path = os.path.join(self.temp_dir, "legacy.db")
+        conn = sqlite3.connect(legacy_path)
+        conn.execute('''
+        CREATE TABLE facts (
+            id INTEGER PRIMARY KEY AUTOINCREMENT,
+            content TEXT NOT NULL,
+            source TEXT,
+            confidence REAL DEFAULT 0.7,
+            created_at TEXT,
+            updated_at TEXT,
+            category TEXT DEFAULT 'general',
+            embedding_id INTEGER
+        )
+        ''')
+        conn.executemany(
+            "INSERT INTO facts (content, source) VALUES (?, ?)",
+            [("同じ内容", "first"), ("同じ内容", "second"), ("別の内容", "third")]
+        )
+        conn.execute('''
+        CREATE TABLE embeddings (
+            id INTEGER PRIMARY KEY AUTOINCREMENT,
+            vector BLOB,
+            created_at TEXT
+        )
+        ''')
+        conn.executemany("INSERT INTO embeddings (id, vector) VALUES (?, ?)", [(1, b""), (2, b""), (3, b"")])
+        conn.commit()
+        conn.close()
+        
+        legacy_kb = KnowledgeBase(db_path=legacy_path, config_path=os.path.join(self.temp_dir, "missing.json"))
+        try:
+            rows = legacy_kb._conn.execute("SELECT content, source FROM facts ORDER BY id").fetchall()
+            self.assertEqual([tuple(row) for row in rows], [("同じ内容", "first"), ("別の内容", "third")])
+            
+            # 削除した重複行の埋め込みも残らない
+            embedding_ids = legacy_kb._conn.execute("SELECT id FROM embeddings ORDER BY id").fetchall()
+            self.assertEqual([row[0] for row in embedding_ids], [1, 3])
+            
+            # 以降の重複は残した行のIDを返し、新しい行は作られない
+            self.assertEqual(legacy_kb.store_fact("同じ内容"), 1)
+            self.assertEqual(legacy_kb.get_knowledge_stats()["facts_count"], 2)
+        finally:
+            legacy_kb.close()
+    
+    def test_search_matches_any_keyword(self):
+        """検索はいずれかのキーワードを含む事実を返すことを確認"""
+        self.kb.store_fact("Python is a programming language")
+        self.kb.store_fact("Java runs on the JVM")
+        self.kb.store_fact("Cats are small animals")
+        
+        results = self.kb.search_knowledge("python java")
+        
+        contents = sorted(fact["content"] for fact in results["facts"])
+        self.assertEqual(contents, ["Java runs on the JVM", "Python is a programming language"])
+        self.assertEqual(results["total_results"], 2)
+    
+    def test_search_ranks_by_relevance(self):
+        """より多くのキーワードに一致する事実が信頼度に関係なく先に並ぶことを確認"""
+        self.kb.store_fact("Python tutorial for beginners", confidence=0.9)
+        self.kb.store_fact("Python and Java comparison guide", confidence=0.1)
+        
+        facts = self.kb.search_knowledge("python java")["facts"]
+        
+        self.assertEqual([fact["content"] for fact in facts],
+                         ["Python and Java comparison guide", "Python tutorial for beginners"])
+    
+    def test_search_reflects_updates_and_deletes(self):
+        """事実の更新・削除が全文検索インデックスに反映されることを確認"""
+        fact_id = self.kb.store_fact("Python is a programming language")
+        other_id = self.kb.store_fact("Python has dynamic typing")
+        
+        self.kb._conn.execute("UPDATE facts SET content=? WHERE id=?", ("Rust is a programming language", fact_id))
+        self.kb._conn.execute("DELETE FROM facts WHERE id=?", (other_id,))
+        self.kb._conn.commit()
+        
+        self.assertEqual(self.kb.search_knowledge("python")["facts"], [])
+        self.assertEqual([fact["id"] for fact in self.kb.search_knowledge("rust")["facts"]], [fact_id])
+    
+    def test_search_returns_concepts_and_relations(self):
+        """概念（定義を含む）と関係が検索結果に含まれることを確認"""
+        self.kb.store_concept("python", "A programming language",
+                              definitions=[{"content": "High-level language", "source": "docs"}])
+        self.kb.store_relation("python", "language", "is_a")
+        
+        results = self.kb.search_knowledge("python")
+        
+        self.assertEqual([c["name"] for c in results["concepts"]], ["python"])
+        self.assertEqual(results["concepts"][0]["definitions"],
+                         [{"content": "High-level language", "source": "docs", "confidence": 0.7}])
+        self.assertEqual([(r["source_name"], r["relation_type"], r["target_name"]) for r in results["relations"]],
+                         [("python", "is_a", "language")])
+    
+    def test_store_concept_keeps_description_on_empty_update(self):
+        """既存の概念を空の説明で保存しても説明とIDが保たれることを確認"""
+        concept_id = self.kb.store_concept("python", "A programming language")
+        
+        self.assertEqual(self.kb.store_concept("python"), concept_id)
+        self.assertEqual(self.kb.search_knowledge("python")["concepts"][0]["description"], "A programming language")
+    
+    def test_export_import_round_trip(self):
+        """エクスポートしたデータを別のDBにインポートすると同じ内容になることを確認"""
+        self.kb.store_fact("Python is a programming language", source="wiki", confidence=0.9, category="tech")
+        self.kb.store_fact("日本語の事実")
+        self.kb.store_concept("python", "A programming language",
+                              definitions=[{"content": "High-level language", "source": "docs", "confidence": 0.8}])
+        self.kb.store_relation("python", "language", "is_a", description="classification")
+        
+        export_path = os.path.join(self.temp_dir, "export.json")
+        self.assertTrue(self.kb.export_knowledge(export_path))
+        
+        with open(export_path, encoding="utf-8") as f:
+            exported = json.load(f)
+        self.assertEqual(exported["metadata"]["facts_count"], 2)
+        self.assertEqual(exported["metadata"]["concepts_count"], 2)
+        self.assertEqual(exported["metadata"]["relations_count"], 1)
+        
+        other = KnowledgeBase(db_path=os.path.join(self.temp_dir, "other.db"),
+                              config_path=os.path.join(self.temp_dir, "missing.json"))
+        try:
+            result = other.import_knowledge(export_path)
+            self.assertEqual(result["status"], "success")
+            
+            def snapshot(kb):
+                facts = kb._conn.execute("SELECT content, source, confidence, category FROM facts ORDER BY content")
+                concepts = kb._conn.execute("SELECT name, description FROM concepts ORDER BY name")
+                definitions = kb._conn.execute(
+                    "SELECT c.name, d.definition, d.source, d.confidence FROM concept_definitions d "
+                    "JOIN concepts c ON c.id = d.concept_id ORDER BY d.id")
+                relations = kb._conn.execute(
+                    "SELECT sc.name, r.relation_type, tc.name, r.description FROM relations r "
+                    "JOIN concepts sc ON sc.id = r.source_concept_id JOIN concepts tc ON tc.id = r.target_concept_id")
+                return [[tuple(row) for row in cursor.fetchall()] for cursor in (facts, concepts, definitions, relations)]
+            
+            self.assertEqual(snapshot(other), snapshot(self.kb))
+            
+            # 同じデータを再インポートしても事実と概念は重複しない
+            other.import_knowledge(export_path)
+            stats = other.get_knowledge_stats()
+            self.assertEqual((stats["facts_count"], stats["concepts_count"]), (2, 2))
+            self.assertEqual(other.search_knowledge("python")["facts"][0]["content"], "Python is a programming language")
+        finally:
+            other.close()
+    
+    def test_search_by_embedding_orders_by_distance(self):
+        """埋め込みの近傍検索が距離の昇順で事実を返し、再保存で置き換わることを確認"""
+        config_path = os.path.join(self.temp_dir, "embedding_config.json")
+        with open(config_path, "w", encoding="utf-8") as f:
+            json.dump({"embedding_dim": 3}, f)
+        kb = KnowledgeBase(db_path=os.path.join(self.temp_dir, "embedding.db"), config_path=config_path)
+        try:
+            near_id = kb.store_fact("near")
+            far_id = kb.store_fact("far")
+            self.assertTrue(kb.store_embedding(near_id, [1.0, 0.1, 0.0]))
+            self.assertTrue(kb.store_embedding(far_id, [0.0, 0.0, 1.0]))
+            self.assertFalse(kb.store_embedding(far_id, [1.0, 0.0]))  # 次元数の不一致
+            
+            results = kb.search_by_embedding([1.0, 0.0, 0.0], k=2)
+            self.assertEqual([r["id"] for r in results], [near_id, far_id])
+            self.assertLess(results[0]["distance"], results[1]["distance"])
+            
+            # 既存の埋め込みは置き換えられる
+            kb.store_embedding(far_id, [1.0, 0.0, 0.0])
+            self.assertEqual([r["id"] for r in kb.search_by_embedding([1.0, 0.0, 0.0], k=1)], [far_id])
+        finally:
+            kb.close()
+    
+    def test_store_concept_without_returning_support(self):
+        """RETURNING句が使えない古いSQLiteでも概念の保存・更新ができることを確認"""
+        with patch.object(knowledge_base, "_SQLITE_SUPPORTS_RETURNING", False):
+            concept_id = self.kb.store_concept("python", "A programming language")
+            other_id = self.kb.store_concept("java")
+            
+            self.assertGreater(concept_id, 0)
+            self.assertNotEqual(other_id, concept_id)
+            self.assertEqual(self.kb.store_concept("python"), concept_id)
+            self.assertEqual(self.kb.store_concept("python", "A snake"), concept_id)
+        
+        self.assertEqual(self.kb.search_knowledge("python")["concepts"][0]["description"], "A snake")
+    
+    def test_store_fact_without_returning_support(self):
+        """RETURNING句が使えない古いSQLiteでも事実の保存と重複排除ができることを確認"""
+        with patch.object(knowledge_base, "_SQLITE_SUPPORTS_RETURNING", False):
+            fact_id = self.kb.store_fact("Python is a programming language")
+            other_id = self.kb.store_fact("Java is a programming language")
+            self.kb._fact_id_cache.clear()
+            duplicate_id = self.kb.store_fact("Python is a programming language")
+        
+        self.assertNotEqual(other_id, fact_id)
+        self.assertEqual(duplicate_id, fact_id)
+        self.assertEqual(self.kb._conn.execute("SELECT COUNT(*) FROM facts").fetchone()[0], 2)
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,103 @@
+import sys
+import os
+import random
+import unittest
+
+# テスト対象のモジュールへのパスを追加
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from learning import LearningManager
+
+class TestLearningManager(unittest.TestCase):
+    """LearningManagerのテストクラス"""
+    
+    def setUp(self):
+        """テスト前の準備"""
+        self.learning_manager = LearningManager({"enabled": True})
+    
+    def test_suggestions_are_independent_copies(self):
+        """返された提案を変更しても他の呼び出し・インスタンスに影響しないことを確認"""
+        for _ in range(4):
+            self.learning_manager.process_feedback("this is wrong")
+        
+        suggestions = self.learning_manager.get_improvement_suggestions()
+        self.assertEqual([s["area"] for s in suggestions], ["response_quality", "knowledge_base"])
+        for suggestion in suggestions:
+            suggestion["priority"] = "low"
+        
+        # キャッシュからの再取得と別インスタンスの両方で元の値が保たれる
+        self.assertEqual(self.learning_manager.get_improvement_suggestions()[0]["priority"], "high")
+        other = LearningManager({"enabled": True})
+        self.assertEqual(other.get_improvement_suggestions()[0]["priority"], "medium")
+    
+    def test_sentiment_counts_whole_tokens(self):
+        """感情語は単語単位で数え、部分一致（dislike中のlike）は数えないことを確認"""
+        analyze = self.learning_manager._analyze_sentiment
+        
+        self.assertEqual(analyze("i dislike this"), -1.0)
+        self.assertEqual(analyze("i like this"), 1.0)
+        self.assertEqual(analyze("likely unlikeable"), 0.0)
+        self.assertEqual(analyze("good but wrong"), 0.0)
+    
+    def test_sentiment_counts_repeated_words_once(self):
+        """同じ感情語の繰り返しは1回として数えることを確認"""
+        analyze = self.learning_manager._analyze_sentiment
+        
+        self.assertEqual(analyze("good good good, but bad"), 0.0)
+        self.assertAlmostEqual(analyze("great, helpful... but wrong wrong wrong"), 1 / 3)
+    
+    def test_sentiment_ascii_and_unicode_paths_agree(self):
+        """ASCIIの高速経路と正規表現の経路が同じ結果になることを確認"""
+        analyze = self.learning_manager._analyze_sentiment
+        samples = [
+            "thanks!!! (great) answer",
+            "bad_answer is not bad",
+            "love-hate",
+            "wrong\tincorrect\nconfusing",
+            "helpful2 good",
+            "",
+        ]
+        
+        for text in samples:
+            with self.subTest(text=text):
+                # 非ASCII文字を単語の区切りとして付け足し、正規表現の経路を通す
+                self.assertTrue(text.isascii())
+                self.assertEqual(analyze(text), analyze(text + " 。"))
+        
+        # 感情語と区切り文字をランダムに組み合わせた入力でも一致する
+        rng = random.Random(0)
+        pieces = ["good", "bad", "like", "dislike", "wrong", "thanks", "x", "_", "1", " ", "-", "'", "!", "\t"]
+        for _ in range(200):
+            text = "".join(rng.choice(pieces) for _ in range(rng.randint(0, 12)))
+            self.assertEqual(analyze(text), analyze(text + " 。"), text)
+        
+        # 非ASCIIの文字は単語の区切りとして扱う
+        self.assertEqual(analyze("とても good です"), 1.0)
+        self.assertEqual(analyze("goodです"), 1.0)
+    
+    def test_sentiment_in_mixed_script_text(self):
+        """日本語に隣接する感情語も数え、ASCIIの区切りと同じ結果になることを確認"""
+        analyze = self.learning_manager._analyze_sentiment
+        
+        self.assertEqual(analyze("goodでした"), 1.0)
+        self.assertEqual(analyze("説明がwrongで、confusingでした"), -1.0)
+        self.assertEqual(analyze("helpfulだけどbadな点もある"), 0.0)
+        self.assertEqual(analyze("dislikeです"), -1.0)  # likeとしては数えない
+        
+        # 日本語の区切りと空白の区切りで結果が一致する
+        rng = random.Random(1)
+        words = ["good", "bad", "like", "dislike", "wrong", "thanks", "x1"]
+        for _ in range(200):
+            chosen = [rng.choice(words) for _ in range(rng.randint(1, 6))]
+            self.assertEqual(analyze("で".join(chosen)), analyze(" ".join(chosen)), chosen)
+    
+    def test_topics_in_mixed_script_text(self):
+        """日本語に隣接する英語のキーワードからもトピックを抽出することを確認"""
+        extract = self.learning_manager._extract_topics
+        
+        self.assertEqual(extract("pythonのコードを書きたい"), ["programming"])
+        self.assertEqual(extract("データ分析(analytics)とmarketing戦略"), ["data", "business"])
+        self.assertEqual(extract("pythonic なコード"), [])  # 部分一致は数えない
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,65 @@
+import sys
+import os
+import unittest
+from unittest.mock import patch
+
+# テスト対象のモジュールへのパスを追加
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from planning import Planner
+
+class TestPlanner(unittest.TestCase):
+    """Plannerのテストクラス"""
+    
+    def setUp(self):
+        """テスト前の準備"""
+        self.planner = Planner(requires_oversight=False)
+    
+    def test_execute_completed_plan_again(self):
+        """完了済みの計画を再度実行しても例外にならず、履歴も増えないことを確認"""
+        plan = self.planner.create_plan("analyze sales data")
+        self.assertIn("Completed:", self.planner.execute_plan(plan))
+        
+        result = self.planner.execute_plan(plan)
+        
+        self.assertEqual(result, "This plan has already been completed or is unknown.")
+        self.assertEqual(len(self.planner.plan_history), 1)
+        self.assertEqual(self.planner.get_plan_metrics()["completed_plans"], 1)
+    
+    def test_execute_requires_approval(self):
+        """監督が必要な場合は承認前の計画を実行しないことを確認"""
+        planner = Planner(requires_oversight=True)
+        plan = planner.create_plan("build a tool")
+        
+        self.assertIn("requires approval", planner.execute_plan(plan))
+        self.assertTrue(planner.approve_plan(plan["id"]))
+        self.assertIn("Completed:", planner.execute_plan(plan))
+    
+    def test_metrics_match_history_beyond_limit(self):
+        """履歴の上限を超えて古い計画が押し出されても、集計値が履歴からの再計算と一致することを確認"""
+        with patch.object(Planner, "_PLAN_HISTORY_LIMIT", 5):
+            planner = Planner(requires_oversight=False)
+        
+        # ステップ数の多い計画を先に実行し、押し出された後に最大ステップ数が下がるようにする
+        for max_steps in (4, 4, 3, 3, 2, 2, 1, 1):
+            planner.max_steps = max_steps
+            planner.execute_plan(planner.create_plan("analyze sales data"))
+        planner.create_plan("build a tool")  # 未実行の計画
+        
+        history = list(planner.plan_history)
+        step_counts = [len(plan["tasks"]) for plan in history]
+        metrics = planner.get_plan_metrics()
+        
+        self.assertEqual(step_counts, [3, 2, 2, 1, 1])
+        self.assertEqual(metrics["total_plans"], 6)
+        self.assertEqual(metrics["active_plans"], 1)
+        self.assertEqual(metrics["completed_plans"], 5)
+        self.assertAlmostEqual(metrics["average_execution_time"],
+                               sum(plan["metrics"]["execution_duration"] for plan in history) / len(history))
+        self.assertAlmostEqual(metrics["success_rate"],
+                               sum(plan["metrics"]["success_rate"] for plan in history) / len(history))
+        self.assertAlmostEqual(metrics["task_complexity"]["average_steps"], sum(step_counts) / len(step_counts))
+        self.assertEqual(metrics["task_complexity"]["max_steps"], max(step_counts))
+
+if __name__ == '__main__':
+    unittest.main()
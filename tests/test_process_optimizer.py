@@ -0,0 +1,124 @@
+import sys
+import os
+import json
+import shutil
+import tempfile
+import unittest
+from datetime import datetime, timedelta
+from unittest.mock import patch
+
+# テスト対象のモジュールへのパスを追加
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import process_optimizer
+from process_optimizer import ProcessOptimizer
+
+class TestProcessOptimizer(unittest.TestCase):
+    """ProcessOptimizerのテストクラス"""
+    
+    def setUp(self):
+        """テスト前の準備"""
+        self.temp_dir = tempfile.mkdtemp()
+        config_path = os.path.join(self.temp_dir, "config.json")
+        with open(config_path, "w", encoding="utf-8") as f:
+            json.dump({"self_improvement": {"requires_review": True}}, f)
+        self.optimizer = ProcessOptimizer(config_path=config_path)
+        self.clock = 1000.0
+    
+    def tearDown(self):
+        """テスト後のクリーンアップ"""
+        shutil.rmtree(self.temp_dir)
+    
+    @staticmethod
+    def _make_task(i):
+        """i番目のタスク記録（コンポーネント・ステータス・処理時間が周期的に変わる）"""
+        return {
+            "task_id": f"task_{i}",
+            "component": ("planner", "learning", "knowledge")[i % 3],
+            "task_type": ("analyze", "create")[i % 2],
+            "start_time": (datetime(2024, 1, 1) + timedelta(seconds=10 * i)).isoformat(),
+            "duration": float(i % 10 + 1) * (3 if i % 3 == 0 else 1),
+            "result_status": "error" if i % 7 == 0 else "success"
+        }
+    
+    def _record_with_clock(self, count, implement_before=None):
+        """
+        記録時刻を1秒ずつ進めながらタスクを記録
+        （implement_beforeの番号のタスクを記録する直前に最適化を実装する）
+        """
+        with patch("process_optimizer.time.time", side_effect=lambda: self.clock):
+            for i in range(count):
+                if i == implement_before:
+                    self.clock += 0.5
+                    self.optimizer.implement_optimization("opt_test")
+                self.clock += 1.0
+                self.optimizer.record_task_execution(self._make_task(i))
+    
+    def _check_history_beyond_limit(self):
+        """上限を超えて記録した場合に、保持中の記録だけが集計・評価されることを確認"""
+        limit = ProcessOptimizer._TASK_HISTORY_LIMIT
+        total = limit + limit // 5
+        implement_before = limit
+        self._record_with_clock(total, implement_before)
+        
+        # 保持されているのは直近のlimit件のみ
+        kept = [self._make_task(i) for i in range(total - limit, total)]
+        self.assertEqual(len(self.optimizer.task_history), limit)
+        self.assertEqual(self.optimizer.task_history[0]["task_id"], kept[0]["task_id"])
+        
+        metrics = self.optimizer.analyze_process_efficiency()
+        self.assertEqual(metrics["task_count"], limit)
+        
+        expected_status = {}
+        expected_components = {}
+        for task in kept:
+            expected_status[task["result_status"]] = expected_status.get(task["result_status"], 0) + 1
+            stats = expected_components.setdefault(task["component"], [0, 0.0])
+            stats[0] += 1
+            stats[1] += task["duration"]
+        self.assertEqual(metrics["result_distribution"], expected_status)
+        self.assertEqual(
+            {name: (s["count"], s["total_duration"]) for name, s in metrics["component_stats"].items()},
+            {name: (count, total) for name, (count, total) in expected_components.items()}
+        )
+        self.assertAlmostEqual(metrics["time_metrics"]["average_processing_time"],
+                               sum(task["duration"] for task in kept) / limit)
+        
+        # コンポーネントを指定した分析も保持中の記録だけを対象にする
+        planner = self.optimizer.analyze_process_efficiency(component="planner")
+        self.assertEqual(planner["task_count"], expected_components["planner"][0])
+        
+        # 実装前後の振り分けも保持中の記録だけで行われる
+        before = [task for i, task in enumerate(kept, total - limit) if i < implement_before]
+        after = [task for i, task in enumerate(kept, total - limit) if i >= implement_before]
+        evaluation = self.optimizer.evaluate_optimization("opt_test")
+        self.assertEqual(evaluation["status"], "success")
+        for key, tasks in (("before_implementation", before), ("after_implementation", after)):
+            result = evaluation["metrics"][key]
+            self.assertEqual(result["sample_size"], len(tasks))
+            self.assertAlmostEqual(result["avg_duration"], sum(t["duration"] for t in tasks) / len(tasks))
+            self.assertAlmostEqual(result["error_rate"],
+                                   sum(t["result_status"] == "error" for t in tasks) / len(tasks))
+    
+    def test_history_beyond_limit(self):
+        """上限を超えた記録の集計と評価（NumPyが利用可能な場合はNumPy経路）"""
+        self._check_history_beyond_limit()
+    
+    def test_history_beyond_limit_without_numpy(self):
+        """上限を超えた記録の集計と評価（純Python経路）"""
+        with patch.object(process_optimizer, "NUMPY_AVAILABLE", False):
+            self._check_history_beyond_limit()
+    
+    def test_non_numeric_duration_is_rejected(self):
+        """数値でない処理時間の記録は警告して無視されることを確認"""
+        task = self._make_task(0)
+        task["duration"] = "slow"
+        
+        with self.assertLogs("process_optimizer", level="WARNING"):
+            self.optimizer.record_task_execution(task)
+        
+        self.assertEqual(len(self.optimizer.task_history), 0)
+        self.assertEqual(len(self.optimizer._task_durations), 0)
+
+if __name__ == '__main__':
+    unittest.main()